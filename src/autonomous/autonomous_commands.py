@@ -1,4 +1,5 @@
 from configparser import ConfigParser
+from typing import Union
 
 from commands2 import CommandGroupBase
 from commands2 import WaitCommand
@@ -6,13 +7,10 @@ from wpilib import IterativeRobotBase
 
 from commands.arcade_drive_commands import DriveTime
 from commands.shooter_commands import RaiseShooter
+from robot_config import AutonomousConfig
 
 
 class DeadReckoningScore(CommandGroupBase):
-    _SECTION = "DeadReckoningScore"
-    _DRIVE_SPEED = "DRIVE_SPEED"
-    _DRIVE_TIME = "DRIVE_TIME"
-    _WAIT_TIME = "WAIT_TIME"
 
     _robot = None
 
@@ -21,19 +19,22 @@ class DeadReckoningScore(CommandGroupBase):
     _wait_time: float = None
 
     def __init__(
-            self, robot: IterativeRobotBase, config: ConfigParser
+            self, robot: IterativeRobotBase, config: Union[AutonomousConfig, ConfigParser]
     ):
         """Constructor"""
         super().__init__()
         self._robot = robot
+        if isinstance(config, ConfigParser):
+            config = AutonomousConfig.from_parser(config)
         self._config = config
         self._load_config(config)
         self._initialize_commands()
 
-    def _load_config(self, parser: ConfigParser):
-        self._drive_speed = parser.getfloat(self._SECTION, self._DRIVE_SPEED)
-        self._drive_time = parser.getfloat(self._SECTION, self._DRIVE_TIME)
-        self._wait_time = parser.getfloat(self._SECTION, self._WAIT_TIME)
+    def _load_config(self, config: AutonomousConfig):
+        routine = config.dead_reckoning_score
+        self._drive_speed = routine.drive_speed
+        self._drive_time = routine.drive_time
+        self._wait_time = routine.wait_time
 
     def _initialize_commands(self):
         command = DriveTime(self._robot, self._drive_time, self._drive_speed)
@@ -45,12 +46,6 @@ class DeadReckoningScore(CommandGroupBase):
 
 
 class ShootScore(CommandGroupBase):
-    _SECTION = "ShootScore"
-    _DRIVE_SPEED = "DRIVE_SPEED"
-    _DRIVE_TIME = "DRIVE_TIME"
-    _WAIT_TIME = "WAIT_TIME"
-    _SHOOT_TIME_KEY = "SHOOT_TIME"
-    _VACUUM_TIME_KEY = "VACUUM_TIME"
 
     _robot = None
 
@@ -63,21 +58,24 @@ class ShootScore(CommandGroupBase):
     def __init__(
             self,
             robot: IterativeRobotBase,
-            config: ConfigParser
+            config: Union[AutonomousConfig, ConfigParser]
     ):
         """Constructor"""
         super().__init__()
         self._robot = robot
+        if isinstance(config, ConfigParser):
+            config = AutonomousConfig.from_parser(config)
         self._config = config
         self._load_config(config)
         self._initialize_commands()
 
-    def _load_config(self, parser: ConfigParser):
-        self._drive_speed = parser.getfloat(self._SECTION, self._DRIVE_SPEED)
-        self._drive_time = parser.getfloat(self._SECTION, self._DRIVE_TIME)
-        self._wait_time = parser.getfloat(self._SECTION, self._WAIT_TIME)
-        self._shoot_time = parser.getfloat(self._SECTION, self._SHOOT_TIME_KEY)
-        self._vacuum_time = parser.getfloat(self._SECTION, self._VACUUM_TIME_KEY)
+    def _load_config(self, config: AutonomousConfig):
+        routine = config.shoot_score
+        self._drive_speed = routine.drive_speed
+        self._drive_time = routine.drive_time
+        self._wait_time = routine.wait_time
+        self._shoot_time = routine.shoot_time
+        self._vacuum_time = routine.vacuum_time
 
     def _initialize_commands(self):
         command = DriveTime(self._robot, self._drive_time, self._drive_speed)
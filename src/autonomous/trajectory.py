@@ -0,0 +1,123 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import logging
+from typing import Optional
+
+from commands2 import Command
+from wpimath.controller import RamseteController
+from wpimath.geometry import Pose2d, Rotation2d
+from wpimath.kinematics import ChassisSpeeds, DifferentialDriveKinematics
+from wpimath.trajectory import Trajectory, TrajectoryConfig, TrajectoryGenerator
+
+from robot_config import AutonomousConfig, PathConfig, TrajectoryFollowerConfig
+from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
+from util.stopwatch import Stopwatch, TimerService
+
+
+class TrajectoryLibrary:
+    """
+    Every trajectory declared in `autonomous.ini`, generated once at boot
+
+    Generating a trajectory solves for a time parameterized spline under the velocity and
+    acceleration constraints, which is far too slow to do inside the autonomous period. `generate`
+    is called from `robotInit` and the commands only ever sample the cached trajectories.
+    """
+
+    def __init__(self, config: AutonomousConfig, kinematics: DifferentialDriveKinematics):
+        self._config = config
+        self._kinematics = kinematics
+        self._trajectories: dict[str, Trajectory] = {}
+
+    def generate(self) -> dict[str, Trajectory]:
+        """Generate every configured trajectory that has not been generated yet."""
+        for path in self._config.trajectories:
+            if path.name not in self._trajectories:
+                self._trajectories[path.name] = self._generate(path)
+                logging.info("Generated trajectory %s: %.2fs", path.name, self._trajectories[path.name].totalTime())
+        return self._trajectories
+
+    def _generate(self, path: PathConfig) -> Trajectory:
+        follower = self._config.trajectory_follower
+        trajectory_config = TrajectoryConfig(follower.max_velocity, follower.max_acceleration)
+        trajectory_config.setKinematics(self._kinematics)
+        trajectory_config.setReversed(path.reversed)
+        waypoints = [Pose2d(x, y, Rotation2d.fromDegrees(heading)) for x, y, heading in path.waypoints]
+        return TrajectoryGenerator.generateTrajectory(waypoints, trajectory_config)
+
+    def get(self, name: str) -> Trajectory:
+        """Return a generated trajectory, generating it now only if boot did not."""
+        trajectory = self._trajectories.get(name)
+        if trajectory is None:
+            logging.warning("Trajectory %s was not generated at boot", name)
+            self.generate()
+            trajectory = self._trajectories[name]
+        return trajectory
+
+    @property
+    def names(self) -> list[str]:
+        return [path.name for path in self._config.trajectories]
+
+    @property
+    def trajectories(self) -> dict[str, Trajectory]:
+        return self._trajectories
+
+
+class FollowTrajectory(Command):
+    """
+    Drive a precomputed trajectory with a RAMSETE controller closing the loop on the odometry pose
+
+    The trajectory is sampled at the time since the command started, the controller corrects the
+    sampled chassis speeds for the pose error and the drivetrain drives the resulting wheel speeds.
+    """
+
+    def __init__(
+            self,
+            drivetrain: Drivetrain,
+            odometry: Odometry,
+            trajectory: Trajectory,
+            config: TrajectoryFollowerConfig,
+            reset_pose: bool = True,
+            timer: Optional[TimerService] = None,
+    ):
+        """Constructor"""
+        super().__init__()
+        self._drivetrain = drivetrain
+        self._trajectory = trajectory
+        self._total_time = trajectory.totalTime()
+        self._odometry = odometry
+        self._reset_pose = reset_pose
+        self._controller = RamseteController(config.ramsete_b, config.ramsete_zeta)
+        self._stopwatch = Stopwatch(timer)
+        self.addRequirements(drivetrain)
+
+    def initialize(self) -> None:
+        """Called before the Command is run for the first time."""
+        if self._reset_pose:
+            self._odometry.reset_pose(self._trajectory.initialPose())
+        self._stopwatch.start()
+
+    def execute(self) -> None:
+        """Called repeatedly when this Command is scheduled to run"""
+        desired = self._trajectory.sample(self._stopwatch.elapsed_time_in_secs())
+        speeds: ChassisSpeeds = self._controller.calculate(self._odometry.pose, desired)
+        wheel_speeds = self._drivetrain.kinematics.toWheelSpeeds(speeds)
+        self._drivetrain.drive_wheel_speeds(wheel_speeds.left, wheel_speeds.right)
+
+    def isFinished(self) -> bool:
+        """Returns true once the whole trajectory has been sampled"""
+        return self._stopwatch.elapsed_time_in_secs() >= self._total_time
+
+    def end(self, interrupted: bool) -> None:
+        """Called once after isFinished returns true"""
+        self._stopwatch.stop()
+        self._drivetrain.drive_wheel_speeds(0.0, 0.0)
+
+    @property
+    def drivetrain(self) -> Drivetrain:
+        return self._drivetrain
+
+    @property
+    def trajectory(self) -> Trajectory:
+        return self._trajectory
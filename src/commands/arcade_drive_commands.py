@@ -1,8 +1,10 @@
-import math
+from typing import Optional
 
 from commands2 import Command, Subsystem
 
+from robot_config import TurnControllerConfig
 from subsystems.drivetrain import Drivetrain
+from util.heading_controller import HeadingController
 from util.stopwatch import Stopwatch
 
 
@@ -69,6 +71,13 @@ class DriveTime(Command):
 
 
 class TurnDegrees(Command):
+    """
+    Turn the robot by a number of degrees relative to its heading when the command starts
+
+    The heading is driven by a profiled PID controller, `speed` limits the turn speed and the
+    command finishes once the heading has settled within `threshold` degrees of the target. The
+    target is not wrapped, a turn of 270 degrees turns 270 degrees rather than -90.
+    """
 
     def __init__(
             self,
@@ -76,6 +85,7 @@ class TurnDegrees(Command):
             degrees_change: float,
             speed: float,
             threshold: float,
+            controller_config: Optional[TurnControllerConfig] = None,
     ):
         """Constructor"""
         super().__init__()
@@ -84,37 +94,33 @@ class TurnDegrees(Command):
         self._speed = speed
         self._degree_threshold = threshold
         self._target_degrees = 0.0
+        self._heading_controller = HeadingController(
+            controller_config if controller_config is not None else TurnControllerConfig(), threshold, speed,
+            continuous=False,
+        )
         self.addRequirements(drivetrain)
 
     def initialize(self) -> None:
         """Called before the Command is run for the first time."""
-        self._target_degrees = (self._drivetrain.get_gyro_angle() + self._degrees_change)
+        current = self._drivetrain.get_gyro_angle()
+        self._target_degrees = (current + self._degrees_change)
+        self._heading_controller.reset(current, self._target_degrees)
 
     def execute(self) -> None:
         """
         Called repeatedly when this Command is scheduled to run
         """
-        degrees_left = self._target_degrees - self._drivetrain.get_gyro_angle()
-        turn_speed = self._speed * TurnDegrees._determine_direction(degrees_left)
+        turn_speed = self._heading_controller.calculate(self._drivetrain.get_gyro_angle())
         self._drivetrain.arcade_drive(0.0, turn_speed, False)
 
     def isFinished(self) -> bool:
-        """Returns true when the Command no longer needs to be run"""
-        current = self._drivetrain.get_gyro_angle()
-        # If abs(target - current) < threshold then return true
-        return (
-                math.fabs(self._target_degrees - current) <= self._degree_threshold
-        )
+        """Returns true once the heading has settled on the target"""
+        return self._heading_controller.at_goal()
 
     def end(self, interrupted: bool) -> None:
         """Called once after isFinished returns true"""
         self._drivetrain.arcade_drive(0.0, 0.0)
 
-    @staticmethod
-    def _determine_direction(degrees_left: float) -> float:
-        """Based on the degrees left, determines the direction of the degrees to turn"""
-        return 1.0 if degrees_left >= 0 else -1.0
-
     @property
     def drivetrain(self) -> Drivetrain:
         return self._drivetrain
@@ -137,6 +143,12 @@ class TurnDegrees(Command):
 
 
 class TurnDegreesAbsolute(Command):
+    """
+    Turn the robot to an absolute heading, taking the shortest way around
+
+    The heading is driven by a profiled PID controller, `speed` limits the turn speed and the
+    command finishes once the heading has settled within `threshold` degrees of the target.
+    """
 
     def __init__(
             self,
@@ -144,6 +156,7 @@ class TurnDegreesAbsolute(Command):
             degrees_target: float,
             speed: float,
             threshold: float,
+            controller_config: Optional[TurnControllerConfig] = None,
     ):
         """Constructor"""
         super().__init__()
@@ -151,38 +164,28 @@ class TurnDegreesAbsolute(Command):
         self._target_degrees = degrees_target
         self._speed = speed
         self._degree_threshold = threshold
+        self._heading_controller = HeadingController(
+            controller_config if controller_config is not None else TurnControllerConfig(), threshold, speed
+        )
         self.addRequirements(drivetrain)
 
     def initialize(self) -> None:
         """Called before the Command is run for the first time."""
-        return Command.initialize(self)
+        self._heading_controller.reset(self._drivetrain.get_gyro_angle(), self._target_degrees)
 
     def execute(self) -> None:
         """Called repeatedly when this Command is scheduled to run"""
-        degrees_left = self._target_degrees - self._drivetrain.get_gyro_angle()
-        turn_speed = self._speed * TurnDegreesAbsolute._determine_direction(
-            degrees_left
-        )
+        turn_speed = self._heading_controller.calculate(self._drivetrain.get_gyro_angle())
         self._drivetrain.arcade_drive(0.0, turn_speed, False)
-        return Command.execute(self)
 
     def isFinished(self) -> bool:
-        """Returns true when the Command no longer needs to be run"""
-        current = self._drivetrain.get_gyro_angle()
-        # If abs(target - current) < threshold then return true
-        return (
-                math.fabs(self._target_degrees - current) <= self._degree_threshold
-        )
+        """Returns true once the heading has settled on the target"""
+        return self._heading_controller.at_goal()
 
     def end(self, interrupted: bool) -> None:
         """Called once after isFinished returns true"""
         self._drivetrain.arcade_drive(0.0, 0.0)
 
-    @staticmethod
-    def _determine_direction(degrees_left: float) -> float:
-        """Based on the degrees left, returns -1 for turn right, returns 1 for turn left"""
-        return 1.0 if degrees_left >= 0 else -1.0
-
     def getRequirements(self) -> set[Subsystem]:
         return {self._drivetrain}
 
@@ -194,14 +197,14 @@ class TurnDegreesAbsolute(Command):
     def speed(self) -> float:
         return self._speed
 
-    @property
-    def target_degrees(self) -> float:
-        return self._target_degrees
-
     @property
     def degree_threshold(self) -> float:
         return self._degree_threshold
 
+    @property
+    def target_degrees(self) -> float:
+        return self._target_degrees
+
 
 class TurnTime(Command):
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from commands2 import Command
+from commands2 import Command, SequentialCommandGroup
 from commands2 import Subsystem
 from wpilib import IterativeRobotBase
 
@@ -68,9 +68,7 @@ class ClimberDrive(Command):
 
     def execute(self):
         """Called repeatedly when this Command is scheduled to run"""
-        speed = self._oi.scoring_controller.getLeftY()
-        if abs(speed) < 0.2:
-            speed = 0.0
+        speed = self._oi.scoring_left_y()
         self._climber.move_winch(speed)
         return Command.execute(self)
 
@@ -161,3 +159,57 @@ class DoNothingClimber(Command):
 
     def getRequirements(self) -> set[Subsystem]:
         return {self._climber}
+
+
+class ClimbToSetpoint(Command):
+    """
+    Drive the winch closed loop to a named setpoint (stowed, reach or hang)
+
+    Finishes once the winch is at the setpoint, unless `hold` is set in which case it keeps the
+    winch there until interrupted.
+    """
+
+    def __init__(
+            self,
+            climber: Climber,
+            setpoint: str,
+            hold: bool = False,
+    ):
+        """Constructor"""
+        super().__init__()
+        self._climber = climber
+        self._setpoint = setpoint
+        self._hold = hold
+        self.setName(f"ClimbTo-{setpoint}")
+        self.addRequirements(climber)
+
+    def initialize(self):
+        """Called before the Command is run for the first time."""
+        self._climber.set_goal(self._setpoint)
+
+    def execute(self):
+        """Called repeatedly when this Command is scheduled to run"""
+        self._climber.move_to_goal()
+
+    def isFinished(self):
+        """Returns true when the Command no longer needs to be run"""
+        return not self._hold and self._climber.at_goal()
+
+    def end(self, interrupted: bool):
+        """Called once after isFinished returns true"""
+        self._climber.move_winch(0.0)
+
+
+class FullClimb(SequentialCommandGroup):
+    """
+    The whole endgame climb on one held button: raise the hooks to reach, then pull the robot up
+    to hang and hold it there. Releasing the button stops the winch wherever it is.
+    """
+
+    def __init__(self, climber: Climber):
+        """Constructor"""
+        super().__init__(
+            ClimbToSetpoint(climber, "reach"),
+            ClimbToSetpoint(climber, "hang", hold=True),
+        )
+        self.setName("FullClimb")
@@ -38,23 +38,14 @@ class TankDrive(Command):
         pass
 
     def execute(self):
-        """Called repeatedly when this Command is scheduled to run"""
-
-        modifier = self._drivetrain.scaling
-
-        if self.drivetrain.slow():
-            modifier = self._drivetrain.slow_scaling
-        elif self.drivetrain.turbo():
-            modifier = self.drivetrain.turbo_scaling
-
-        left_track: float = self._oi.driver_controller.getLeftY()
-        if (abs(left_track) < 0.2):
-            left_track = 0.0
-        right_track: float = self._oi.driver_controller.getRightY()
-        if(abs(right_track) < 0.2):
-            right_track = 0.0
+        """
+        Called repeatedly when this Command is scheduled to run, the drivetrain's output stage
+        applies the turbo / slow scaling and the acceleration limits
+        """
+        left_track: float = self._oi.driver_left_y()
+        right_track: float = self._oi.driver_right_y()
 
-        self.drivetrain.tank_drive(left_track * modifier, right_track * modifier)
+        self.drivetrain.tank_drive(left_track, right_track, scaled=True)
 
     def isFinished(self) -> bool:
         """
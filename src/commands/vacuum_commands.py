@@ -61,9 +61,7 @@ class VacuumDrive(Command):
 
     def execute(self):
         """Called repeatedly when this Command is scheduled to run"""
-        speed = self._oi.scoring_controller.getRightTriggerAxis()
-        if (abs(speed) < 0.1):
-            speed = 0.0
+        speed = self._oi.scoring_right_trigger()
         self._vacuum.move(speed * self._scaling)
 
     def isFinished(self):
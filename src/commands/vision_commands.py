@@ -0,0 +1,98 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Optional
+
+from commands2 import Command
+
+from commands.tank_drive_commands import TankDrive
+from oi import OI
+from robot_config import TurnControllerConfig, VisionConfig
+from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
+from subsystems.vision import Vision
+from util.heading_controller import HeadingController
+from util.stopwatch import TimerService
+
+
+class AutoAim(Command):
+    """
+    Turn the robot to face the vision target while the driver holds the button
+
+    The setpoint is the field relative heading of the latest target, the robot heading when its
+    frame was captured plus the camera yaw, so the robot does not overshoot while the next frame
+    is in flight. The heading is closed loop on the odometry (gyro) heading, which updates every
+    loop, and the setpoint moves whenever a new target arrives. The command never waits on the
+    camera: without a target captured within the configured age the driver has tank drive.
+    """
+
+    def __init__(
+            self,
+            oi: OI,
+            drivetrain: Drivetrain,
+            odometry: Odometry,
+            vision: Vision,
+            config: VisionConfig,
+            controller_config: Optional[TurnControllerConfig] = None,
+            timer: Optional[TimerService] = None,
+    ):
+        """Constructor"""
+        super().__init__()
+        self._drivetrain = drivetrain
+        self._odometry = odometry
+        self._vision = vision
+        self._max_age = config.aim_max_age
+        self._manual = TankDrive(oi, drivetrain)
+        self._heading_controller = HeadingController(
+            controller_config if controller_config is not None else TurnControllerConfig(),
+            config.aim_tolerance, config.aim_speed, timer=timer
+        )
+        self._setpoint: Optional[float] = None
+        self._target_timestamp: Optional[float] = None
+        self.addRequirements(drivetrain)
+
+    def initialize(self) -> None:
+        """Called before the Command is run for the first time."""
+        self._setpoint = None
+        self._target_timestamp = None
+
+    def execute(self) -> None:
+        """Called repeatedly when this Command is scheduled to run"""
+        target = self._vision.target(self._max_age)
+        if target is None:
+            self._setpoint = None
+            self._target_timestamp = None
+            self._manual.execute()
+            return
+        heading = self._odometry.pose.rotation().degrees()
+        if self._setpoint is None:
+            self._heading_controller.reset(heading, target.heading.degrees())
+        elif target.timestamp != self._target_timestamp:
+            self._heading_controller.set_goal(target.heading.degrees())
+        self._setpoint = target.heading.degrees()
+        self._target_timestamp = target.timestamp
+        # counter-clockwise positive, the right side drives forward to turn left
+        turn_speed = self._heading_controller.calculate(heading)
+        self._drivetrain.tank_drive(-turn_speed, turn_speed)
+
+    def isFinished(self) -> bool:
+        """Runs for as long as the button is held"""
+        return False
+
+    def end(self, interrupted: bool) -> None:
+        """Called once the button is released"""
+        self._setpoint = None
+        self._drivetrain.tank_drive(0.0, 0.0)
+
+    def on_target(self) -> bool:
+        """True while aiming and the heading has settled on the target."""
+        return self._setpoint is not None and self._heading_controller.at_goal()
+
+    @property
+    def drivetrain(self) -> Drivetrain:
+        return self._drivetrain
+
+    @property
+    def setpoint(self) -> Optional[float]:
+        """Field relative heading being aimed at in degrees, None while the driver has tank drive."""
+        return self._setpoint
@@ -1,11 +1,15 @@
 import configparser
 from enum import Enum
+from typing import Union
 
 from commands2 import Subsystem
 from commands2.button import CommandXboxController
 from wpilib import DriverStation
 from wpilib import SendableChooser
 
+from robot_config import ControllerConfig, JoystickConfig
+from util.input_shaping import ShapedAxis
+
 
 class JoystickAxis:
     """Enumerates joystick axis."""
@@ -68,15 +72,20 @@ class OI(Subsystem):
     BACK_KEY = "BACK"
     START_KEY = "START"
 
-    def __init__(self, config: configparser.ConfigParser):
+    def __init__(self, config: Union[JoystickConfig, configparser.ConfigParser]):
         super().__init__()
+        if isinstance(config, configparser.ConfigParser):
+            config = JoystickConfig.from_parser(config)
         self._config = config
 
         self._controllers: list[CommandXboxController] = []
         self._dead_zones: list[float] = []
+        self._axes: list[dict[str, ShapedAxis]] = []
         for i in range(2):
             self._controllers.append(self._init_joystick(i))
             self._dead_zones.append(self._init_dead_zone(i))
+            self._axes.append(self._init_axes(i))
+        self._all_axes = tuple(axis for axes in self._axes for axis in axes.values())
 
         self._driver_controller = self._controllers[UserController.DRIVER.value]
         self._scoring_controller = self._controllers[UserController.SCORING.value]
@@ -85,12 +94,42 @@ class OI(Subsystem):
         self._starting_chooser: SendableChooser = SendableChooser()
 
     def _init_joystick(self, driver: int) -> CommandXboxController:
-        config_section = OI.JOY_CONFIG_SECTION + str(driver)
-        return CommandXboxController(self._config.getint(config_section, OI.PORT_KEY))
+        return CommandXboxController(self._config.controllers[driver].port)
 
     def _init_dead_zone(self, driver: int) -> float:
-        config_section = OI.JOY_CONFIG_SECTION + str(driver)
-        return self._config.getfloat(config_section, OI.DEAD_ZONE_KEY)
+        return self._config.controllers[driver].dead_zone
+
+    def _init_axes(self, driver: int) -> dict[str, ShapedAxis]:
+        """
+        Build the input shaping of every axis of a controller once from the config
+        """
+        controller = self._controllers[driver]
+        readers = {
+            OI.LEFT_X_KEY: controller.getLeftX,
+            OI.LEFT_Y_KEY: controller.getLeftY,
+            OI.RIGHT_X_KEY: controller.getRightX,
+            OI.RIGHT_Y_KEY: controller.getRightY,
+            OI.LEFT_TRIGGER_KEY: controller.getLeftTriggerAxis,
+            OI.RIGHT_TRIGGER_KEY: controller.getRightTriggerAxis,
+        }
+        config: ControllerConfig = self._config.controllers[driver]
+        return {name: ShapedAxis(readers[name], config.axis(name)) for name in ControllerConfig.AXIS_NAMES}
+
+    def periodic(self) -> None:
+        """
+        Sample every axis once per loop, the scheduler runs this before any command executes
+        """
+        self.sample_axes()
+
+    def sample_axes(self) -> None:
+        for axis in self._all_axes:
+            axis.sample()
+
+    def axis(self, controller: UserController, name: str) -> float:
+        """
+        Return the shaped value of a controller axis sampled this loop
+        """
+        return self._axes[controller.value][name].get()
 
     def get_auto_chooser(self) -> SendableChooser:
         """
@@ -112,7 +151,7 @@ class OI(Subsystem):
     def get_game_message() -> str:
         return DriverStation.getGameSpecificMessage()
 
-    def config(self) -> configparser.ConfigParser:
+    def config(self) -> JoystickConfig:
         return self._config
 
     def controllers(self) -> list[CommandXboxController]:
@@ -129,8 +168,17 @@ class OI(Subsystem):
     def driver_controller(self) -> CommandXboxController:
         return self._driver_controller
 
+    def driver_left_y(self) -> float:
+        return self._axes[UserController.DRIVER.value][OI.LEFT_Y_KEY].get()
+
+    def driver_right_y(self) -> float:
+        return self._axes[UserController.DRIVER.value][OI.RIGHT_Y_KEY].get()
+
+    def scoring_left_y(self) -> float:
+        return self._axes[UserController.SCORING.value][OI.LEFT_Y_KEY].get()
+
+    def scoring_right_trigger(self) -> float:
+        return self._axes[UserController.SCORING.value][OI.RIGHT_TRIGGER_KEY].get()
+
     def scontrol_right_y(self) -> float:
-        speed = self._scoring_controller.getRightY()
-        if abs(speed) < 0.15:
-            speed = 0.0
-        return speed
+        return self._axes[UserController.SCORING.value][OI.RIGHT_Y_KEY].get()
@@ -1,14 +1,40 @@
-import wpilib.simulation
+import math
+
+import numpy as np
 
 from pyfrc.physics.core import PhysicsInterface
-from pyfrc.physics import motor_cfgs, drivetrains, tankmodel
-from pyfrc.physics.units import units
-from wpilib.simulation import PWMSim, DIOSim, SolenoidSim
+from wpilib.simulation import AnalogInputSim, DIOSim, EncoderSim, PWMSim, RoboRioSim, SolenoidSim
+from wpimath.kinematics import DifferentialDriveKinematics, DifferentialDriveWheelSpeeds
+from wpimath.system.plant import DCMotor
 
 from robot import RetrojaysRobot
+from robot_config import MotorConfig, PWMSubsystemConfig, SubsystemsConfig
+from simulation.plant import Mechanism, RobotPlant
 
 
 class PhysicsEngine(object):
+    """
+    Simulates the drivetrain, winch, vacuum and shooter motors from their configured PWM channels
+
+    Every motor is modelled with its gearbox and load, and all of them draw on one battery whose
+    sagging voltage is fed back to the roboRIO. The drive motors move the robot on the field and the
+    wheel encoders, the winch turns the climber potentiometer.
+    """
+
+    # meters
+    WHEEL_RADIUS = 0.0762
+    # kg, including battery and bumpers
+    ROBOT_MASS = 55.0
+    # winch drum, vacuum impeller and shooter wheel reductions and inertias (kg m^2)
+    WINCH_GEARING = 50.0
+    WINCH_INERTIA = 0.05
+    VACUUM_GEARING = 1.0
+    VACUUM_INERTIA = 0.0001
+    SHOOTER_GEARING = 1.0
+    SHOOTER_INERTIA = 0.002
+    # the climber potentiometer turns with the winch drum
+    POT_VOLTAGE_RANGE = 5.0
+
     def __init__(self, physics_controller: PhysicsInterface, robot: RetrojaysRobot):
         """
         :param physics_controller: `pyfrc.physics.core.PhysicsInterface` object
@@ -16,22 +42,89 @@ class PhysicsEngine(object):
         """
 
         self.physics_controller = physics_controller
+        config: SubsystemsConfig = robot.controller.subsystems_config
+        drivetrain_config = config.drivetrain
+        self.kinematics = DifferentialDriveKinematics(drivetrain_config.kinematics.track_width)
+
+        # one mechanism per group of enabled motor controllers, their PWM outputs are averaged
+        self.mechanisms: list[Mechanism] = []
+        self.pwm_sims: list[list[PWMSim]] = []
+        drive_gearing = DCMotor.CIM().freeSpeed * self.WHEEL_RADIUS / drivetrain_config.kinematics.max_velocity
+        drive_inertia = self.ROBOT_MASS / 2 * self.WHEEL_RADIUS ** 2
+        self._add_drive_side("left", (drivetrain_config.left_motor1, drivetrain_config.left_motor2),
+                             drive_gearing, drive_inertia)
+        self._add_drive_side("right", (drivetrain_config.right_motor1, drivetrain_config.right_motor2),
+                             drive_gearing, drive_inertia)
+        self._add_pwm_subsystem(config.climber.general, Mechanism(
+            "winch", DCMotor.CIM(), 1, self.WINCH_GEARING, self.WINCH_INERTIA, 0.01))
+        self._add_pwm_subsystem(config.vacuum, Mechanism(
+            "vacuum", DCMotor.vex775Pro(), 1, self.VACUUM_GEARING, self.VACUUM_INERTIA, 0.00001))
+        self._add_pwm_subsystem(config.shooter, Mechanism(
+            "shooter", DCMotor.CIM(), 1, self.SHOOTER_GEARING, self.SHOOTER_INERTIA, 0.0005))
+        self.plant = RobotPlant(self.mechanisms)
+        self._duty = np.zeros((1, len(self.mechanisms)))
+        self._left = self._index("left")
+        self._right = self._index("right")
+        self._winch = self._index("winch")
+
+        # simulate the wheel encoders feeding odometry, when the robot has them
+        self.l_encoder = None
+        self.r_encoder = None
+        if drivetrain_config.left_encoder.enabled and drivetrain_config.right_encoder.enabled:
+            self.l_encoder = EncoderSim.createForChannel(drivetrain_config.left_encoder.channel_a)
+            self.r_encoder = EncoderSim.createForChannel(drivetrain_config.right_encoder.channel_a)
+
+        # the climber potentiometer reads the winch position
+        self.climber_pot = None
+        limits = config.climber.limits
+        if limits.enabled and self._winch is not None:
+            self.climber_pot = AnalogInputSim(limits.channel)
+            self._pot_degrees_per_volt = limits.full_range / self.POT_VOLTAGE_RANGE
+            self._pot_zero_voltage = -limits.offset / self._pot_degrees_per_volt
+            self.climber_pot.setVoltage(self._pot_zero_voltage)
 
-        # simulate left and right motor of drivetrain
-        self.l_motor = PWMSim(robot.controller.drivetrain.left_motor.getChannel())
-        self.r_motor = PWMSim(robot.controller.drivetrain.right_motor.getChannel())
+        self.arm_motor = None
+        if robot.controller.arm is not None:
+            # simulate motor responsible for lifting / lowering arm
+            self.arm_motor = PWMSim(robot.controller.arm.motor.getChannel())
+            # simulate arm upper and lower limit switches
+            self.arm_upper_limit = DIOSim(robot.controller.arm.upper_limit_switch)
+            self.arm_lower_limit = DIOSim(robot.controller.arm.lower_limit_switch)
 
-        # simulate motor responsible for lifting / lowering arm
-        self.arm_motor = PWMSim(robot.controller.arm.motor.getChannel())
-        # simulate arm upper and lower limit switches
-        self.arm_upper_limit = DIOSim(robot.controller.arm.upper_limit_switch)
-        self.arm_lower_limit = DIOSim(robot.controller.arm.lower_limit_switch)
+        self.grabber_solenoid = None
+        if robot.controller.grabber is not None:
+            self.grabber_solenoid = SolenoidSim(robot.controller.grabber.solenoid.getChannel())
 
-        self.grabber_solenoid = SolenoidSim(robot.controller.grabber.solenoid.getChannel())
+    def _add_drive_side(self, name: str, motors: tuple[MotorConfig, ...], gearing: float, inertia: float) -> None:
+        enabled = [motor for motor in motors if motor.enabled]
+        if enabled:
+            self.mechanisms.append(Mechanism(name, DCMotor.CIM(), len(enabled), gearing, inertia, 0.05))
+            self.pwm_sims.append([PWMSim(motor.channel) for motor in enabled])
 
+    def _add_pwm_subsystem(self, config: PWMSubsystemConfig, mechanism: Mechanism) -> None:
+        if config.enabled:
+            self.mechanisms.append(mechanism)
+            self.pwm_sims.append([PWMSim(config.channel)])
 
+    def _index(self, name: str):
+        for i, mechanism in enumerate(self.mechanisms):
+            if mechanism.name == name:
+                return i
+        return None
 
-    def update_sim(self, hal_data, now, tm_diff):
+    @property
+    def left_output(self) -> float:
+        return float(self._duty[0, self._left]) if self._left is not None else 0.0
+
+    @property
+    def right_output(self) -> float:
+        return float(self._duty[0, self._right]) if self._right is not None else 0.0
+
+    @property
+    def battery_voltage(self) -> float:
+        return float(self.plant.battery_voltage[0])
+
+    def update_sim(self, now: float, tm_diff: float) -> None:
         """
         Called when the simulation parameters for the program need to be
         updated.
@@ -40,29 +133,23 @@ class PhysicsEngine(object):
         :param tm_diff: The amount of time that has passed since the last
                         time that this function was called
         """
+        for i, sims in enumerate(self.pwm_sims):
+            self._duty[0, i] = sum(sim.getSpeed() for sim in sims) / len(sims)
+        self.plant.step(self._duty, tm_diff)
+        RoboRioSim.setVInVoltage(self.battery_voltage)
 
-        """
-        hal_data['pwm'] looks like this:
-        [{
-            'zero_latch': False,
-            'initialized': False,
-            'raw_value': 0,
-            'value': 0,
-            'period_scale': None,
-            'type': None
-        }, {
-            'zero_latch': True,
-            'initialized': True,
-            'raw_value': 1011,
-            'value': 0.0,
-            'period_scale': 0,
-            'type': 'talon'
-        },...]
-        """
-
-        # Simulate the drivetrain
-        l_motor = hal_data["pwm"][5]["value"]
-        r_motor = hal_data["pwm"][4]["value"]
+        # Simulate the drivetrain, each side moves at the surface speed of its wheels
+        velocity = self.plant.velocity[0]
+        position = self.plant.position[0]
+        left_speed = velocity[self._left] * self.WHEEL_RADIUS if self._left is not None else 0.0
+        right_speed = velocity[self._right] * self.WHEEL_RADIUS if self._right is not None else 0.0
+        if self.l_encoder is not None:
+            self.l_encoder.setDistance(position[self._left] * self.WHEEL_RADIUS)
+            self.r_encoder.setDistance(position[self._right] * self.WHEEL_RADIUS)
+        wheel_speeds = DifferentialDriveWheelSpeeds(left_speed, right_speed)
+        self.physics_controller.drive(self.kinematics.toChassisSpeeds(wheel_speeds), tm_diff)
 
-        speed, rotation = drivetrains.two_motor_drivetrain(l_motor, r_motor)
-        self.physics_controller.drive(speed, rotation, tm_diff)
+        if self.climber_pot is not None:
+            degrees = math.degrees(position[self._winch])
+            voltage = self._pot_zero_voltage + degrees / self._pot_degrees_per_volt
+            self.climber_pot.setVoltage(min(max(voltage, 0.0), self.POT_VOLTAGE_RANGE))
@@ -1,27 +1,39 @@
 import logging
+import os
+from typing import TYPE_CHECKING
 
 import wpilib
 from commands2 import CommandScheduler, SequentialCommandGroup
 from commands2 import TimedCommandRobot
 
-from autonomous.autonomous_drive_commands import MoveFromLine
-from robot_controller import RobotController
+from util.async_log import configure_logging
+from util.boot import BootTimeline
+from util.loop_profiler import LoopProfiler
+from util.stopwatch import timer_service
 
-logging.basicConfig(level=logging.INFO)
+if TYPE_CHECKING:
+    from robot_controller import RobotController
+
+# formatting and writing log messages happens on a background thread, never in the robot loop
+configure_logging(logging.INFO)
 
 
 class RetrojaysRobot(TimedCommandRobot):
-    SIM_SUBSYSTEMS_CONFIG_PATH = "configs/subsystems.ini"
-    SIM_JOYSTICK_CONFIG_PATH = "configs/joysticks.ini"
-    SIM_AUTONOMOUS_CONFIG_PATH = "configs/autonomous.ini"
-    _robot_controller: RobotController = None
+    # relative to this file, so the simulation finds the configs whatever the working directory
+    SIM_CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs")
+    SIM_SUBSYSTEMS_CONFIG_PATH = os.path.join(SIM_CONFIG_DIR, "subsystems.ini")
+    SIM_JOYSTICK_CONFIG_PATH = os.path.join(SIM_CONFIG_DIR, "joysticks.ini")
+    SIM_AUTONOMOUS_CONFIG_PATH = os.path.join(SIM_CONFIG_DIR, "autonomous.ini")
+    _robot_controller: "RobotController" = None
     _autonomous_command_group: SequentialCommandGroup = None
+    _loop_profiler: LoopProfiler = None
+    _boot_timeline: BootTimeline = None
 
     def autonomousInit(self):
         # Schedule the autonomous command
         # TODO move into robot controller for better mgmt?
         self._autonomous_command_group = self._robot_controller.get_auto_chooser().getSelected()
-        logging.info(f"Chosen Auto Mode: {self._autonomous_command_group}")
+        logging.info("Chosen Auto Mode: %s", self._autonomous_command_group)
         if self._autonomous_command_group:
             self._autonomous_command_group.schedule()
 
@@ -35,7 +47,8 @@ class RetrojaysRobot(TimedCommandRobot):
 
     def disabledInit(self):
         logging.debug("Robot Code Disabled Initialized")
-        pass
+        # the end of the match would otherwise wait in a partially filled block
+        self._robot_controller.flush_match_log()
 
     def disabledPeriodic(self):
         # logging.debug("Robot Code in disabled periodic loop")
@@ -51,22 +64,58 @@ class RetrojaysRobot(TimedCommandRobot):
         the majority of the robot code
 
         This function also checks if the robot is currently running as a simulation
+
+        Each phase of boot is timed and reported once the robot is ready. Set the `ROBOT_BOOT_PROFILE`
+        environment variable to also report the import time of every module loaded during boot
         """
+        self._boot_timeline = BootTimeline()
+        from robot_controller import RobotController
+        self._boot_timeline.mark("import")
         if self.isSimulation():
             logging.info("### RUNNING AS SIMULATION ###")
             self._robot_controller = RobotController(self.SIM_SUBSYSTEMS_CONFIG_PATH,
                                                      self.SIM_JOYSTICK_CONFIG_PATH,
-                                                     self.SIM_AUTONOMOUS_CONFIG_PATH)
+                                                     self.SIM_AUTONOMOUS_CONFIG_PATH,
+                                                     self._boot_timeline)
         else:
-            self._robot_controller = RobotController()
+            self._robot_controller = RobotController(boot=self._boot_timeline)
         self._robot_controller.mappings()
+        self._boot_timeline.mark("mappings")
+        self._init_loop_profiler()
+        self._boot_timeline.mark("loop_profiler")
+        self._boot_timeline.finish()
+
+    def _init_loop_profiler(self) -> None:
+        """
+        Time every phase of the robot loop: sensor updates, the scheduler, each subsystem's periodic
+        and the execute / isFinished of each command once it has been scheduled
+        """
+        self._loop_profiler = LoopProfiler(self.getPeriod())
+        for subsystem in self._robot_controller.subsystems:
+            self._loop_profiler.instrument_subsystem(subsystem)
+        CommandScheduler.getInstance().onCommandInitialize(self._loop_profiler.instrument_command)
 
     def robotPeriodic(self) -> None:
         """
         Ensures commands are run
+
+        The shared timer service is ticked once at the start of the loop, so every running
+        stopwatch compares against the same timestamp until the loop ends
         """
+        timer_service.tick()
+        self._loop_profiler.begin_loop()
+        self._robot_controller.sample_sensors()
+        self._loop_profiler.mark("sample_sensors")
         self._robot_controller.update_sensors()
+        self._loop_profiler.mark("update_sensors")
         CommandScheduler.getInstance().run()
+        self._loop_profiler.mark("scheduler")
+        self._robot_controller.publish_telemetry()
+        self._loop_profiler.mark("telemetry")
+        self._robot_controller.record_loop()
+        self._loop_profiler.mark("match_log")
+        self._loop_profiler.end_loop()
+        timer_service.release()
 
     def teleopInit(self):
         logging.debug("Robot Code Teleop Initialized")
@@ -92,10 +141,20 @@ class RetrojaysRobot(TimedCommandRobot):
         pass
 
     @property
-    def controller(self) -> RobotController:
+    def controller(self) -> "RobotController":
         """ Returns the robot controller managing all robot subsystems and operator interface"""
         return self._robot_controller
 
+    @property
+    def loop_profiler(self) -> LoopProfiler:
+        """ Returns the profiler timing each phase of the robot loop"""
+        return self._loop_profiler
+
+    @property
+    def boot_timeline(self) -> BootTimeline:
+        """ Returns the timeline of each phase of robot boot"""
+        return self._boot_timeline
+
 
 if __name__ == "__main__":
     wpilib.run(RetrojaysRobot)
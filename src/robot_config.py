@@ -0,0 +1,1019 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Typed, validated robot configuration
+
+`subsystems.ini`, `joysticks.ini` and `autonomous.ini` are parsed exactly once at boot into frozen
+dataclasses that are shared by every subsystem, command and autonomous group. Missing optional
+sections and keys fall back to the defaults declared on each dataclass; required keys and out of
+range values raise a `ConfigError` naming the offending section and key.
+"""
+import configparser
+from configparser import ConfigParser
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration file is missing a required key or holds an invalid value."""
+
+
+class _SectionReader:
+    """Reads typed values from a single config section, applying defaults for missing keys."""
+
+    __slots__ = ("_parser", "_section")
+
+    def __init__(self, parser: ConfigParser, section: str):
+        self._parser = parser
+        self._section = section
+
+    def _required(self, key: str, value: Any) -> Any:
+        if value is None:
+            raise ConfigError(f"[{self._section}] {key} is required")
+        return value
+
+    def _convert(self, getter, key: str, default: Any) -> Any:
+        try:
+            return self._required(key, getter(self._section, key, fallback=default))
+        except ValueError as e:
+            if isinstance(e, ConfigError):
+                raise
+            raise ConfigError(f"[{self._section}] {key}: {e}") from e
+
+    def get(self, key: str, default: Optional[str] = None) -> str:
+        return self._convert(self._parser.get, key, default)
+
+    def getint(self, key: str, default: Optional[int] = None) -> int:
+        return self._convert(self._parser.getint, key, default)
+
+    def getfloat(self, key: str, default: Optional[float] = None) -> float:
+        return self._convert(self._parser.getfloat, key, default)
+
+    def getboolean(self, key: str, default: Optional[bool] = None) -> bool:
+        return self._convert(self._parser.getboolean, key, default)
+
+    def has_section(self) -> bool:
+        return self._parser.has_section(self._section)
+
+    @property
+    def section(self) -> str:
+        return self._section
+
+
+def _check_range(section: str, key: str, value: float, low: float, high: float) -> None:
+    if not low <= value <= high:
+        raise ConfigError(f"[{section}] {key} must be between {low} and {high}, got {value}")
+
+
+def _check_channel(section: str, channel: int) -> None:
+    if channel < 0:
+        raise ConfigError(f"[{section}] CHANNEL must not be negative, got {channel}")
+
+
+def _read(path: str) -> ConfigParser:
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    return parser
+
+
+#####
+# subsystems.ini
+#####
+
+
+@dataclass(frozen=True, slots=True)
+class MotorConfig:
+    """A single PWM motor controller of the drivetrain"""
+    channel: int
+    enabled: bool = True
+    inverted: bool = False
+    slew_rate: float = 0.15
+    type: str = "TALONSRX"
+
+    @staticmethod
+    def from_section(reader: _SectionReader) -> "MotorConfig":
+        config = MotorConfig(
+            channel=reader.getint("CHANNEL"),
+            enabled=reader.getboolean("ENABLED", True),
+            inverted=reader.getboolean("INVERTED", False),
+            slew_rate=reader.getfloat("SLEW_RATE", 0.15),
+            type=reader.get("TYPE", "TALONSRX").upper(),
+        )
+        _check_channel(reader.section, config.channel)
+        return config
+
+
+@dataclass(frozen=True, slots=True)
+class MotorGroupConfig:
+    """One side of the drivetrain, driven as a single motor controller group"""
+    enabled: bool = True
+    inverted: bool = False
+
+    @staticmethod
+    def from_section(reader: _SectionReader) -> "MotorGroupConfig":
+        return MotorGroupConfig(
+            enabled=reader.getboolean("ENABLED", True),
+            inverted=reader.getboolean("INVERTED", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GyroConfig:
+    enabled: bool = False
+    channel: int = 0
+    sensitivity: float = 0.007
+
+    @staticmethod
+    def from_section(reader: _SectionReader) -> "GyroConfig":
+        return GyroConfig(
+            enabled=reader.getboolean("ENABLED", False),
+            channel=reader.getint("CHANNEL", 0),
+            sensitivity=reader.getfloat("SENSITIVITY", 0.007),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EncoderConfig:
+    """A quadrature wheel encoder on two DIO channels"""
+    enabled: bool = False
+    channel_a: int = 0
+    channel_b: int = 1
+    inverted: bool = False
+    # meters of wheel travel per encoder pulse
+    distance_per_pulse: float = 0.0
+
+    @staticmethod
+    def from_section(reader: _SectionReader) -> "EncoderConfig":
+        enabled = reader.getboolean("ENABLED", False)
+        config = EncoderConfig(
+            enabled=enabled,
+            channel_a=reader.getint("CHANNEL_A") if enabled else reader.getint("CHANNEL_A", 0),
+            channel_b=reader.getint("CHANNEL_B") if enabled else reader.getint("CHANNEL_B", 1),
+            inverted=reader.getboolean("INVERTED", False),
+            distance_per_pulse=reader.getfloat("DISTANCE_PER_PULSE") if enabled
+            else reader.getfloat("DISTANCE_PER_PULSE", 0.0),
+        )
+        _check_channel(reader.section, config.channel_a)
+        _check_channel(reader.section, config.channel_b)
+        if enabled and config.distance_per_pulse <= 0.0:
+            raise ConfigError(f"[{reader.section}] DISTANCE_PER_PULSE must be positive")
+        return config
+
+
+@dataclass(frozen=True, slots=True)
+class DrivetrainKinematicsConfig:
+    """Physical characteristics of the drivetrain used for odometry and trajectory following"""
+    SECTION = "DrivetrainKinematics"
+
+    # meters between the left and right wheels
+    track_width: float = 0.56
+    # wheel speed in meters per second at full motor output
+    max_velocity: float = 3.5
+    # motor output needed to overcome static friction
+    ks: float = 0.05
+
+    def __post_init__(self):
+        for key, value in (("TRACK_WIDTH", self.track_width), ("MAX_VELOCITY", self.max_velocity)):
+            if value <= 0.0:
+                raise ConfigError(f"[{DrivetrainKinematicsConfig.SECTION}] {key} must be positive, got {value}")
+        _check_range(DrivetrainKinematicsConfig.SECTION, "KS", self.ks, 0.0, 1.0)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "DrivetrainKinematicsConfig":
+        reader = _SectionReader(parser, DrivetrainKinematicsConfig.SECTION)
+        return DrivetrainKinematicsConfig(
+            track_width=reader.getfloat("TRACK_WIDTH", 0.56),
+            max_velocity=reader.getfloat("MAX_VELOCITY", 3.5),
+            ks=reader.getfloat("KS", 0.05),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DriveOutputConfig:
+    """The output stage every drive request passes through on its way to the motors"""
+    SECTION = "DrivetrainOutput"
+
+    # max change of each side's output per second while speeding up, and while slowing down or
+    # reversing, 0 leaves it unlimited
+    accel_rate: float = 0.0
+    decel_rate: float = 0.0
+    # scale the output by NOMINAL_VOLTAGE / battery voltage, so a sagging battery drives the same
+    voltage_compensation: bool = False
+    nominal_voltage: float = 12.0
+
+    def __post_init__(self):
+        for key, value in (("ACCEL_RATE", self.accel_rate), ("DECEL_RATE", self.decel_rate)):
+            if value < 0.0:
+                raise ConfigError(f"[{DriveOutputConfig.SECTION}] {key} must not be negative, got {value}")
+        _check_range(DriveOutputConfig.SECTION, "NOMINAL_VOLTAGE", self.nominal_voltage, 6.0, 13.0)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "DriveOutputConfig":
+        reader = _SectionReader(parser, DriveOutputConfig.SECTION)
+        return DriveOutputConfig(
+            accel_rate=reader.getfloat("ACCEL_RATE", 0.0),
+            decel_rate=reader.getfloat("DECEL_RATE", 0.0),
+            voltage_compensation=reader.getboolean("VOLTAGE_COMPENSATION", False),
+            nominal_voltage=reader.getfloat("NOMINAL_VOLTAGE", 12.0),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DrivetrainConfig:
+    GENERAL_SECTION = "DrivetrainGeneral"
+
+    left_motor1: MotorConfig
+    left_motor2: MotorConfig
+    right_motor1: MotorConfig
+    right_motor2: MotorConfig
+    left_group: MotorGroupConfig = MotorGroupConfig()
+    right_group: MotorGroupConfig = MotorGroupConfig()
+    gyro: GyroConfig = GyroConfig()
+    kinematics: DrivetrainKinematicsConfig = DrivetrainKinematicsConfig()
+    left_encoder: EncoderConfig = EncoderConfig()
+    right_encoder: EncoderConfig = EncoderConfig(channel_a=3, channel_b=4)
+    output: DriveOutputConfig = DriveOutputConfig()
+    max_speed: float = 1.0
+    slow_scaling: float = 0.5
+    turbo_scaling: float = 1.0
+    default_scaling: float = 0.7
+
+    def __post_init__(self):
+        _check_range(DrivetrainConfig.GENERAL_SECTION, "MAX_SPEED", self.max_speed, 0.0, 1.0)
+        _check_range(DrivetrainConfig.GENERAL_SECTION, "SLOW_SCALING", self.slow_scaling, 0.0, 1.0)
+        _check_range(DrivetrainConfig.GENERAL_SECTION, "TURBO_SCALING", self.turbo_scaling, 0.0, 1.0)
+        _check_range(DrivetrainConfig.GENERAL_SECTION, "DEFAULT_SCALING", self.default_scaling, 0.0, 1.0)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "DrivetrainConfig":
+        general = _SectionReader(parser, DrivetrainConfig.GENERAL_SECTION)
+        return DrivetrainConfig(
+            left_motor1=MotorConfig.from_section(_SectionReader(parser, "DrivetrainLeftMotor1")),
+            left_motor2=MotorConfig.from_section(_SectionReader(parser, "DrivetrainLeftMotor2")),
+            right_motor1=MotorConfig.from_section(_SectionReader(parser, "DrivetrainRightMotor1")),
+            right_motor2=MotorConfig.from_section(_SectionReader(parser, "DrivetrainRightMotor2")),
+            left_group=MotorGroupConfig.from_section(_SectionReader(parser, "DrivetrainLeftMG")),
+            right_group=MotorGroupConfig.from_section(_SectionReader(parser, "DrivetrainRightMG")),
+            gyro=GyroConfig.from_section(_SectionReader(parser, "DrivetrainGyro")),
+            kinematics=DrivetrainKinematicsConfig.from_parser(parser),
+            left_encoder=EncoderConfig.from_section(_SectionReader(parser, "DrivetrainLeftEncoder")),
+            right_encoder=EncoderConfig.from_section(_SectionReader(parser, "DrivetrainRightEncoder")),
+            output=DriveOutputConfig.from_parser(parser),
+            max_speed=general.getfloat("MAX_SPEED", 1.0),
+            slow_scaling=general.getfloat("SLOW_SCALING", 0.5),
+            turbo_scaling=general.getfloat("TURBO_SCALING", 1.0),
+            default_scaling=general.getfloat("DEFAULT_SCALING", 0.7),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PWMSubsystemConfig:
+    """The general section of a subsystem driven by a single PWM motor controller"""
+    section: str
+    enabled: bool = False
+    channel: int = 0
+    inverted: bool = False
+    max_speed: float = 1.0
+    slew_rate: float = 0.15
+    # outputs are a fraction of the nominal voltage, compensated for the battery voltage
+    voltage_compensation: bool = False
+    nominal_voltage: float = 12.0
+
+    def __post_init__(self):
+        _check_channel(self.section, self.channel)
+        _check_range(self.section, "MAX_SPEED", self.max_speed, 0.0, 1.0)
+        _check_range(self.section, "NOMINAL_VOLTAGE", self.nominal_voltage, 6.0, 13.0)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser, section: str) -> "PWMSubsystemConfig":
+        reader = _SectionReader(parser, section)
+        enabled = reader.getboolean("ENABLED", False)
+        return PWMSubsystemConfig(
+            section=section,
+            enabled=enabled,
+            channel=reader.getint("CHANNEL") if enabled else reader.getint("CHANNEL", 0),
+            inverted=reader.getboolean("INVERTED", False),
+            max_speed=reader.getfloat("MAX_SPEED", 1.0),
+            slew_rate=reader.getfloat("SLEW_RATE", 0.15),
+            voltage_compensation=reader.getboolean("VOLTAGE_COMPENSATION", False),
+            nominal_voltage=reader.getfloat("NOMINAL_VOLTAGE", 12.0),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AnalogFilterConfig:
+    """How a potentiometer is sampled, read from the pot's own section"""
+    FILTERS = ("none", "median", "average")
+
+    section: str
+    # the FPGA sums 2^(OVERSAMPLE_BITS + AVERAGE_BITS) samples for each reading, keeping
+    # OVERSAMPLE_BITS of extra resolution, the roboRIO defaults to 0 and 7
+    oversample_bits: int = 0
+    average_bits: int = 7
+    # then each loop's reading is filtered over the last WINDOW loops: a median rejects spikes,
+    # an average smooths noise, both delay the reading by about half the window
+    filter: str = "none"
+    window: int = 5
+
+    def __post_init__(self):
+        _check_range(self.section, "OVERSAMPLE_BITS", self.oversample_bits, 0, 7)
+        _check_range(self.section, "AVERAGE_BITS", self.average_bits, 0, 7)
+        if self.filter not in AnalogFilterConfig.FILTERS:
+            raise ConfigError(f"[{self.section}] FILTER must be one of {', '.join(AnalogFilterConfig.FILTERS)}, "
+                              f"got {self.filter}")
+        _check_range(self.section, "WINDOW", self.window, 1, 25)
+
+    @staticmethod
+    def from_section(reader: _SectionReader) -> "AnalogFilterConfig":
+        return AnalogFilterConfig(
+            section=reader.section,
+            oversample_bits=reader.getint("OVERSAMPLE_BITS", 0),
+            average_bits=reader.getint("AVERAGE_BITS", 7),
+            filter=reader.get("FILTER", "none").lower(),
+            window=reader.getint("WINDOW", 5),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClimberLimitsConfig:
+    SECTION = "ClimberLimits"
+
+    enabled: bool = False
+    channel: int = 0
+    inverted: bool = False
+    full_range: int = 3600
+    offset: int = -1800
+    extended_threshold: float = 1530.0
+    retracted_threshold: float = -1575.0
+    sampling: AnalogFilterConfig = AnalogFilterConfig("ClimberLimits")
+
+    def __post_init__(self):
+        _check_channel(ClimberLimitsConfig.SECTION, self.channel)
+        if self.retracted_threshold >= self.extended_threshold:
+            raise ConfigError(
+                f"[{ClimberLimitsConfig.SECTION}] RETRACTED_THRESHOLD must be below EXTENDED_THRESHOLD"
+            )
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "ClimberLimitsConfig":
+        reader = _SectionReader(parser, ClimberLimitsConfig.SECTION)
+        return ClimberLimitsConfig(
+            enabled=reader.getboolean("ENABLED", False),
+            channel=reader.getint("CHANNEL", 0),
+            inverted=reader.getboolean("INVERTED", False),
+            full_range=reader.getint("FULL_RANGE", 3600),
+            offset=reader.getint("OFFSET", -1800),
+            extended_threshold=reader.getfloat("EXTENDED_THRESHOLD", 1530.0),
+            retracted_threshold=reader.getfloat("RETRACTED_THRESHOLD", -1575.0),
+            sampling=AnalogFilterConfig.from_section(reader),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClimberControlConfig:
+    """Closed loop control of the winch to named potentiometer setpoints, in pot degrees"""
+    SECTION = "ClimberControl"
+    SETPOINTS = ("stowed", "reach", "hang")
+
+    kp: float = 0.004
+    ki: float = 0.0
+    kd: float = 0.0
+    # feedforward, winch output per pot degree per second of the profiled velocity
+    kv: float = 0.0005
+    # trapezoid profile constraints in pot degrees per second (squared)
+    max_velocity: float = 1500.0
+    max_acceleration: float = 3000.0
+    tolerance: float = 25.0
+    stowed: float = -1450.0
+    reach: float = 1400.0
+    hang: float = -1500.0
+    # within SOFT_LIMIT_ZONE pot degrees of a threshold the winch output towards it tapers down
+    # to SOFT_LIMIT_SPEED at the threshold, so neither manual nor closed loop driving slams the stops
+    soft_limit_zone: float = 300.0
+    soft_limit_speed: float = 0.2
+
+    def __post_init__(self):
+        for key, value in (("MAX_VELOCITY", self.max_velocity), ("MAX_ACCELERATION", self.max_acceleration)):
+            if value <= 0.0:
+                raise ConfigError(f"[{ClimberControlConfig.SECTION}] {key} must be positive, got {value}")
+        for key, value in (("KP", self.kp), ("KI", self.ki), ("KD", self.kd), ("KV", self.kv),
+                           ("TOLERANCE", self.tolerance), ("SOFT_LIMIT_ZONE", self.soft_limit_zone)):
+            if value < 0.0:
+                raise ConfigError(f"[{ClimberControlConfig.SECTION}] {key} must not be negative, got {value}")
+        _check_range(ClimberControlConfig.SECTION, "SOFT_LIMIT_SPEED", self.soft_limit_speed, 0.0, 1.0)
+
+    def setpoint(self, name: str) -> float:
+        """The pot position of a named setpoint."""
+        if name not in ClimberControlConfig.SETPOINTS:
+            raise ConfigError(f"[{ClimberControlConfig.SECTION}] no setpoint {name}, "
+                              f"expected one of {', '.join(ClimberControlConfig.SETPOINTS)}")
+        return getattr(self, name)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "ClimberControlConfig":
+        reader = _SectionReader(parser, ClimberControlConfig.SECTION)
+        return ClimberControlConfig(
+            kp=reader.getfloat("KP", 0.004),
+            ki=reader.getfloat("KI", 0.0),
+            kd=reader.getfloat("KD", 0.0),
+            kv=reader.getfloat("KV", 0.0005),
+            max_velocity=reader.getfloat("MAX_VELOCITY", 1500.0),
+            max_acceleration=reader.getfloat("MAX_ACCELERATION", 3000.0),
+            tolerance=reader.getfloat("TOLERANCE", 25.0),
+            stowed=reader.getfloat("STOWED", -1450.0),
+            reach=reader.getfloat("REACH", 1400.0),
+            hang=reader.getfloat("HANG", -1500.0),
+            soft_limit_zone=reader.getfloat("SOFT_LIMIT_ZONE", 300.0),
+            soft_limit_speed=reader.getfloat("SOFT_LIMIT_SPEED", 0.2),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClimberConfig:
+    general: PWMSubsystemConfig
+    limits: ClimberLimitsConfig = ClimberLimitsConfig()
+    control: ClimberControlConfig = ClimberControlConfig()
+
+    def __post_init__(self):
+        if not self.limits.enabled:
+            return
+        for name in ClimberControlConfig.SETPOINTS:
+            _check_range(ClimberControlConfig.SECTION, name.upper(), self.control.setpoint(name),
+                         self.limits.retracted_threshold, self.limits.extended_threshold)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "ClimberConfig":
+        return ClimberConfig(
+            general=PWMSubsystemConfig.from_parser(parser, "ClimberGeneral"),
+            limits=ClimberLimitsConfig.from_parser(parser),
+            control=ClimberControlConfig.from_parser(parser),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LimitSwitchConfig:
+    channel: int = 0
+    inverted: bool = False
+
+    @staticmethod
+    def from_section(reader: _SectionReader) -> "LimitSwitchConfig":
+        config = LimitSwitchConfig(
+            channel=reader.getint("CHANNEL", 0),
+            inverted=reader.getboolean("INVERTED", False),
+        )
+        _check_channel(reader.section, config.channel)
+        return config
+
+
+@dataclass(frozen=True, slots=True)
+class ArmConfig:
+    GENERAL_SECTION = "ArmGeneral"
+
+    enabled: bool = False
+    channel: int = 0
+    inverted: bool = False
+    max_speed: float = 1.0
+    max_stable_speed: float = 1.0
+    slew_rate: float = 0.15
+    pot_channel: int = 0
+    pot_full_range: float = 3600.0
+    pot_sampling: AnalogFilterConfig = AnalogFilterConfig("ArmPotentiometer")
+    lower_limit: LimitSwitchConfig = LimitSwitchConfig()
+    upper_limit: LimitSwitchConfig = LimitSwitchConfig(channel=1)
+
+    def __post_init__(self):
+        _check_channel(ArmConfig.GENERAL_SECTION, self.channel)
+        _check_range(ArmConfig.GENERAL_SECTION, "MAX_SPEED", self.max_speed, 0.0, 1.0)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "ArmConfig":
+        general = _SectionReader(parser, ArmConfig.GENERAL_SECTION)
+        pot = _SectionReader(parser, "ArmPotentiometer")
+        return ArmConfig(
+            enabled=general.getboolean("ENABLED", False),
+            channel=general.getint("CHANNEL", 0),
+            inverted=general.getboolean("INVERTED", False),
+            max_speed=general.getfloat("MAX_SPEED", 1.0),
+            max_stable_speed=general.getfloat("MAX_STABLE_SPEED", 1.0),
+            slew_rate=general.getfloat("SLEW_RATE", 0.15),
+            pot_channel=pot.getint("CHANNEL", 0),
+            pot_full_range=pot.getfloat("FULL_RANGE", 3600.0),
+            pot_sampling=AnalogFilterConfig.from_section(pot),
+            lower_limit=LimitSwitchConfig.from_section(_SectionReader(parser, "ArmBottomLimitSwitch")),
+            upper_limit=LimitSwitchConfig.from_section(_SectionReader(parser, "ArmTopLimitSwitch")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SolenoidConfig:
+    """A subsystem driven by a single pneumatic solenoid (grabber, flipper)"""
+    section: str
+    enabled: bool = False
+    solenoid_channel: int = 0
+    solenoid_inverted: bool = False
+
+    def __post_init__(self):
+        _check_channel(self.section, self.solenoid_channel)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser, section: str) -> "SolenoidConfig":
+        reader = _SectionReader(parser, section)
+        return SolenoidConfig(
+            section=section,
+            enabled=reader.getboolean("ENABLED", False),
+            solenoid_channel=reader.getint("SOLENOID_CHANNEL", 0),
+            solenoid_inverted=reader.getboolean("SOLENOID_INVERTED", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class VisionConfig:
+    """The camera process, launched through the CameraServer so OpenCV never loads in the robot process"""
+    SECTION = "Vision"
+    PIPELINES = ("apriltag", "hsv")
+
+    enabled: bool = False
+    script: str = "vision/vision.py:start_camera"
+    # apriltag finds field tags, hsv finds the largest blob of a colour (a note)
+    pipeline: str = "apriltag"
+    width: int = 320
+    height: int = 240
+    fps: int = 30
+    # frames processed per second at most, and the share of one CPU core processing may use,
+    # frames beyond either are skipped
+    process_fps: float = 15.0
+    cpu_budget: float = 0.5
+    stream: bool = True
+    # degrees across the image
+    horizontal_fov: float = 60.0
+    # meters above the floor, and degrees the camera is tilted up
+    camera_height: float = 0.5
+    camera_pitch: float = 0.0
+    # meters above the floor of the target center, for the hsv distance estimate
+    target_height: float = 0.025
+    tag_family: str = "tag36h11"
+    # meters across the black square of a tag
+    tag_size: float = 0.1651
+    hsv_lower: tuple[int, int, int] = (5, 120, 120)
+    hsv_upper: tuple[int, int, int] = (25, 255, 255)
+    # pixels
+    min_area: float = 50.0
+    # auto aim turns towards targets captured within AIM_MAX_AGE seconds, at most at AIM_SPEED,
+    # and holds the heading within AIM_TOLERANCE degrees
+    aim_max_age: float = 0.25
+    aim_speed: float = 0.6
+    aim_tolerance: float = 1.5
+
+    def __post_init__(self):
+        if self.pipeline not in VisionConfig.PIPELINES:
+            raise ConfigError(f"[{VisionConfig.SECTION}] PIPELINE must be one of {', '.join(VisionConfig.PIPELINES)}, "
+                              f"got {self.pipeline}")
+        if self.width <= 0 or self.height <= 0 or self.fps <= 0:
+            raise ConfigError(f"[{VisionConfig.SECTION}] WIDTH, HEIGHT and FPS must be positive")
+        _check_range(VisionConfig.SECTION, "PROCESS_FPS", self.process_fps, 0.1, self.fps)
+        _check_range(VisionConfig.SECTION, "CPU_BUDGET", self.cpu_budget, 0.01, 1.0)
+        _check_range(VisionConfig.SECTION, "HORIZONTAL_FOV", self.horizontal_fov, 1.0, 179.0)
+        _check_range(VisionConfig.SECTION, "AIM_MAX_AGE", self.aim_max_age, 0.0, 5.0)
+        _check_range(VisionConfig.SECTION, "AIM_SPEED", self.aim_speed, 0.0, 1.0)
+        _check_range(VisionConfig.SECTION, "AIM_TOLERANCE", self.aim_tolerance, 0.0, 45.0)
+
+    @staticmethod
+    def parse_hsv(key: str, text: str) -> tuple[int, int, int]:
+        try:
+            h, s, v = (int(value) for value in text.split(","))
+        except ValueError as e:
+            raise ConfigError(f"[{VisionConfig.SECTION}] {key}: expected 'h, s, v' got '{text}'") from e
+        return h, s, v
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "VisionConfig":
+        reader = _SectionReader(parser, VisionConfig.SECTION)
+        return VisionConfig(
+            enabled=reader.getboolean("ENABLED", False),
+            script=reader.get("SCRIPT", "vision/vision.py:start_camera"),
+            pipeline=reader.get("PIPELINE", "apriltag").lower(),
+            width=reader.getint("WIDTH", 320),
+            height=reader.getint("HEIGHT", 240),
+            fps=reader.getint("FPS", 30),
+            process_fps=reader.getfloat("PROCESS_FPS", 15.0),
+            cpu_budget=reader.getfloat("CPU_BUDGET", 0.5),
+            stream=reader.getboolean("STREAM", True),
+            horizontal_fov=reader.getfloat("HORIZONTAL_FOV", 60.0),
+            camera_height=reader.getfloat("CAMERA_HEIGHT", 0.5),
+            camera_pitch=reader.getfloat("CAMERA_PITCH", 0.0),
+            target_height=reader.getfloat("TARGET_HEIGHT", 0.025),
+            tag_family=reader.get("TAG_FAMILY", "tag36h11"),
+            tag_size=reader.getfloat("TAG_SIZE", 0.1651),
+            hsv_lower=VisionConfig.parse_hsv("HSV_LOWER", reader.get("HSV_LOWER", "5, 120, 120")),
+            hsv_upper=VisionConfig.parse_hsv("HSV_UPPER", reader.get("HSV_UPPER", "25, 255, 255")),
+            min_area=reader.getfloat("MIN_AREA", 50.0),
+            aim_max_age=reader.getfloat("AIM_MAX_AGE", 0.25),
+            aim_speed=reader.getfloat("AIM_SPEED", 0.6),
+            aim_tolerance=reader.getfloat("AIM_TOLERANCE", 1.5),
+        )
+
+    @staticmethod
+    def load(path: str) -> "VisionConfig":
+        """Read only the vision section, the camera process has no use for the rest."""
+        return VisionConfig.from_parser(_read(path))
+
+
+@dataclass(frozen=True, slots=True)
+class MatchLogConfig:
+    """The binary log of every robot loop, written to the USB stick when one is mounted"""
+    SECTION = "MatchLog"
+
+    enabled: bool = True
+    # also record when running in the simulator
+    simulation: bool = False
+    directory: str = "/home/lvuser/logs"
+    usb_directory: str = "/u/logs"
+    # robot loops per block handed to the writer thread, and blocks in the ring
+    block_loops: int = 50
+    blocks: int = 8
+
+    def __post_init__(self):
+        if self.block_loops < 1:
+            raise ConfigError(f"[{self.SECTION}] BLOCK_LOOPS must be at least 1, got {self.block_loops}")
+        if self.blocks < 3:
+            raise ConfigError(f"[{self.SECTION}] BLOCKS must be at least 3, got {self.blocks}")
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "MatchLogConfig":
+        reader = _SectionReader(parser, MatchLogConfig.SECTION)
+        return MatchLogConfig(
+            enabled=reader.getboolean("ENABLED", True),
+            simulation=reader.getboolean("SIMULATION", False),
+            directory=reader.get("DIRECTORY", "/home/lvuser/logs"),
+            usb_directory=reader.get("USB_DIRECTORY", "/u/logs"),
+            block_loops=reader.getint("BLOCK_LOOPS", 50),
+            blocks=reader.getint("BLOCKS", 8),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PowerBudgetConfig:
+    """The current the subsystems may draw together, shared out in priority order each loop"""
+    SECTION = "PowerBudget"
+
+    enabled: bool = False
+    # amps shared out at full battery, shrinking to nothing as the battery sags from LOW_VOLTAGE
+    # to BROWNOUT_VOLTAGE
+    total_current: float = 200.0
+    low_voltage: float = 9.0
+    brownout_voltage: float = 7.0
+    # also read the total current of the power distribution panel, so loads the budget does not
+    # drive (compressor, roboRIO, radio) count against it
+    power_distribution: bool = False
+    # (subsystem, amps drawn at full output) highest priority first, from PRIORITY and the
+    # <SUBSYSTEM>_CURRENT keys
+    channels: tuple[tuple[str, float], ...] = (
+        ("Drivetrain", 160.0), ("Climber", 40.0), ("Shooter", 40.0), ("Vacuum", 30.0))
+    DEFAULT_CURRENT = 40.0
+
+    def __post_init__(self):
+        if self.total_current <= 0.0:
+            raise ConfigError(f"[{self.SECTION}] TOTAL_CURRENT must be positive, got {self.total_current}")
+        _check_range(self.SECTION, "LOW_VOLTAGE", self.low_voltage, 6.0, 13.0)
+        _check_range(self.SECTION, "BROWNOUT_VOLTAGE", self.brownout_voltage, 4.5, self.low_voltage)
+        names = [name for name, _ in self.channels]
+        if len(set(names)) != len(names):
+            raise ConfigError(f"[{self.SECTION}] PRIORITY lists a subsystem more than once: {', '.join(names)}")
+        for name, current in self.channels:
+            if current < 0.0:
+                raise ConfigError(f"[{self.SECTION}] {name.upper()}_CURRENT must not be negative, got {current}")
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "PowerBudgetConfig":
+        reader = _SectionReader(parser, PowerBudgetConfig.SECTION)
+        defaults = dict(PowerBudgetConfig().channels)
+        priority = [name.strip() for name in reader.get("PRIORITY", ", ".join(defaults)).split(",") if name.strip()]
+        return PowerBudgetConfig(
+            enabled=reader.getboolean("ENABLED", False),
+            total_current=reader.getfloat("TOTAL_CURRENT", 200.0),
+            low_voltage=reader.getfloat("LOW_VOLTAGE", 9.0),
+            brownout_voltage=reader.getfloat("BROWNOUT_VOLTAGE", 7.0),
+            power_distribution=reader.getboolean("POWER_DISTRIBUTION", False),
+            channels=tuple((name, reader.getfloat(f"{name.upper()}_CURRENT", defaults.get(name, PowerBudgetConfig.DEFAULT_CURRENT)))
+                           for name in priority),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SubsystemsConfig:
+    drivetrain: DrivetrainConfig
+    vacuum: PWMSubsystemConfig
+    shooter: PWMSubsystemConfig
+    climber: ClimberConfig
+    arm: ArmConfig = ArmConfig()
+    grabber: SolenoidConfig = SolenoidConfig("GrabberGeneral")
+    flipper: SolenoidConfig = SolenoidConfig("FlipperGeneral")
+    vision: VisionConfig = VisionConfig()
+    match_log: MatchLogConfig = MatchLogConfig()
+    power_budget: PowerBudgetConfig = PowerBudgetConfig()
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "SubsystemsConfig":
+        return SubsystemsConfig(
+            drivetrain=DrivetrainConfig.from_parser(parser),
+            vacuum=PWMSubsystemConfig.from_parser(parser, "VacuumGeneral"),
+            shooter=PWMSubsystemConfig.from_parser(parser, "ShooterGeneral"),
+            climber=ClimberConfig.from_parser(parser),
+            arm=ArmConfig.from_parser(parser),
+            grabber=SolenoidConfig.from_parser(parser, "GrabberGeneral"),
+            flipper=SolenoidConfig.from_parser(parser, "FlipperGeneral"),
+            vision=VisionConfig.from_parser(parser),
+            match_log=MatchLogConfig.from_parser(parser),
+            power_budget=PowerBudgetConfig.from_parser(parser),
+        )
+
+    @staticmethod
+    def load(path: str) -> "SubsystemsConfig":
+        return SubsystemsConfig.from_parser(_read(path))
+
+
+#####
+# joysticks.ini
+#####
+
+
+@dataclass(frozen=True, slots=True)
+class AxisShapingConfig:
+    """Input shaping of one controller axis, declared as [JoyConfig<n>.<axis>]"""
+    name: str
+    # inputs inside the dead zone read as zero, the rest of the range is rescaled to 0..1
+    dead_zone: float = 0.15
+    # 0 is linear, 1 is fully cubic
+    expo: float = 0.0
+    # max change of the shaped value per second, 0 disables slew limiting
+    slew_rate: float = 0.0
+    inverted: bool = False
+
+    def __post_init__(self):
+        _check_range(self.name, "DEAD_ZONE", self.dead_zone, 0.0, 0.99)
+        _check_range(self.name, "EXPO", self.expo, 0.0, 1.0)
+        if self.slew_rate < 0.0:
+            raise ConfigError(f"[{self.name}] SLEW_RATE must not be negative, got {self.slew_rate}")
+
+    @staticmethod
+    def from_parser(parser: ConfigParser, section: str, name: str, dead_zone: float) -> "AxisShapingConfig":
+        reader = _SectionReader(parser, section)
+        return AxisShapingConfig(
+            name=name,
+            dead_zone=reader.getfloat("DEAD_ZONE", dead_zone),
+            expo=reader.getfloat("EXPO", 0.0),
+            slew_rate=reader.getfloat("SLEW_RATE", 0.0),
+            inverted=reader.getboolean("INVERTED", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ControllerConfig:
+    AXIS_NAMES = ("LEFTX", "LEFTY", "RIGHTX", "RIGHTY", "LEFTTRIGGER", "RIGHTTRIGGER")
+
+    section: str
+    port: int
+    dead_zone: float = 0.15
+    axes: tuple[AxisShapingConfig, ...] = tuple(AxisShapingConfig(name) for name in AXIS_NAMES)
+
+    def __post_init__(self):
+        if self.port < 0:
+            raise ConfigError(f"[{self.section}] PORT must not be negative, got {self.port}")
+        _check_range(self.section, "DEAD_ZONE", self.dead_zone, 0.0, 0.99)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser, section: str, default_port: int) -> "ControllerConfig":
+        reader = _SectionReader(parser, section)
+        dead_zone = reader.getfloat("DEAD_ZONE", 0.15)
+        return ControllerConfig(
+            section=section,
+            port=reader.getint("PORT", default_port),
+            dead_zone=dead_zone,
+            axes=tuple(
+                AxisShapingConfig.from_parser(parser, f"{section}.{name}", name, dead_zone)
+                for name in ControllerConfig.AXIS_NAMES
+            ),
+        )
+
+    def axis(self, name: str) -> AxisShapingConfig:
+        for axis in self.axes:
+            if axis.name == name:
+                return axis
+        raise KeyError(name)
+
+
+@dataclass(frozen=True, slots=True)
+class JoystickConfig:
+    JOY_CONFIG_SECTION = "JoyConfig"
+    CONTROLLER_COUNT = 2
+
+    controllers: tuple[ControllerConfig, ...] = field(
+        default=(ControllerConfig("JoyConfig0", 0), ControllerConfig("JoyConfig1", 1))
+    )
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "JoystickConfig":
+        return JoystickConfig(
+            controllers=tuple(
+                ControllerConfig.from_parser(parser, JoystickConfig.JOY_CONFIG_SECTION + str(i), i)
+                for i in range(JoystickConfig.CONTROLLER_COUNT)
+            )
+        )
+
+    @staticmethod
+    def load(path: str) -> "JoystickConfig":
+        return JoystickConfig.from_parser(_read(path))
+
+
+#####
+# autonomous.ini
+#####
+
+
+@dataclass(frozen=True, slots=True)
+class AutonomousRoutineConfig:
+    """Timing and speed of a single dead reckoning autonomous routine"""
+    section: str
+    drive_speed: float = 0.0
+    drive_time: float = 0.0
+    wait_time: float = 0.0
+    shoot_time: float = 0.0
+    vacuum_time: float = 0.0
+
+    def __post_init__(self):
+        _check_range(self.section, "DRIVE_SPEED", self.drive_speed, -1.0, 1.0)
+        for key, value in (("DRIVE_TIME", self.drive_time), ("WAIT_TIME", self.wait_time),
+                           ("SHOOT_TIME", self.shoot_time), ("VACUUM_TIME", self.vacuum_time)):
+            if value < 0.0:
+                raise ConfigError(f"[{self.section}] {key} must not be negative, got {value}")
+
+    @staticmethod
+    def from_parser(parser: ConfigParser, section: str) -> "AutonomousRoutineConfig":
+        reader = _SectionReader(parser, section)
+        return AutonomousRoutineConfig(
+            section=section,
+            drive_speed=reader.getfloat("DRIVE_SPEED", 0.0),
+            drive_time=reader.getfloat("DRIVE_TIME", 0.0),
+            wait_time=reader.getfloat("WAIT_TIME", 0.0),
+            shoot_time=reader.getfloat("SHOOT_TIME", 0.0),
+            vacuum_time=reader.getfloat("VACUUM_TIME", 0.0),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TurnControllerConfig:
+    """Gains and motion constraints of the profiled PID heading controller used by the turn commands"""
+    SECTION = "TurnController"
+
+    kp: float = 0.02
+    ki: float = 0.0
+    kd: float = 0.001
+    # feedforward, turn speed per degree per second of the profiled velocity
+    kv: float = 0.002
+    # trapezoid profile constraints in degrees per second (squared)
+    max_velocity: float = 360.0
+    max_acceleration: float = 720.0
+    velocity_tolerance: float = 10.0
+    # seconds the heading must stay within tolerance before a turn is finished
+    settle_time: float = 0.1
+
+    def __post_init__(self):
+        for key, value in (("MAX_VELOCITY", self.max_velocity), ("MAX_ACCELERATION", self.max_acceleration)):
+            if value <= 0.0:
+                raise ConfigError(f"[{TurnControllerConfig.SECTION}] {key} must be positive, got {value}")
+        for key, value in (("KP", self.kp), ("KI", self.ki), ("KD", self.kd), ("KV", self.kv),
+                           ("VELOCITY_TOLERANCE", self.velocity_tolerance), ("SETTLE_TIME", self.settle_time)):
+            if value < 0.0:
+                raise ConfigError(f"[{TurnControllerConfig.SECTION}] {key} must not be negative, got {value}")
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "TurnControllerConfig":
+        reader = _SectionReader(parser, TurnControllerConfig.SECTION)
+        return TurnControllerConfig(
+            kp=reader.getfloat("KP", 0.02),
+            ki=reader.getfloat("KI", 0.0),
+            kd=reader.getfloat("KD", 0.001),
+            kv=reader.getfloat("KV", 0.002),
+            max_velocity=reader.getfloat("MAX_VELOCITY", 360.0),
+            max_acceleration=reader.getfloat("MAX_ACCELERATION", 720.0),
+            velocity_tolerance=reader.getfloat("VELOCITY_TOLERANCE", 10.0),
+            settle_time=reader.getfloat("SETTLE_TIME", 0.1),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TrajectoryFollowerConfig:
+    """Constraints for generating trajectories and the gains of the RAMSETE controller following them"""
+    SECTION = "TrajectoryFollower"
+
+    # meters per second (squared)
+    max_velocity: float = 2.0
+    max_acceleration: float = 1.5
+    ramsete_b: float = 2.0
+    ramsete_zeta: float = 0.7
+
+    def __post_init__(self):
+        for key, value in (("MAX_VELOCITY", self.max_velocity), ("MAX_ACCELERATION", self.max_acceleration),
+                           ("RAMSETE_B", self.ramsete_b)):
+            if value <= 0.0:
+                raise ConfigError(f"[{TrajectoryFollowerConfig.SECTION}] {key} must be positive, got {value}")
+        _check_range(TrajectoryFollowerConfig.SECTION, "RAMSETE_ZETA", self.ramsete_zeta, 0.0, 1.0)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "TrajectoryFollowerConfig":
+        reader = _SectionReader(parser, TrajectoryFollowerConfig.SECTION)
+        return TrajectoryFollowerConfig(
+            max_velocity=reader.getfloat("MAX_VELOCITY", 2.0),
+            max_acceleration=reader.getfloat("MAX_ACCELERATION", 1.5),
+            ramsete_b=reader.getfloat("RAMSETE_B", 2.0),
+            ramsete_zeta=reader.getfloat("RAMSETE_ZETA", 0.7),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PathConfig:
+    """A path through waypoints of (x meters, y meters, heading degrees), declared as [Trajectory:<name>]"""
+    SECTION_PREFIX = "Trajectory:"
+
+    name: str
+    waypoints: tuple[tuple[float, float, float], ...]
+    reversed: bool = False
+
+    def __post_init__(self):
+        if len(self.waypoints) < 2:
+            raise ConfigError(f"[{self.section}] WAYPOINTS needs at least two waypoints")
+
+    @property
+    def section(self) -> str:
+        return PathConfig.SECTION_PREFIX + self.name
+
+    @staticmethod
+    def parse_waypoints(section: str, text: str) -> tuple[tuple[float, float, float], ...]:
+        waypoints = []
+        for waypoint in text.split(";"):
+            if not waypoint.strip():
+                continue
+            try:
+                x, y, heading = (float(value) for value in waypoint.split(","))
+            except ValueError as e:
+                raise ConfigError(f"[{section}] WAYPOINTS: expected 'x, y, heading' got '{waypoint.strip()}'") from e
+            waypoints.append((x, y, heading))
+        return tuple(waypoints)
+
+    @staticmethod
+    def from_parser(parser: ConfigParser, section: str) -> "PathConfig":
+        reader = _SectionReader(parser, section)
+        return PathConfig(
+            name=section[len(PathConfig.SECTION_PREFIX):],
+            waypoints=PathConfig.parse_waypoints(section, reader.get("WAYPOINTS")),
+            reversed=reader.getboolean("REVERSED", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class AutonomousConfig:
+    move_from_line: AutonomousRoutineConfig = AutonomousRoutineConfig("MoveFromLine")
+    delayed_move_from_line: AutonomousRoutineConfig = AutonomousRoutineConfig("DelayedMoveFromLine")
+    drive_to_wall: AutonomousRoutineConfig = AutonomousRoutineConfig("DriveToWall")
+    dead_reckoning_score: AutonomousRoutineConfig = AutonomousRoutineConfig("DeadReckoningScore")
+    shoot_score: AutonomousRoutineConfig = AutonomousRoutineConfig("ShootScore")
+    turn_controller: TurnControllerConfig = TurnControllerConfig()
+    trajectory_follower: TrajectoryFollowerConfig = TrajectoryFollowerConfig()
+    trajectories: tuple[PathConfig, ...] = ()
+
+    @staticmethod
+    def from_parser(parser: ConfigParser) -> "AutonomousConfig":
+        return AutonomousConfig(
+            move_from_line=AutonomousRoutineConfig.from_parser(parser, "MoveFromLine"),
+            delayed_move_from_line=AutonomousRoutineConfig.from_parser(parser, "DelayedMoveFromLine"),
+            drive_to_wall=AutonomousRoutineConfig.from_parser(parser, "DriveToWall"),
+            dead_reckoning_score=AutonomousRoutineConfig.from_parser(parser, "DeadReckoningScore"),
+            shoot_score=AutonomousRoutineConfig.from_parser(parser, "ShootScore"),
+            turn_controller=TurnControllerConfig.from_parser(parser),
+            trajectory_follower=TrajectoryFollowerConfig.from_parser(parser),
+            trajectories=tuple(
+                PathConfig.from_parser(parser, section)
+                for section in parser.sections()
+                if section.startswith(PathConfig.SECTION_PREFIX)
+            ),
+        )
+
+    @staticmethod
+    def load(path: str) -> "AutonomousConfig":
+        return AutonomousConfig.from_parser(_read(path))
+
+
+@dataclass(frozen=True, slots=True)
+class RobotConfig:
+    subsystems: SubsystemsConfig
+    joysticks: JoystickConfig
+    autonomous: AutonomousConfig
+
+    @staticmethod
+    def load(subsystems_path: str, joystick_path: str, autonomous_path: str) -> "RobotConfig":
+        return RobotConfig(
+            subsystems=SubsystemsConfig.load(subsystems_path),
+            joysticks=JoystickConfig.load(joystick_path),
+            autonomous=AutonomousConfig.load(autonomous_path),
+        )
@@ -1,24 +1,34 @@
 # Copyright (c) Southfield High School Team 94
 # Open Source Software; you can modify and / or share it under the terms of
 # the MIT license file in the root directory of this project
-import configparser
 import logging
-from configparser import ConfigParser
+import os
+from typing import TYPE_CHECKING, Optional
 
-from commands2 import Subsystem, SequentialCommandGroup
-from wpilib import SmartDashboard, SendableChooser
+from commands2 import Command, Subsystem
+from wpilib import DriverStation, RobotBase, SmartDashboard, SendableChooser
+from wpilib import RobotController as RoboRIO
 
-from autonomous.autonomous_drive_commands import MoveFromLine, DelayedMoveFromLine
-from commands.climber_commands import Climb, ClimberDrive, DoNothingClimber
-from commands.do_nothing import DoNothing
-from commands.shooter_commands import DoNothingShooter, RaiseShooter, LowerShooter, ShooterDrive
-from commands.tank_drive_commands import TankDrive, GoTurbo, ReleaseTurbo, GoSlow, ReleaseSlow
-from commands.vacuum_commands import Vac, VacuumDrive, DoNothingVacuum
 from oi import OI
+from robot_config import AutonomousConfig, JoystickConfig, RobotConfig, SubsystemsConfig
 from subsystems.climber import Climber
 from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
 from subsystems.shooter import Shooter
 from subsystems.vacuum import Vacuum
+from util.boot import BootTimeline
+from util.match_log import LogField, MatchLogger
+from util.power_budget import PowerBudget
+from util.sensor_snapshot import SensorSnapshot
+from util.stopwatch import timer_service
+from util.telemetry import Telemetry
+
+if TYPE_CHECKING:
+    from autonomous.trajectory import TrajectoryLibrary
+    from subsystems.arm import Arm
+    from subsystems.flipper import Flipper
+    from subsystems.grabber import Grabber
+    from subsystems.vision import Vision
 
 
 class RobotController:
@@ -27,19 +37,43 @@ class RobotController:
     `robotpy`/wpilib Command-based declarative paradigm. The majority of the structure
     of the robot outside of subsystems, and operator interface (oi) mappings are
     declared here
+
+    Command modules and the optional subsystems (arm, grabber, flipper, vision) are imported
+    lazily, only when they are mapped or enabled in the config, to keep boot time down
     """
     SUBSYSTEMS_CONFIG_PATH = "/home/lvuser/py/configs/subsystems.ini"
     JOYSTICK_CONFIG_PATH = "/home/lvuser/py/configs/joysticks.ini"
     AUTONOMOUS_CONFIG_PATH = "/home/lvuser/py/configs/autonomous.ini"
+    # driver station data recorded for each controller in the match log
+    LOGGED_AXES = 6
+    # bits of the match log "mode" field
+    MODE_ENABLED = 1
+    MODE_AUTONOMOUS = 2
+    MODE_TEST = 4
 
     def __init__(self,
                  subsystems_config: str = SUBSYSTEMS_CONFIG_PATH,
                  joystick_config: str = JOYSTICK_CONFIG_PATH,
-                 auto_config: str = AUTONOMOUS_CONFIG_PATH
+                 auto_config: str = AUTONOMOUS_CONFIG_PATH,
+                 boot: Optional[BootTimeline] = None
                  ) -> None:
+        self._boot = boot if boot is not None else BootTimeline(profile_imports=False)
         self._init_config(subsystems_config, joystick_config, auto_config)
+        self._boot.mark("config")
+        self._telemetry = Telemetry()
+        self._sensors = SensorSnapshot()
+        self._power = PowerBudget(self._config.subsystems.power_budget, self._sensors, self._telemetry)
         self._subsystems = self._init_subsystems()
+        self._boot.mark("subsystems")
+        self._subsystems.extend(self._init_optional_subsystems())
+        self._boot.mark("optional_subsystems")
+        self._init_telemetry()
+        self._init_trajectories()
+        self._boot.mark("trajectories")
         self._setup_autonomous_smartdashboard()
+        self._boot.mark("autonomous")
+        self._init_match_log()
+        self._boot.mark("match_log")
 
     def _init_config(self,
                      subsystems_config_path: str,
@@ -47,21 +81,12 @@ class RobotController:
                      autonomous_config_path: str
                      ) -> None:
         """
-        Initialize config parsers for subsystems, operator interface, and autonomous
+        Parse and validate the configs for subsystems, operator interface, and autonomous once,
+        every subsystem and command shares the resulting typed configs
         """
         logging.debug("Reading configs")
-
-        self._subsystems_config = configparser.ConfigParser()
-        self._subsystems_config.read(subsystems_config_path)
-        logging.info("Parsed subsystem configs")
-
-        self._joystick_config = configparser.ConfigParser()
-        self._joystick_config.read(joystick_config_path)
-        logging.info("Parsed joystick configs")
-
-        self._autonomous_config = configparser.ConfigParser()
-        self._autonomous_config.read(autonomous_config_path)
-        logging.info("Parsed autonomous configs")
+        self._config = RobotConfig.load(subsystems_config_path, joystick_config_path, autonomous_config_path)
+        logging.info("Parsed subsystem, joystick and autonomous configs")
 
     def _init_subsystems(self) -> list[Subsystem]:
         """
@@ -69,29 +94,83 @@ class RobotController:
         """
         subsystems = []
 
-        self._oi = OI(self._joystick_config)
+        self._oi = OI(self._config.joysticks)
         subsystems.append(self._oi)
         logging.info("Operator Interface Subsystem Completed Setup")
 
-        self._drivetrain = Drivetrain(self._subsystems_config)
+        self._drivetrain = Drivetrain(self._config.subsystems.drivetrain, self._telemetry, self._sensors,
+                                      power=self._power)
         subsystems.append(self._drivetrain)
         logging.info("Drivetrain Subsystem Completed Setup")
 
-        self._vacuum = Vacuum(self._subsystems_config)
+        self._odometry = Odometry(self._drivetrain, self._telemetry)
+        subsystems.append(self._odometry)
+        logging.info("Odometry Subsystem Completed Setup")
+
+        self._vacuum = Vacuum(self._config.subsystems.vacuum, self._telemetry, self._sensors, self._power)
         subsystems.append(self._vacuum)
         logging.info("Feeder(Vacuum) Subsystem Completed Setup")
 
-        self._shooter = Shooter(self._subsystems_config)
+        self._shooter = Shooter(self._config.subsystems.shooter, self._telemetry, self._sensors, self._power)
         subsystems.append(self._shooter)
         logging.info("Conveyor(Shooter) Subsystem Completed Setup")
 
-        self._climber = Climber(self._subsystems_config)
+        self._climber = Climber(self._config.subsystems.climber, self._telemetry, self._sensors, self._power)
         subsystems.append(self._climber)
         logging.info("Winch(Climber) Subsystem Completed Setup")
 
-        # wpilib.CameraServer.launch(vision_py='vision/vision.py:start_camera')
         return subsystems
 
+    def _init_optional_subsystems(self) -> list[Subsystem]:
+        """
+        Initialize the subsystems that are not on every robot, their modules are only imported
+        when they are enabled in the config
+        """
+        subsystems = []
+        config = self._config.subsystems
+        self._arm = None
+        self._grabber = None
+        self._flipper = None
+
+        if config.arm.enabled:
+            from subsystems.arm import Arm
+            self._arm = Arm(config.arm, self._telemetry, self._sensors)
+            subsystems.append(self._arm)
+            logging.info("Arm Subsystem Completed Setup")
+
+        if config.grabber.enabled:
+            from subsystems.grabber import Grabber
+            self._grabber = Grabber(config.grabber)
+            subsystems.append(self._grabber)
+            logging.info("Grabber Subsystem Completed Setup")
+
+        if config.flipper.enabled:
+            from subsystems.flipper import Flipper
+            self._flipper = Flipper(None, config.flipper)
+            subsystems.append(self._flipper)
+            logging.info("Flipper Subsystem Completed Setup")
+
+        self._vision = None
+        if config.vision.enabled:
+            # the camera runs in its own process, OpenCV and numpy are never imported here
+            from wpilib import CameraServer
+            from subsystems.vision import Vision
+            CameraServer.launch(config.vision.script)
+            logging.info("Vision process launched")
+            self._vision = Vision(self._odometry, self._telemetry)
+            subsystems.append(self._vision)
+            logging.info("Vision Subsystem Completed Setup")
+
+        return subsystems
+
+    def _init_telemetry(self) -> None:
+        """
+        Register the dashboard values published by the robot controller itself
+        """
+        self._pot_value_entry = self._telemetry.add_number("Climber-POT-Value-Degrees", epsilon=0.5)
+        self._telemetry.add_number("Climber-POT-Degrees-Range", self._climber.pot_range())
+        self._telemetry.add_number("Climber-POT-Degrees-Offset", self._climber.pot_offset())
+
     def mappings(self) -> None:
         """
         A method to connect subsystems, the operator interface, and autonomous once
@@ -100,6 +179,10 @@ class RobotController:
         This method is called separately from the constructor to prevent circular dependencies
         across Subsystem and Command constructor initialization
         """
+        from commands.climber_commands import Climb, ClimberDrive, ClimbToSetpoint, DoNothingClimber, FullClimb
+        from commands.shooter_commands import RaiseShooter, LowerShooter, ShooterDrive
+        from commands.tank_drive_commands import TankDrive, GoTurbo, ReleaseTurbo, GoSlow, ReleaseSlow
+        from commands.vacuum_commands import Vac, VacuumDrive, DoNothingVacuum
 
         # set up the default drive command to be tank drive
         self.drivetrain.setDefaultCommand(TankDrive(self.oi, self.drivetrain))
@@ -116,6 +199,13 @@ class RobotController:
         self.oi.driver_controller.leftBumper().onTrue(GoSlow(self.drivetrain))
         self.oi.driver_controller.leftBumper().onFalse(ReleaseSlow(self.drivetrain))
 
+        if self._vision is not None:
+            from commands.vision_commands import AutoAim
+            # hold the driver A button to turn towards the vision target
+            self.oi.driver_controller.a().whileTrue(
+                AutoAim(self.oi, self.drivetrain, self.odometry, self._vision, self._config.subsystems.vision,
+                        self._config.autonomous.turn_controller))
+
         # set up the right bumper of the scoring controller to trigger the vacuum to spit
         self.oi.scoring_controller.rightBumper().whileTrue(Vac(self.vacuum, self.oi, 1.0))
         # set up the left bumper of the scoring controller to trigger the vacuum to suck
@@ -130,23 +220,150 @@ class RobotController:
         self.oi.scoring_controller.leftStick().whileTrue(ClimberDrive(self.climber, self.oi))
         self.oi.scoring_controller.x().whileTrue(Climb(self.climber, self.oi, 0.5))
         self.oi.scoring_controller.b().whileTrue(Climb(self.climber, self.oi, -0.5))
+        # hold start for the full climb, back stows the hooks
+        self.oi.scoring_controller.start().whileTrue(FullClimb(self.climber))
+        self.oi.scoring_controller.back().onTrue(ClimbToSetpoint(self.climber, "stowed"))
 
     def get_auto_chooser(self) -> SendableChooser:
         return self._oi.get_auto_chooser()
 
+    def _init_trajectories(self) -> None:
+        """
+        Generate every autonomous trajectory up front so none are generated during autonomous
+        """
+        from autonomous.trajectory import TrajectoryLibrary
+
+        self._trajectories = TrajectoryLibrary(self._config.autonomous, self._drivetrain.kinematics)
+        self._trajectories.generate()
+
     def _setup_autonomous_smartdashboard(self) -> SendableChooser:
+        from autonomous.autonomous_drive_commands import MoveFromLine, DelayedMoveFromLine
+        from autonomous.trajectory import FollowTrajectory
+        from commands.do_nothing import DoNothing
+
         auto_chooser = self._oi.get_auto_chooser()
-        auto_chooser.setDefaultOption("Move_From_Line", MoveFromLine(self._drivetrain, self._autonomous_config))
-        auto_chooser.setDefaultOption("DELAYED_Mobility",
-                                      DelayedMoveFromLine(self._drivetrain, self._autonomous_config))
-        auto_chooser.addOption("Do_Nothing", DoNothing(self._drivetrain))
+        # every option in the order added, the match log records the selected one by its index
+        self._auto_options: list[tuple[str, Command]] = [
+            ("Move_From_Line", MoveFromLine(self._drivetrain, self._config.autonomous)),
+            ("DELAYED_Mobility", DelayedMoveFromLine(self._drivetrain, self._config.autonomous)),
+        ]
+        auto_chooser.addOption(*self._auto_options[0])
+        auto_chooser.setDefaultOption(*self._auto_options[1])
+        self._auto_options.append(("Do_Nothing", DoNothing(self._drivetrain)))
+        auto_chooser.addOption(*self._auto_options[-1])
+        for name, trajectory in self._trajectories.trajectories.items():
+            self._auto_options.append((f"Path_{name}",
+                                       FollowTrajectory(self._drivetrain, self._odometry, trajectory,
+                                                        self._config.autonomous.trajectory_follower)))
+            auto_chooser.addOption(*self._auto_options[-1])
         SmartDashboard.putData(auto_chooser)
         return auto_chooser
 
+    def _selected_auto_index(self) -> int:
+        selected = self._oi.get_auto_chooser().getSelected()
+        for i, (_, command) in enumerate(self._auto_options):
+            if command is selected:
+                return i
+        return -1
+
+    def _init_match_log(self) -> None:
+        """
+        Record every loop to a binary match log on the roboRIO, or the USB stick when one is mounted
+
+        Only the real robot logs unless the config enables it in the simulator. A log that can not
+        be created is reported and the robot runs without it.
+        """
+        self._match_logger: Optional[MatchLogger] = None
+        config = self._config.subsystems.match_log
+        if not config.enabled or not (RobotBase.isReal() or config.simulation):
+            return
+        directory = config.directory
+        if os.path.isdir(os.path.dirname(config.usb_directory)):
+            directory = config.usb_directory
+        logger = MatchLogger(config.block_loops, config.blocks)
+        for log_field in self.match_log_fields():
+            logger.add_field(log_field.name, log_field.code, log_field.getter)
+        try:
+            path = logger.start(directory, {
+                "autos": [name for name, _ in self._auto_options],
+                "ports": [controller.port for controller in self._config.joysticks.controllers],
+            })
+        except OSError as e:
+            logging.warning("Match log disabled, could not create a log in %s: %s", directory, e)
+            return
+        self._match_logger = logger
+        logging.info("Recording match log %s", path)
+
+    def match_log_fields(self) -> list[LogField]:
+        """
+        Every value recorded to the match log each loop: the driver station inputs, each sampled
+        sensor and the motor outputs, which is all a replay needs to reproduce the loop
+        """
+        fields = [
+            LogField("timestamp", "q", timer_service.now),
+            LogField("mode", "B", self._mode),
+            LogField("auto", "b", self._selected_auto_index),
+        ]
+        for controller in self._config.joysticks.controllers:
+            port = controller.port
+            for axis in range(self.LOGGED_AXES):
+                fields.append(LogField(f"joystick{port}/axis{axis}", "f",
+                                       lambda port=port, axis=axis: DriverStation.getStickAxis(port, axis)))
+            fields.append(LogField(f"joystick{port}/buttons", "I",
+                                   lambda port=port: DriverStation.getStickButtons(port)))
+            fields.append(LogField(f"joystick{port}/pov", "h",
+                                   lambda port=port: DriverStation.getStickPOV(port, 0)))
+        for name, reading in self._sensors.readings.items():
+            fields.append(LogField(f"sensor/{name}", "?" if isinstance(reading.get(), bool) else "d", reading.get))
+        fields.extend([
+            LogField("output/left", "f", self._drivetrain.left_motor.get),
+            LogField("output/right", "f", self._drivetrain.right_motor.get),
+            LogField("output/vacuum", "f", lambda: self._vacuum.output),
+            LogField("output/shooter", "f", lambda: self._shooter.output),
+            LogField("output/climber", "f", lambda: self._climber.output),
+            LogField("battery", "f", RoboRIO.getBatteryVoltage),
+        ])
+        return fields
+
+    def _mode(self) -> int:
+        mode = self.MODE_ENABLED if DriverStation.isEnabled() else 0
+        if DriverStation.isAutonomous():
+            mode |= self.MODE_AUTONOMOUS
+        elif DriverStation.isTest():
+            mode |= self.MODE_TEST
+        return mode
+
+    def record_loop(self) -> None:
+        """Record this loop to the match log, called once the scheduler has run."""
+        if self._match_logger is not None:
+            self._match_logger.record()
+
+    def flush_match_log(self) -> None:
+        """Write the loops recorded so far to the match log without waiting for the block to fill."""
+        if self._match_logger is not None:
+            self._match_logger.flush()
+
+    def close_match_log(self) -> None:
+        if self._match_logger is not None:
+            self._match_logger.close()
+            self._match_logger = None
+
+    def sample_sensors(self) -> None:
+        """
+        Read every physical sensor once at the start of the loop, all subsystems and commands
+        see these values until the next loop, then share the power budget out against them
+        """
+        self._sensors.sample()
+        self._power.update()
+
     def update_sensors(self) -> None:
-        SmartDashboard.putNumber("Climber-POT-Value-Degrees", self._climber.potentiometer().get())
-        SmartDashboard.putNumber("Climber-POT-Degrees-Range", self._climber.pot_range())
-        SmartDashboard.putNumber("Climber-POT-Degrees-Offset", self._climber.pot_offset())
+        self._pot_value_entry.set(self._climber.pot_position())
+
+    def publish_telemetry(self) -> None:
+        """
+        Publish the dashboard values staged by the subsystems during this loop
+        """
+        self._telemetry.periodic()
 
     @property
     def drivetrain(self) -> Drivetrain:
@@ -155,6 +372,13 @@ class RobotController:
         """
         return self._drivetrain
 
+    @property
+    def odometry(self) -> Odometry:
+        """
+        Retrieve the "Odometry" subsystem tracking the robot pose on the field
+        """
+        return self._odometry
+
     @property
     def shooter(self) -> Shooter:
         """
@@ -184,16 +408,74 @@ class RobotController:
         return self._climber
 
     @property
-    def subsystems_config(self) -> ConfigParser:
-        return self._subsystems_config
+    def arm(self) -> Optional["Arm"]:
+        """
+        Retrieve the "Arm" subsystem, None unless enabled in the config
+        """
+        return self._arm
+
+    @property
+    def grabber(self) -> Optional["Grabber"]:
+        """
+        Retrieve the "Grabber" subsystem, None unless enabled in the config
+        """
+        return self._grabber
+
+    @property
+    def flipper(self) -> Optional["Flipper"]:
+        """
+        Retrieve the "Flipper" subsystem, None unless enabled in the config
+        """
+        return self._flipper
+
+    @property
+    def vision(self) -> Optional["Vision"]:
+        """
+        Retrieve the "Vision" subsystem reading the camera process' targets, None unless enabled in the config
+        """
+        return self._vision
+
+    @property
+    def trajectories(self) -> "TrajectoryLibrary":
+        """
+        Retrieve the autonomous trajectories generated at boot
+        """
+        return self._trajectories
+
+    @property
+    def match_logger(self) -> Optional[MatchLogger]:
+        """
+        Retrieve the match log recording every loop, None when not recording
+        """
+        return self._match_logger
+
+    @property
+    def telemetry(self) -> Telemetry:
+        return self._telemetry
+
+    @property
+    def sensors(self) -> SensorSnapshot:
+        return self._sensors
+
+    @property
+    def power_budget(self) -> PowerBudget:
+        return self._power
+
+    @property
+    def config(self) -> RobotConfig:
+        return self._config
+
+    @property
+    def subsystems_config(self) -> SubsystemsConfig:
+        return self._config.subsystems
 
     @property
-    def joystick_config(self) -> ConfigParser:
-        return self._joystick_config
+    def joystick_config(self) -> JoystickConfig:
+        return self._config.joysticks
 
     @property
-    def autonomous_config(self) -> ConfigParser:
-        return self._autonomous_config
+    def autonomous_config(self) -> AutonomousConfig:
+        return self._config.autonomous
 
     @property
     def subsystems(self):
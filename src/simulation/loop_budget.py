@@ -0,0 +1,218 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Estimate the robot loop time on the roboRIO from a headless simulated match
+
+The robot runs disabled, then autonomous, then teleop with scripted joysticks on simulated
+time. The wall time of each robot loop on this machine is scaled by how much slower the roboRIO
+runs the same code, and the run fails (exit code 1) when the estimated p99 loop time of any mode
+is over the budget:
+
+    python -m simulation.loop_budget --slowdown 10 --budget 20 --script teleop.csv
+
+A script is a csv of `time,port,input,value` rows: from `time` seconds into teleop the `input`
+(`axis<n>` or `button<n>`) of the controller on `port` is held at `value` until a later row
+changes it.
+"""
+import argparse
+import csv
+import logging
+import sys
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from wpilib.simulation import DriverStationSim
+
+from simulation.runner import HeadlessSim
+from util.loop_profiler import NANOS_PER_MILLI, PhaseTimer
+
+# how many times slower the roboRIO 2 runs the robot code than a desktop CPU, calibrate it by
+# comparing the LoopProfiler dashboard of the real robot with this harness on the same code
+DEFAULT_SLOWDOWN = 10.0
+DEFAULT_BUDGET_MS = 20.0
+# inputs of an Xbox controller on the driver station
+AXES = 6
+BUTTONS = 10
+
+
+@dataclass(frozen=True, slots=True)
+class JoystickEvent:
+    """From `time` seconds into teleop, hold an axis or button of a controller at a value"""
+    time: float
+    port: int
+    input: str
+    value: float
+
+    def __post_init__(self):
+        kind, index = self.kind, self.index
+        if kind not in ("axis", "button") or index < 0 or index >= (AXES if kind == "axis" else BUTTONS + 1):
+            raise ValueError(f"joystick input must be axis0..axis{AXES - 1} or button1..button{BUTTONS}, "
+                             f"got {self.input}")
+
+    @property
+    def kind(self) -> str:
+        return self.input.rstrip("0123456789")
+
+    @property
+    def index(self) -> int:
+        digits = self.input[len(self.kind):]
+        return int(digits) if digits else -1
+
+    @staticmethod
+    def parse(row: dict[str, str]) -> "JoystickEvent":
+        return JoystickEvent(float(row["time"]), int(row["port"]), row["input"].strip(), float(row["value"]))
+
+
+# drive forward, spin in place with turbo, then run the vacuum, shooter and climber
+DEFAULT_SCRIPT = (
+    JoystickEvent(0.0, 0, "axis1", -0.8),
+    JoystickEvent(0.0, 0, "axis5", -0.8),
+    JoystickEvent(2.0, 0, "axis5", 0.8),
+    JoystickEvent(2.0, 0, "button6", 1.0),
+    JoystickEvent(4.0, 0, "axis1", 0.0),
+    JoystickEvent(4.0, 0, "axis5", 0.0),
+    JoystickEvent(4.0, 0, "button6", 0.0),
+    JoystickEvent(4.0, 1, "button5", 1.0),
+    JoystickEvent(5.0, 1, "button5", 0.0),
+    JoystickEvent(5.0, 1, "axis3", 1.0),
+    JoystickEvent(6.0, 1, "axis3", 0.0),
+    JoystickEvent(6.0, 1, "button4", 1.0),
+    JoystickEvent(7.0, 1, "button4", 0.0),
+    JoystickEvent(7.0, 1, "button3", 1.0),
+    JoystickEvent(8.0, 1, "button3", 0.0),
+)
+
+
+class JoystickScript:
+    """Plays joystick events into the simulated driver station as teleop time passes"""
+
+    def __init__(self, events: Iterable[JoystickEvent] = DEFAULT_SCRIPT):
+        self._events = sorted(events, key=lambda event: event.time)
+        self._next = 0
+
+    def connect(self) -> None:
+        """Plug in an Xbox controller on every port the script uses, at rest."""
+        for port in sorted({event.port for event in self._events}):
+            DriverStationSim.setJoystickAxisCount(port, AXES)
+            DriverStationSim.setJoystickButtonCount(port, BUTTONS)
+            for axis in range(AXES):
+                DriverStationSim.setJoystickAxis(port, axis, 0.0)
+            DriverStationSim.setJoystickButtons(port, 0)
+        self._next = 0
+
+    def apply(self, elapsed: float) -> None:
+        """Apply every event due by `elapsed` seconds into teleop, read by the robot on the next loop."""
+        while self._next < len(self._events) and self._events[self._next].time <= elapsed:
+            event = self._events[self._next]
+            if event.kind == "axis":
+                DriverStationSim.setJoystickAxis(event.port, event.index, event.value)
+            else:
+                DriverStationSim.setJoystickButton(event.port, event.index, event.value != 0.0)
+            self._next += 1
+        # hand the new values over like a driver station packet
+        DriverStationSim.notifyNewData()
+
+    @staticmethod
+    def load(path: str) -> "JoystickScript":
+        with open(path, newline="") as script_file:
+            return JoystickScript(JoystickEvent.parse(row) for row in csv.DictReader(script_file))
+
+    @property
+    def events(self) -> list[JoystickEvent]:
+        return self._events
+
+
+@dataclass(slots=True)
+class LoopBudgetResult:
+    """Estimated roboRIO loop times in milliseconds, (p50, p95, p99, max) per mode"""
+    slowdown: float
+    budget: float
+    modes: dict[str, tuple[float, float, float, float]] = field(default_factory=dict)
+    loops: int = 0
+    # loops whose estimated time was over the budget
+    overruns: int = 0
+
+    def over_budget(self) -> list[str]:
+        """Modes whose estimated p99 loop time is over the budget."""
+        return [mode for mode, (_, _, p99, _) in self.modes.items() if p99 > self.budget]
+
+    @property
+    def passed(self) -> bool:
+        return not self.over_budget()
+
+    def report(self) -> str:
+        lines = [f"estimated roboRIO loop time (x{self.slowdown:g} slowdown, {self.budget:g} ms budget)",
+                 f"{'mode':<10}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for mode, summary in self.modes.items():
+            flag = "  OVER BUDGET" if summary[2] > self.budget else ""
+            lines.append(f"{mode:<10}" + "".join(f"{value:>9.2f}" for value in summary) + flag)
+        lines.append(f"{self.overruns} of {self.loops} loops over budget")
+        return "\n".join(lines)
+
+
+def run_match(
+        sim: HeadlessSim,
+        script: JoystickScript,
+        auto: Optional[str] = None,
+        disabled: float = 1.0,
+        autonomous: float = 15.0,
+        teleop: float = 10.0,
+        slowdown: float = DEFAULT_SLOWDOWN,
+        budget: float = DEFAULT_BUDGET_MS,
+) -> LoopBudgetResult:
+    """Run a match through the sim, timing every robot loop, and estimate its roboRIO loop times."""
+    if auto is not None:
+        sim.select_auto(auto)
+    script.connect()
+    period = HeadlessSim.PERIOD
+    phases = (
+        ("disabled", False, False, disabled),
+        ("auto", True, True, autonomous),
+        ("teleop", False, True, teleop),
+    )
+    result = LoopBudgetResult(slowdown, budget)
+    budget_ns = budget * NANOS_PER_MILLI
+    for mode, is_autonomous, enabled, duration in phases:
+        loops = round(duration / period)
+        if loops == 0:
+            continue
+        timer = PhaseTimer(mode, loops)
+        for loop in range(loops):
+            if mode == "teleop":
+                script.apply(loop * period)
+            sim.step(autonomous=is_autonomous, enabled=enabled)
+            estimate = round(sim.loop_ns * slowdown)
+            timer.record(estimate)
+            if estimate > budget_ns:
+                result.overruns += 1
+        result.modes[mode] = timer.summary()
+        result.loops += loops
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate the roboRIO loop time from a headless simulated match")
+    parser.add_argument("--auto", help="autonomous to run, as named on the dashboard chooser")
+    parser.add_argument("--disabled", type=float, default=1.0, help="simulated seconds disabled")
+    parser.add_argument("--autonomous", type=float, default=15.0, help="simulated seconds of autonomous")
+    parser.add_argument("--teleop", type=float, default=10.0, help="simulated seconds of teleop")
+    parser.add_argument("--script", help="csv of teleop joystick events, a built in drive script by default")
+    parser.add_argument("--slowdown", type=float, default=DEFAULT_SLOWDOWN,
+                        help="how many times slower the roboRIO runs the code than this machine")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS, help="p99 loop time budget in ms")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    script = JoystickScript.load(args.script) if args.script else JoystickScript()
+    with HeadlessSim() as sim:
+        result = run_match(sim, script, args.auto, args.disabled, args.autonomous, args.teleop,
+                           args.slowdown, args.budget)
+    print(result.report())
+    if not result.passed:
+        print(f"p99 loop time over {args.budget:g} ms in {', '.join(result.over_budget())}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from wpimath.system.plant import DCMotor
+
+
+@dataclass(frozen=True, slots=True)
+class Mechanism:
+    """
+    A group of identical DC motors driving one inertia through a gearbox
+
+    Velocities and positions are of the gearbox output shaft, in radians (per second).
+    """
+    name: str
+    motor: DCMotor
+    motor_count: int
+    # motor turns per output turn
+    gearing: float
+    # kg m^2 at the output shaft
+    inertia: float
+    # viscous friction at the output shaft, N m s / rad
+    damping: float = 0.0
+
+
+class RobotPlant:
+    """
+    Motor, gearbox and battery model of every mechanism of one or more robots
+
+    The state of all robots is held in NumPy arrays of shape (robots, mechanisms), so stepping any
+    number of robots is a single vectorized update. Within a step the applied voltage is held
+    constant and each mechanism's first order motor dynamics are integrated exactly, which stays
+    stable for light mechanisms (a vacuum impeller) at the 20 ms robot period. The battery sags by
+    its internal resistance times the total current drawn in the previous step. A motor controller
+    only draws its output fraction of the motor current from the battery, and braking a coasting
+    motor draws nothing.
+    """
+
+    NOMINAL_BATTERY_VOLTAGE = 12.5
+    # ohms, a healthy competition battery including wiring
+    BATTERY_RESISTANCE = 0.02
+
+    def __init__(
+            self,
+            mechanisms: Sequence[Mechanism],
+            robots: int = 1,
+            battery_voltage: float = NOMINAL_BATTERY_VOLTAGE,
+            battery_resistance: float = BATTERY_RESISTANCE,
+    ):
+        self._mechanisms = tuple(mechanisms)
+        self._names = {mechanism.name: i for i, mechanism in enumerate(self._mechanisms)}
+        self._nominal_voltage = battery_voltage
+        self._battery_resistance = battery_resistance
+
+        motor_count = np.array([m.motor_count for m in self._mechanisms], dtype=float)
+        resistance = np.array([m.motor.R for m in self._mechanisms])
+        self._kv = np.array([m.motor.Kv for m in self._mechanisms])
+        self._gearing = np.array([m.gearing for m in self._mechanisms])
+        self._resistance = resistance
+        self._motor_count = motor_count
+        inertia = np.array([m.inertia for m in self._mechanisms])
+        kt = np.array([m.motor.Kt for m in self._mechanisms])
+        damping = np.array([m.damping for m in self._mechanisms])
+        # d(velocity)/dt = drive * voltage - decay * velocity
+        self._drive = motor_count * self._gearing * kt / (resistance * inertia)
+        self._decay = (motor_count * self._gearing ** 2 * kt / (resistance * self._kv) + damping) / inertia
+
+        shape = (robots, len(self._mechanisms))
+        self._velocity = np.zeros(shape)
+        self._position = np.zeros(shape)
+        self._current = np.zeros(shape)
+        self._battery_voltage = np.full(robots, battery_voltage)
+        self._dt = 0.0
+        self._step_decay = np.ones(len(self._mechanisms))
+        self._step_travel = np.zeros(len(self._mechanisms))
+
+    def index(self, name: str) -> int:
+        """The column of a mechanism in the state arrays."""
+        return self._names[name]
+
+    def step(self, duty: np.ndarray, dt: float) -> None:
+        """
+        Advance every robot by dt seconds with the given motor controller outputs
+
+        :param duty: outputs in [-1, 1] of shape (robots, mechanisms)
+        """
+        if dt != self._dt:
+            # the decay over a step only depends on the step length, which is almost always the period
+            self._dt = dt
+            self._step_decay = np.exp(-self._decay * dt)
+            self._step_travel = (1.0 - self._step_decay) / self._decay
+        duty = np.minimum(np.maximum(duty, -1.0), 1.0)
+        voltage = duty * self._battery_voltage[:, None]
+        steady_state = self._drive * voltage / self._decay
+        offset = self._velocity - steady_state
+        self._position += steady_state * dt + offset * self._step_travel
+        self._velocity = steady_state + offset * self._step_decay
+
+        back_emf = self._gearing * self._velocity / self._kv
+        self._current = self._motor_count * (voltage - back_emf) / self._resistance
+        total_current = np.maximum(duty * self._current, 0.0).sum(axis=1)
+        self._battery_voltage = np.maximum(self._nominal_voltage - self._battery_resistance * total_current, 0.0)
+
+    def reset(self) -> None:
+        self._velocity[:] = 0.0
+        self._position[:] = 0.0
+        self._current[:] = 0.0
+        self._battery_voltage[:] = self._nominal_voltage
+
+    @property
+    def mechanisms(self) -> tuple[Mechanism, ...]:
+        return self._mechanisms
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """Output shaft velocity in rad/s, shape (robots, mechanisms)."""
+        return self._velocity
+
+    @property
+    def position(self) -> np.ndarray:
+        """Output shaft position in radians, shape (robots, mechanisms)."""
+        return self._position
+
+    @property
+    def current(self) -> np.ndarray:
+        """Current drawn by all motors of each mechanism in amps, shape (robots, mechanisms)."""
+        return self._current
+
+    @property
+    def battery_voltage(self) -> np.ndarray:
+        """Battery voltage of each robot, shape (robots,)."""
+        return self._battery_voltage
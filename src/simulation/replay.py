@@ -0,0 +1,167 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Replay a recorded match log through the robot code in the headless simulator
+
+Every loop is rerun with the recorded driver station inputs, autonomous selection and sensor
+values on the recorded loop timing, and the motor outputs the robot code computes are compared
+with the recorded ones. The first loop where they diverge points at code (or config) that
+behaves differently from the robot that recorded the log:
+
+    python -m simulation.replay /u/logs/match_20240316_101500.r94log
+"""
+import argparse
+import logging
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import wpilib
+from wpilib.simulation import DriverStationSim
+
+from robot_controller import RobotController
+from simulation.runner import HeadlessSim, SimResult
+from util.match_log import MatchLog
+
+# outputs are recorded as 32 bit floats
+_FLOAT32 = struct.Struct("<f")
+
+
+@dataclass(frozen=True, slots=True)
+class Divergence:
+    """The first recorded output the replay did not reproduce"""
+    loop: int
+    time: float
+    output: str
+    recorded: float
+    replayed: float
+
+
+@dataclass(slots=True)
+class ReplayResult:
+    result: SimResult
+    loops: int
+    divergence: Optional[Divergence] = None
+    max_error: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def deterministic(self) -> bool:
+        return self.divergence is None
+
+
+class _Record:
+    """The sensor source of the replayed robot, reading from the current log record"""
+
+    __slots__ = ("values", "_columns")
+
+    def __init__(self, log: MatchLog):
+        self.values: tuple = ()
+        self._columns = {name[len("sensor/"):]: i for i, name in enumerate(log.fields) if name.startswith("sensor/")}
+
+    def sensor(self, name: str):
+        column = self._columns.get(name)
+        return None if column is None else self.values[column]
+
+
+def _float32(value: float) -> float:
+    return _FLOAT32.unpack(_FLOAT32.pack(value))[0]
+
+
+def replay(log: MatchLog, sim: HeadlessSim, tolerance: float = 1e-4, period: float = HeadlessSim.PERIOD) -> ReplayResult:
+    """Replay every record of the log on the sim, which must have just been created."""
+    controller = sim.robot.controller
+    ports = log.metadata.get("ports", [])
+    autos = log.metadata.get("autos", [])
+    axes = {port: [log.index(f"joystick{port}/axis{axis}") for axis in range(RobotController.LOGGED_AXES)]
+            for port in ports}
+    buttons = {port: log.index(f"joystick{port}/buttons") for port in ports}
+    povs = {port: log.index(f"joystick{port}/pov") for port in ports}
+    for port in ports:
+        DriverStationSim.setJoystickAxisCount(port, RobotController.LOGGED_AXES)
+        DriverStationSim.setJoystickButtonCount(port, 32)
+        DriverStationSim.setJoystickPOVCount(port, 1)
+    timestamp = log.index("timestamp")
+    mode = log.index("mode")
+    auto = log.index("auto")
+    outputs = [(log_field.name, log.index(log_field.name), log_field.getter)
+               for log_field in controller.match_log_fields()
+               if log_field.name.startswith("output/") and log_field.name in log.fields]
+
+    record = _Record(log)
+    controller.sensors.set_source(record.sensor)
+    start = time.perf_counter()
+    start_time = wpilib.Timer.getFPGATimestamp()
+    selected_auto = -1
+    trace = []
+    divergence = None
+    max_error = {name: 0.0 for name, _, _ in outputs}
+    for i, values in enumerate(log):
+        record.values = values
+        for port in ports:
+            for axis, column in enumerate(axes[port]):
+                DriverStationSim.setJoystickAxis(port, axis, values[column])
+            DriverStationSim.setJoystickButtons(port, values[buttons[port]])
+            DriverStationSim.setJoystickPOV(port, 0, values[povs[port]])
+        DriverStationSim.notifyNewData()
+        if values[auto] != selected_auto and 0 <= values[auto] < len(autos):
+            selected_auto = values[auto]
+            sim.select_auto(autos[selected_auto])
+
+        # the loop runs for as long as the robot waited for the next one
+        dt = (log[i + 1][timestamp] - values[timestamp]) / 1e9 if i + 1 < len(log) else period
+        trace.append(sim.step(
+            autonomous=bool(values[mode] & RobotController.MODE_AUTONOMOUS),
+            enabled=bool(values[mode] & RobotController.MODE_ENABLED),
+            dt=max(dt, 1e-6),
+            test=bool(values[mode] & RobotController.MODE_TEST),
+        ))
+
+        for name, column, getter in outputs:
+            replayed = _float32(getter())
+            error = abs(replayed - values[column])
+            max_error[name] = max(max_error[name], error)
+            if divergence is None and error > tolerance:
+                divergence = Divergence(i, (values[timestamp] - log[0][timestamp]) / 1e9, name,
+                                        values[column], replayed)
+    controller.sensors.set_source(None)
+
+    result = SimResult(
+        auto=autos[selected_auto] if 0 <= selected_auto < len(autos) else "",
+        final_pose=sim.pose,
+        sim_seconds=wpilib.Timer.getFPGATimestamp() - start_time,
+        wall_seconds=time.perf_counter() - start,
+        trace=trace,
+    )
+    return ReplayResult(result, len(log), divergence, max_error)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a match log through the robot code in the simulator")
+    parser.add_argument("log", help="match log recorded by the robot")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="largest output difference still a match")
+    parser.add_argument("--trace", help="write the per tick trace of the simulated robot to this csv file")
+    parser.add_argument("--verbose", action="store_true", help="keep the robot's info logging")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    log = MatchLog.read(args.log)
+    with HeadlessSim() as sim:
+        replayed = replay(log, sim, args.tolerance)
+    if args.trace:
+        replayed.result.write_trace(args.trace)
+    print(f"Replayed {replayed.loops} loops in {replayed.result.wall_seconds:.2f}s")
+    for name, error in replayed.max_error.items():
+        print(f"  {name}: max difference {error:.6f}")
+    divergence = replayed.divergence
+    if divergence is None:
+        print("Every output matched the recording")
+    else:
+        print(f"First divergence at loop {divergence.loop} ({divergence.time:.3f}s): {divergence.output} "
+              f"recorded {divergence.recorded:.4f}, replayed {divergence.replayed:.4f}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
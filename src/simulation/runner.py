@@ -0,0 +1,270 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Headless simulation of the robot, stepped as fast as the CPU allows
+
+Runs a chosen autonomous from the dashboard chooser against the physics engine without the sim
+GUI or a real time loop, and reports the final pose and a per tick trace:
+
+    python -m simulation.runner --auto DELAYED_Mobility --trace trace.csv
+"""
+import argparse
+import csv
+import gc
+import logging
+import time
+from dataclasses import astuple, dataclass, field, fields
+from typing import Optional, Type
+
+import hal
+import hal.simulation
+import ntcore
+import wpilib
+import wpilib.shuffleboard
+import wpiutil
+from commands2 import CommandScheduler
+from pyfrc.physics.core import PhysicsInterface
+from wpilib import SmartDashboard
+from wpilib.simulation import DriverStationSim, pauseTiming, restartTiming, stepTimingAsync
+from wpimath.geometry import Pose2d
+
+import physics
+from robot import RetrojaysRobot
+from util.stopwatch import fpga_clock, timer_service
+
+
+@dataclass(frozen=True, slots=True)
+class TraceSample:
+    """The state of the simulated robot at the end of one robot loop"""
+    time: float
+    mode: str
+    x: float
+    y: float
+    heading: float
+    left: float
+    right: float
+    battery: float
+
+
+@dataclass(slots=True)
+class SimResult:
+    auto: str
+    final_pose: Pose2d
+    sim_seconds: float
+    wall_seconds: float
+    trace: list[TraceSample] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per wall clock second."""
+        return self.sim_seconds / self.wall_seconds if self.wall_seconds > 0.0 else float("inf")
+
+    def write_trace(self, path: str) -> None:
+        with open(path, "w", newline="") as trace_file:
+            writer = csv.writer(trace_file)
+            writer.writerow([f.name for f in fields(TraceSample)])
+            writer.writerows(astuple(sample) for sample in self.trace)
+
+
+class HeadlessSim:
+    """
+    A robot and its physics engine, stepped one robot loop at a time on simulated time
+
+    Simulated time is paused and only advanced by `step`, so a 15 second autonomous runs in as
+    long as the code takes to execute its 750 loops. The shared timer service follows simulated
+    time while the sim is open. The robot and the HAL are torn down on `close`, so several sims
+    can run one after another in the same process.
+    """
+
+    PERIOD = 0.02
+
+    def __init__(
+            self,
+            subsystems_config: Optional[str] = None,
+            joystick_config: Optional[str] = None,
+            autonomous_config: Optional[str] = None,
+            robot_class: Type[RetrojaysRobot] = RetrojaysRobot,
+            physics_module=physics,
+            period: float = PERIOD,
+    ):
+        self._period = period
+        self._loop_ns = 0
+        self._mode: Optional[tuple[bool, bool, bool]] = None
+        self._nt = ntcore.NetworkTableInstance.getDefault()
+        self._nt.startLocal()
+        pauseTiming()
+        restartTiming()
+        self._previous_clock = timer_service.use_clock(fpga_clock)
+        wpilib.DriverStation.silenceJoystickConnectionWarning(True)
+        DriverStationSim.setDsAttached(True)
+        self._set_mode(autonomous=False, enabled=False)
+        DriverStationSim.notifyNewData()
+
+        self._robot = self._create_robot(robot_class, subsystems_config, joystick_config, autonomous_config)
+        self._robot.robotInit()
+        self._physics = PhysicsInterface(physics_module)
+        self._physics._simulationInit(self._robot)
+
+    @staticmethod
+    def _create_robot(
+            robot_class: Type[RetrojaysRobot],
+            subsystems_config: Optional[str],
+            joystick_config: Optional[str],
+            autonomous_config: Optional[str],
+    ) -> RetrojaysRobot:
+        overrides = {}
+        if subsystems_config is not None:
+            overrides["SIM_SUBSYSTEMS_CONFIG_PATH"] = subsystems_config
+        if joystick_config is not None:
+            overrides["SIM_JOYSTICK_CONFIG_PATH"] = joystick_config
+        if autonomous_config is not None:
+            overrides["SIM_AUTONOMOUS_CONFIG_PATH"] = autonomous_config
+        if overrides:
+            robot_class = type(robot_class.__name__, (robot_class,), overrides)
+        return robot_class()
+
+    def _set_mode(self, autonomous: bool, enabled: bool, test: bool = False) -> None:
+        """Change the driver station mode, only when it differs from the mode of the last step."""
+        mode = (autonomous, enabled, test)
+        if mode == self._mode:
+            return
+        self._mode = mode
+        DriverStationSim.setAutonomous(autonomous)
+        DriverStationSim.setTest(test)
+        DriverStationSim.setEnabled(enabled)
+
+    def auto_options(self) -> list[str]:
+        return list(self._chooser_table().getStringArray("options", []))
+
+    def select_auto(self, name: str) -> None:
+        """Select an autonomous on the dashboard chooser, exactly as a driver would."""
+        options = self.auto_options()
+        if name not in options:
+            raise ValueError(f"Unknown autonomous {name}, expected one of {', '.join(options)}")
+        self._chooser_table().putString("selected", name)
+        SmartDashboard.updateValues()
+
+    def _chooser_table(self) -> ntcore.NetworkTable:
+        chooser = self._robot.controller.get_auto_chooser()
+        return self._nt.getTable("SmartDashboard").getSubTable(wpiutil.SendableRegistry.getName(chooser))
+
+    def step(self, autonomous: bool, enabled: bool, dt: Optional[float] = None, test: bool = False) -> TraceSample:
+        """
+        Run one robot loop and advance the physics and simulated time by dt, one period unless
+        given (a replayed log steps by the recorded loop times)
+
+        Joystick values set since the last step are handed to the robot with the mode, exactly
+        as a new driver station packet would.
+        """
+        dt = self._period if dt is None else dt
+        self._set_mode(autonomous, enabled, test)
+        DriverStationSim.notifyNewData()
+        start = time.perf_counter_ns()
+        self._robot._loopFunc()
+        self._loop_ns = time.perf_counter_ns() - start
+        self._physics.engine.update_sim(wpilib.Timer.getFPGATimestamp(), dt)
+        stepTimingAsync(dt)
+        return self._sample("auto" if autonomous else "test" if test else "teleop" if enabled else "disabled")
+
+    def _sample(self, mode: str) -> TraceSample:
+        pose = self.pose
+        engine = self._physics.engine
+        return TraceSample(
+            time=wpilib.Timer.getFPGATimestamp(),
+            mode=mode,
+            x=pose.X(),
+            y=pose.Y(),
+            heading=pose.rotation().degrees(),
+            left=engine.left_output,
+            right=engine.right_output,
+            battery=engine.battery_voltage,
+        )
+
+    def run_auto(self, name: str, duration: float = 15.0, disabled: float = 0.1) -> SimResult:
+        """
+        Run a named autonomous for the given simulated seconds, after a short disabled period
+        so the robot settles exactly as it does before a match
+        """
+        self.select_auto(name)
+        start = time.perf_counter()
+        start_time = wpilib.Timer.getFPGATimestamp()
+        trace = [self.step(autonomous=False, enabled=False) for _ in range(round(disabled / self._period))]
+        trace.extend(self.step(autonomous=True, enabled=True) for _ in range(round(duration / self._period)))
+        return SimResult(
+            auto=name,
+            final_pose=self.pose,
+            sim_seconds=wpilib.Timer.getFPGATimestamp() - start_time,
+            wall_seconds=time.perf_counter() - start,
+            trace=trace,
+        )
+
+    @property
+    def pose(self) -> Pose2d:
+        """The simulated (true) pose of the robot on the field."""
+        return self._physics.get_pose()
+
+    @property
+    def robot(self) -> RetrojaysRobot:
+        return self._robot
+
+    @property
+    def loop_ns(self) -> int:
+        """Wall clock nanoseconds the robot loop of the last step took, without the physics."""
+        return self._loop_ns
+
+    def close(self) -> None:
+        """Tear down the robot and reset the HAL, mirroring the pyfrc test fixture."""
+        if self._robot is None:
+            return
+        self._robot.controller.close_match_log()
+        # the physics field is a dashboard value too, it must not outlive this sim's networktables
+        self._physics = None
+        wpilib.simulation._simulation._resetMotorSafety()
+        self._robot = None
+        CommandScheduler.resetInstance()
+        # the subsystems and commands are only released once the scheduler and then the dashboard
+        # (holding the auto chooser) let go of them, and must be before the HAL handles are reset
+        gc.collect()
+        wpilib._wpilib._clearSmartDashboardData()
+        wpilib.shuffleboard._shuffleboard._clearShuffleboardData()
+        gc.collect()
+        self._nt.stopLocal()
+        self._nt._reset()
+        wpilib.simulation._simulation._resetWpilibSimulationData()
+        hal.simulation.cancelAllSimPeriodicCallbacks()
+        hal.simulation.resetGlobalHandles()
+        hal.simulation.resetAllSimData()
+        timer_service.use_clock(self._previous_clock)
+
+    def __enter__(self) -> "HeadlessSim":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run an autonomous headless on simulated time")
+    parser.add_argument("--auto", help="autonomous to run, as named on the dashboard chooser")
+    parser.add_argument("--duration", type=float, default=15.0, help="simulated seconds of autonomous")
+    parser.add_argument("--trace", help="write the per tick trace to this csv file")
+    parser.add_argument("--list", action="store_true", help="list the autonomous options and exit")
+    parser.add_argument("--verbose", action="store_true", help="keep the robot's info logging")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    with HeadlessSim() as sim:
+        if args.list or args.auto is None:
+            print("\n".join(sim.auto_options()))
+            return
+        result = sim.run_auto(args.auto, args.duration)
+    if args.trace:
+        result.write_trace(args.trace)
+    pose = result.final_pose
+    print(f"{result.auto}: x={pose.X():.3f} m y={pose.Y():.3f} m heading={pose.rotation().degrees():.1f} deg")
+    print(f"{result.sim_seconds:.2f}s simulated in {result.wall_seconds:.2f}s ({result.speedup:.0f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Sweep the timing and speed of a dead reckoning autonomous in the headless simulator
+
+Every combination of the given DRIVE_SPEED / DRIVE_TIME / WAIT_TIME values is run as its own
+autonomous in a worker process, scored by how far the final pose is from the target pose and
+written out as a table ranked best first:
+
+    python -m simulation.sweep --auto DELAYED_Mobility --section DelayedMoveFromLine \
+        --drive-speed=-1:-0.5:0.1 --drive-time 0.5:2:0.25 --wait-time 9 --target=-3.0,0,0
+"""
+import argparse
+import configparser
+import csv
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+from robot import RetrojaysRobot
+
+SWEPT_KEYS = ("DRIVE_SPEED", "DRIVE_TIME", "WAIT_TIME")
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    """The pose the autonomous should end at, heading errors in degrees are weighted into meters"""
+    x: float
+    y: float
+    heading: float = 0.0
+    # meters of score per degree of heading error
+    heading_weight: float = 0.01
+
+    def score(self, x: float, y: float, heading: float) -> float:
+        heading_error = abs((heading - self.heading + 180.0) % 360.0 - 180.0)
+        return math.hypot(x - self.x, y - self.y) + self.heading_weight * heading_error
+
+    @staticmethod
+    def parse(text: str) -> "Target":
+        values = [float(value) for value in text.split(",")]
+        if len(values) not in (2, 3):
+            raise argparse.ArgumentTypeError(f"target must be x,y or x,y,heading, got {text}")
+        return Target(*values)
+
+
+@dataclass(frozen=True, slots=True)
+class Candidate:
+    """One combination of autonomous values, run as one headless autonomous"""
+    auto: str
+    section: str
+    values: tuple[tuple[str, float], ...]
+    base_config: str
+    duration: float
+
+
+@dataclass(frozen=True, slots=True)
+class CandidateResult:
+    values: tuple[tuple[str, float], ...]
+    x: float
+    y: float
+    heading: float
+    score: float = 0.0
+
+
+def parse_range(text: str) -> list[float]:
+    """
+    Parse the values swept for one key: `start:stop:step` (stop inclusive), a comma separated list
+    or a single value
+    """
+    if ":" in text:
+        start, stop, step = (float(value) for value in text.split(":"))
+        if step == 0.0 or (stop - start) / step < 0.0:
+            raise argparse.ArgumentTypeError(f"range {text} never reaches its stop")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 9) for i in range(count)]
+    return [float(value) for value in text.split(",")]
+
+
+def candidates(
+        auto: str,
+        section: str,
+        ranges: dict[str, Sequence[float]],
+        base_config: str,
+        duration: float,
+) -> list[Candidate]:
+    keys = list(ranges)
+    return [
+        Candidate(auto, section, tuple(zip(keys, combination)), base_config, duration)
+        for combination in itertools.product(*(ranges[key] for key in keys))
+    ]
+
+
+def _write_config(candidate: Candidate, directory: str) -> str:
+    parser = configparser.ConfigParser()
+    parser.optionxform = str
+    parser.read(candidate.base_config)
+    if not parser.has_section(candidate.section):
+        parser.add_section(candidate.section)
+    for key, value in candidate.values:
+        parser.set(candidate.section, key, repr(value))
+    path = os.path.join(directory, "autonomous.ini")
+    with open(path, "w") as config_file:
+        parser.write(config_file)
+    return path
+
+
+def _init_worker() -> None:
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def run_candidate(candidate: Candidate) -> CandidateResult:
+    """
+    Run one candidate in a fresh headless sim, each worker process has its own HAL so candidates
+    never share simulated hardware
+    """
+    from simulation.runner import HeadlessSim
+
+    with tempfile.TemporaryDirectory() as directory:
+        autonomous_config = _write_config(candidate, directory)
+        with HeadlessSim(autonomous_config=autonomous_config) as sim:
+            pose = sim.run_auto(candidate.auto, candidate.duration).final_pose
+    return CandidateResult(candidate.values, pose.X(), pose.Y(), pose.rotation().degrees())
+
+
+def sweep(
+        all_candidates: Sequence[Candidate],
+        target: Target,
+        workers: Optional[int] = None,
+) -> list[CandidateResult]:
+    """
+    Run every candidate across a pool of worker processes and return the results ranked best first
+
+    Workers are spawned rather than forked so each starts with a clean HAL, and every candidate is
+    independent, so the sweep scales with the number of cores.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as executor:
+        results = list(executor.map(run_candidate, all_candidates))
+    scored = [
+        CandidateResult(result.values, result.x, result.y, result.heading,
+                        target.score(result.x, result.y, result.heading))
+        for result in results
+    ]
+    return sorted(scored, key=lambda result: result.score)
+
+
+def write_table(results: Iterable[CandidateResult], path: str) -> None:
+    results = list(results)
+    keys = [key for key, _ in results[0].values] if results else list(SWEPT_KEYS)
+    with open(path, "w", newline="") as table_file:
+        writer = csv.writer(table_file)
+        writer.writerow(["rank", *keys, "x", "y", "heading", "score"])
+        for rank, result in enumerate(results, start=1):
+            writer.writerow([rank, *(value for _, value in result.values),
+                             f"{result.x:.3f}", f"{result.y:.3f}", f"{result.heading:.1f}", f"{result.score:.4f}"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep autonomous.ini values in the headless simulator")
+    parser.add_argument("--auto", required=True, help="autonomous to run, as named on the dashboard chooser")
+    parser.add_argument("--section", required=True, help="autonomous.ini section the swept values are set in")
+    parser.add_argument("--drive-speed", type=parse_range, help="DRIVE_SPEED values, start:stop:step or a,b,c")
+    parser.add_argument("--drive-time", type=parse_range, help="DRIVE_TIME values, start:stop:step or a,b,c")
+    parser.add_argument("--wait-time", type=parse_range, help="WAIT_TIME values, start:stop:step or a,b,c")
+    parser.add_argument("--target", type=Target.parse, required=True, help="target end pose x,y[,heading]")
+    parser.add_argument("--duration", type=float, default=15.0, help="simulated seconds of autonomous")
+    parser.add_argument("--config", default=RetrojaysRobot.SIM_AUTONOMOUS_CONFIG_PATH, help="base autonomous.ini")
+    parser.add_argument("--workers", type=int, help="worker processes, defaults to the number of cores")
+    parser.add_argument("--output", default="sweep.csv", help="ranked table to write")
+    parser.add_argument("--top", type=int, default=10, help="rows of the ranked table to print")
+    args = parser.parse_args()
+
+    ranges = {key: values for key, values in zip(SWEPT_KEYS, (args.drive_speed, args.drive_time, args.wait_time))
+              if values is not None}
+    if not ranges:
+        parser.error("give at least one of --drive-speed, --drive-time or --wait-time")
+    all_candidates = candidates(args.auto, args.section, ranges, os.path.abspath(args.config), args.duration)
+
+    start = time.perf_counter()
+    results = sweep(all_candidates, args.target, args.workers)
+    elapsed = time.perf_counter() - start
+    write_table(results, args.output)
+
+    print(f"{len(results)} candidates in {elapsed:.1f}s, ranked table written to {args.output}")
+    for rank, result in enumerate(results[:args.top], start=1):
+        values = " ".join(f"{key}={value:g}" for key, value in result.values)
+        print(f"{rank:3d}. {values}  x={result.x:.3f} y={result.y:.3f} heading={result.heading:.1f}"
+              f"  score={result.score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 # Copyright (c) Southfield High School Team 94
 # Open Source Software; you can modify and / or share it under the terms of
 # the MIT license file in the root directory of this project
+import logging
 from configparser import ConfigParser
-from typing import Optional
+from typing import Optional, Union
 
 from commands2 import Subsystem
-from wpilib import PWMVictorSPX, SmartDashboard, AnalogPotentiometer, DigitalInput
+from wpilib import PWMVictorSPX, DigitalInput
 from wpimath.filter import SlewRateLimiter
 
+from robot_config import ArmConfig, LimitSwitchConfig
+from util.analog_filter import FilteredPotentiometer
+from util.sensor_snapshot import SensorSnapshot
+from util.telemetry import Telemetry
+
 ARM_DASHBOARD_ADJUSTED_SPEED = "0_Arm-02-Adjusted-Speed"
 ARM_DASHBOARD_LOWER_LIMIT = "0_Arm-06-Lower-Limit-Switch"
 ARM_DASHBOARD_POT_READING = "0_Arm-03-Potentiometer"
@@ -35,65 +41,76 @@ class Arm(Subsystem):
 
     def __init__(
             self,
-            config: ConfigParser
+            config: Union[ArmConfig, ConfigParser],
+            telemetry: Optional[Telemetry] = None,
+            sensors: Optional[SensorSnapshot] = None,
     ) -> None:
+        if isinstance(config, ConfigParser):
+            config = ArmConfig.from_parser(config)
         self._config = config
-        self._enabled = self._config.getboolean(
-            Arm.GENERAL_SECTION, Arm.ENABLED_KEY
-        )
+        self._telemetry = telemetry if telemetry is not None else Telemetry()
+        self._sensors = sensors if sensors is not None else SensorSnapshot()
+        self._enabled = self._config.enabled
         self._init_components()
-        print("***Arm initialized***")
+        logging.info("Arm initialized")
         super().__init__()
 
     def _init_components(self) -> None:
-        self._max_stable_speed = self._config.getfloat(Arm.GENERAL_SECTION, Arm.MAX_STABLE_SPEED_KEY)
+        self._max_stable_speed = self._config.max_stable_speed
         # We have to be able to limit the max speed as some percentage of the max stable speed
-        self._max_speed = self._config.getfloat(Arm.GENERAL_SECTION, Arm.MAX_SPEED_KEY)
+        self._max_speed = self._config.max_speed
 
         # initialize potentiometer for reading rotations on arm motor
-        self._arm_pot_range = self._config.getfloat(Arm.POTENTIOMETER_SECTION, Arm.POT_RANGE_KEY)
-        arm_pot_channel = self._config.getint(Arm.POTENTIOMETER_SECTION, Arm.CHANNEL_KEY)
-        self._arm_pot = AnalogPotentiometer(arm_pot_channel, self._arm_pot_range)
+        self._arm_pot_range = self._config.pot_full_range
+        self._arm_pot_filter = FilteredPotentiometer(
+            self._config.pot_channel, self._arm_pot_range, 0.0, self._config.pot_sampling)
+        self._arm_pot = self._arm_pot_filter.potentiometer
+        self._arm_pot_reading = self._arm_pot_filter.add_to(self._sensors, "Arm Potentiometer")
 
         if self._enabled:
-            print("*** Arm enabled ****")
-            self._motor = PWMVictorSPX(
-                self._config.getint(Arm.GENERAL_SECTION, Arm.CHANNEL_KEY)
-            )
-            self._motor.setInverted(
-                self._config.getboolean(Arm.GENERAL_SECTION, Arm.INVERTED_KEY)
-            )
-            print("*** Arm PWM Configured ****")
+            logging.info("Arm enabled")
+            self._motor = PWMVictorSPX(self._config.channel)
+            self._motor.setInverted(self._config.inverted)
+            logging.info("Arm PWM configured")
         else:
             self._motor = None
 
         self._modifier_scaling: Optional[float] = None
 
-        self._lower_limit_switch = self._init_limit_switch(Arm.LOWER_LIMIT_SWITCH_SECTION)
-        self._lower_limit_switch_inverted = self._config.getboolean(
-            Arm.LOWER_LIMIT_SWITCH_SECTION, Arm.INVERTED_KEY
-        )
+        self._lower_limit_switch = self._init_limit_switch(self._config.lower_limit)
+        self._lower_limit_switch_inverted = self._config.lower_limit.inverted
 
-        self._upper_limit_switch = self._init_limit_switch(Arm.UPPER_LIMIT_SWITCH_SECTION)
-        self._upper_limit_switch_inverted = self._config.getboolean(
-            Arm.UPPER_LIMIT_SWITCH_SECTION, Arm.INVERTED_KEY
-        )
+        self._upper_limit_switch = self._init_limit_switch(self._config.upper_limit)
+        self._upper_limit_switch_inverted = self._config.upper_limit.inverted
 
-        self._slew_rate_of_change = self._config.getfloat(
-            Arm.GENERAL_SECTION, Arm.SLEW_RATE
+        self._lower_limit_reading = self._sensors.add(
+            "Arm Lower Limit Switch", lambda: Arm._limit_value(self._lower_limit_switch)
+        )
+        self._upper_limit_reading = self._sensors.add(
+            "Arm Upper Limit Switch", lambda: Arm._limit_value(self._upper_limit_switch)
         )
+
+        self._slew_rate_of_change = self._config.slew_rate
         self._slew_rate = SlewRateLimiter(self._slew_rate_of_change)
 
-        Arm._update_smartdashboard(0.0, 0.0, self._arm_pot.get())
+        self._init_telemetry()
+        self._update_smartdashboard(0.0, 0.0, self._arm_pot_reading.get())
         self._smartdashboard_display_components()
 
-    def _init_limit_switch(self, config_section: str) -> DigitalInput:
+    def _init_telemetry(self) -> None:
+        self._speed_entry = self._telemetry.add_number(ARM_DASHBOARD_SPEED, epsilon=0.001)
+        self._adjusted_speed_entry = self._telemetry.add_number(ARM_DASHBOARD_ADJUSTED_SPEED, epsilon=0.001)
+        self._pot_reading_entry = self._telemetry.add_number(ARM_DASHBOARD_POT_READING, epsilon=0.5)
+        self._slew_rate_entry = self._telemetry.add_number(ARM_DASHBOARD_SLEW_RATE)
+        self._upper_limit_entry = self._telemetry.add_boolean(ARM_DASHBOARD_UPPER_LIMIT)
+        self._lower_limit_entry = self._telemetry.add_boolean(ARM_DASHBOARD_LOWER_LIMIT)
+
+    @staticmethod
+    def _init_limit_switch(limit_config: LimitSwitchConfig) -> DigitalInput:
         """
-        Initialize a limit switch based on a subsystems configuration section
+        Initialize a limit switch based on its subsystems configuration section
         """
-        channel = self._config.getint(config_section, Arm.CHANNEL_KEY)
-        limit_switch = DigitalInput(channel)
-        return limit_switch
+        return DigitalInput(limit_config.channel)
 
     def move(self, speed: float) -> None:
         """
@@ -113,7 +130,7 @@ class Arm(Subsystem):
             self._motor.set(adjusted_speed)
             # uncomment to introduce to slew rate filter
             # self._motor.set(self._slew_rate.calculate(adjusted_speed))
-        Arm._update_smartdashboard(speed, adjusted_speed, self._arm_pot.get())
+        self._update_smartdashboard(speed, adjusted_speed, self._arm_pot_reading.get())
 
     # def move_angular(self, angle: float, speed: float) -> None:
     #     if not self._enabled:
@@ -127,19 +144,13 @@ class Arm(Subsystem):
         """
         Check upper limit switch to determine if the Arm has raised to its upper constraint
         """
-        extended = self._limit_value(
-            self._upper_limit_switch) if not self._upper_limit_switch_inverted else not self._limit_value(
-            self._upper_limit_switch)
-        return extended
+        return self._upper_limit_reading.get() != self._upper_limit_switch_inverted
 
     def is_fully_retracted(self) -> bool:
         """
         Check lower limit switch to determine if the Arm has lowered to its lower constraint
         """
-        retracted = self._limit_value(
-            self._lower_limit_switch) if not self._lower_limit_switch_inverted else not self._limit_value(
-            self._lower_limit_switch)
-        return retracted
+        return self._lower_limit_reading.get() != self._lower_limit_switch_inverted
 
     @staticmethod
     def _limit_value(switch: DigitalInput) -> bool:
@@ -148,16 +159,15 @@ class Arm(Subsystem):
         else:
             return False
 
-    @staticmethod
-    def _update_smartdashboard(speed: float, adjusted_speed: float, pot_reading: float) -> None:
-        SmartDashboard.putNumber(ARM_DASHBOARD_SPEED, speed)
-        SmartDashboard.putNumber(ARM_DASHBOARD_ADJUSTED_SPEED, adjusted_speed)
-        SmartDashboard.putNumber(ARM_DASHBOARD_POT_READING, pot_reading)
+    def _update_smartdashboard(self, speed: float, adjusted_speed: float, pot_reading: float) -> None:
+        self._speed_entry.set(speed)
+        self._adjusted_speed_entry.set(adjusted_speed)
+        self._pot_reading_entry.set(pot_reading)
 
     def _smartdashboard_display_components(self) -> None:
-        SmartDashboard.putNumber(ARM_DASHBOARD_SLEW_RATE, self._slew_rate_of_change)
-        SmartDashboard.putBoolean(ARM_DASHBOARD_UPPER_LIMIT, self._limit_value(self._upper_limit_switch))
-        SmartDashboard.putBoolean(ARM_DASHBOARD_LOWER_LIMIT, self._limit_value(self._lower_limit_switch))
+        self._slew_rate_entry.set(self._slew_rate_of_change)
+        self._upper_limit_entry.set(self._upper_limit_reading.get())
+        self._lower_limit_entry.set(self._lower_limit_reading.get())
 
     @property
     def upper_limit_switch(self) -> DigitalInput:
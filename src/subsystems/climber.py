@@ -1,8 +1,17 @@
 from configparser import ConfigParser
+from typing import Optional, Union
 
 from commands2 import Subsystem
 from wpilib import PWMTalonSRX, AnalogPotentiometer
-from wpilib import SmartDashboard
+from wpimath.controller import ProfiledPIDController
+from wpimath.trajectory import TrapezoidProfile
+
+from robot_config import ClimberConfig
+from util.analog_filter import FilteredPotentiometer
+from util.motor_output import MotorOutput, VoltageCompensation
+from util.power_budget import PowerBudget
+from util.sensor_snapshot import SensorSnapshot
+from util.telemetry import Telemetry
 
 
 class Climber(Subsystem):
@@ -18,62 +27,162 @@ class Climber(Subsystem):
     EXTENDED_THRESHOLD_KEY = "EXTENDED_THRESHOLD"
     RETRACTED_THRESHOLD_KEY = "RETRACTED_THRESHOLD"
 
-    def __init__(self, config: ConfigParser):
+    def __init__(
+            self,
+            config: Union[ClimberConfig, ConfigParser],
+            telemetry: Optional[Telemetry] = None,
+            sensors: Optional[SensorSnapshot] = None,
+            power: Optional[PowerBudget] = None,
+    ):
         super().__init__()
+        if isinstance(config, ConfigParser):
+            config = ClimberConfig.from_parser(config)
         self._config = config
+        self._telemetry = telemetry if telemetry is not None else Telemetry()
+        self._sensors = sensors if sensors is not None else SensorSnapshot()
+        self._power = power if power is not None else PowerBudget()
+        self._pot_limiter: Optional[AnalogPotentiometer] = None
+        self._motor: Optional[PWMTalonSRX] = None
         self._init_components()
-        # TODO refactor smartdashboard updates to robot_controller
+        self._init_control()
+        self._init_telemetry()
         self._update_smartdashboard_sensors()
 
     def _init_components(self):
-        self._max_speed = self._config.getfloat(Climber.GENERAL_SECTION, Climber.MAX_SPEED_KEY)
-
-        if self._config.getboolean(Climber.GENERAL_SECTION, Climber.ENABLED_KEY):
-            self._motor = PWMTalonSRX(self._config.getint(Climber.GENERAL_SECTION, Climber.CHANNEL_KEY))
-            self._motor.setInverted(self._config.getboolean(Climber.GENERAL_SECTION, Climber.INVERTED_KEY))
-
-        if self._config.getboolean(Climber.CLIMBER_LIMITS_SECTION, Climber.ENABLED_KEY):
-            self._pot_channel = self._config.getint(Climber.CLIMBER_LIMITS_SECTION, Climber.CHANNEL_KEY)
-            self._pot_full_range = self._config.getint(Climber.CLIMBER_LIMITS_SECTION, Climber.FULL_RANGE_KEY)
-            self._pot_offset = self._config.getint(Climber.CLIMBER_LIMITS_SECTION, Climber.OFFSET_RANGE_KEY)
-            self._pot_retracted_threshold = self._config \
-                .getfloat(Climber.CLIMBER_LIMITS_SECTION, Climber.RETRACTED_THRESHOLD_KEY)
-            SmartDashboard.putNumber("Climber_POT Retract Threshold: ", self._pot_retracted_threshold)
-            self._pot_extended_threshold = self._config \
-                .getfloat(Climber.CLIMBER_LIMITS_SECTION, Climber.EXTENDED_THRESHOLD_KEY)
-            SmartDashboard.putNumber("Climber_POT Extended Threshold: ", self._pot_extended_threshold)
-            self._pot_limiter = AnalogPotentiometer(self._pot_channel, self._pot_full_range, self._pot_offset)
+        general = self._config.general
+        self._max_speed = general.max_speed
+
+        if general.enabled:
+            self._motor = PWMTalonSRX(general.channel)
+            self._motor.setInverted(general.inverted)
+        compensation = VoltageCompensation.create(
+            self._sensors, general.voltage_compensation, general.nominal_voltage)
+        self._output = MotorOutput(self._motor, compensation, power=self._power.channel("Climber"))
+
+        limits = self._config.limits
+        if limits.enabled:
+            self._pot_channel = limits.channel
+            self._pot_full_range = limits.full_range
+            self._pot_offset = limits.offset
+            self._pot_retracted_threshold = limits.retracted_threshold
+            self._telemetry.add_number("Climber_POT Retract Threshold: ", self._pot_retracted_threshold)
+            self._pot_extended_threshold = limits.extended_threshold
+            self._telemetry.add_number("Climber_POT Extended Threshold: ", self._pot_extended_threshold)
+            self._pot_filter = FilteredPotentiometer(
+                self._pot_channel, self._pot_full_range, self._pot_offset, limits.sampling)
+            self._pot_limiter = self._pot_filter.potentiometer
+            self._pot_position = self._pot_filter.add_to(self._sensors, "Climber Potentiometer")
+
+    def _init_control(self):
+        """
+        Closed loop control of the winch to a pot position, the position follows a trapezoid
+        profile so the winch eases in and out of each move
+        """
+        control = self._config.control
+        self._controller = ProfiledPIDController(
+            control.kp,
+            control.ki,
+            control.kd,
+            TrapezoidProfile.Constraints(control.max_velocity, control.max_acceleration),
+        )
+        self._controller.setTolerance(control.tolerance)
+        self._goal: Optional[float] = None
+
+    def _init_telemetry(self):
+        self._speed_entry = self._telemetry.add_number("Winch Speed", epsilon=0.001)
+        self._goal_entry = self._telemetry.add_number("Winch Goal", epsilon=0.5)
+        self._pot_position_entry = self._telemetry.add_number("Winch Potentiometer Position", epsilon=0.5)
+        self._pot_retracted_entry = self._telemetry.add_boolean("Winch POT Retracted")
+        self._pot_extended_entry = self._telemetry.add_boolean("Winch POT Extended")
+        self._motor_raw_entry = self._telemetry.add_number("Climber Motor RAW", epsilon=0.001)
 
     def is_retracted(self) -> bool:
-        return self.potentiometer().get() <= self._pot_retracted_threshold
+        return self._pot_position.get() <= self._pot_retracted_threshold
 
     def is_extended(self) -> bool:
-        return self.potentiometer().get() >= self._pot_extended_threshold
+        return self._pot_position.get() >= self._pot_extended_threshold
 
     def _update_smartdashboard_sensors(self, speed: float = 0.0):
-        SmartDashboard.putNumber("Winch Speed", speed)
+        self._speed_entry.set(speed)
         if self._pot_limiter is not None:
-            SmartDashboard.putNumber("Winch Potentiometer Position", self.potentiometer().get())
-            SmartDashboard.putBoolean("Winch POT Retracted", self.is_retracted())
-            SmartDashboard.putBoolean("Winch POT Extended", self.is_extended())
-            SmartDashboard.putNumber("Climber Motor RAW", self._motor.get())
+            position = self._pot_position.get()
+            self._pot_position_entry.set(position)
+            self._pot_retracted_entry.set(position <= self._pot_retracted_threshold)
+            self._pot_extended_entry.set(position >= self._pot_extended_threshold)
+            self._motor_raw_entry.set(self._output.get())
 
     def move_winch(self, speed: float):
+        self._drive_winch(speed * self._max_speed)
+
+    def _drive_winch(self, speed: float):
         adjusted_speed = 0.0
         if self._motor:
-            if speed < 0.0 and not self.is_retracted():
-                adjusted_speed = speed * self._max_speed
-            elif speed > 0.0 and not self.is_extended():
-                adjusted_speed = speed * self._max_speed
-            else:
-                adjusted_speed = 0.0
-            self._motor.set(adjusted_speed)
+            adjusted_speed = self._soft_limit(speed)
+            self._output.set(adjusted_speed)
 
         self._update_smartdashboard_sensors(adjusted_speed)
 
+    def _soft_limit(self, speed: float) -> float:
+        """
+        Stop the winch at the thresholds, and taper its speed towards a threshold down to the soft
+        limit speed over the soft limit zone before it
+        """
+        if self._pot_limiter is None:
+            return speed
+        position = self._pot_position.get()
+        if speed < 0.0:
+            distance = position - self._pot_retracted_threshold
+        elif speed > 0.0:
+            distance = self._pot_extended_threshold - position
+        else:
+            return 0.0
+        if distance <= 0.0:
+            return 0.0
+        control = self._config.control
+        if distance < control.soft_limit_zone:
+            limit = control.soft_limit_speed + (1.0 - control.soft_limit_speed) * distance / control.soft_limit_zone
+            speed = max(-limit, min(limit, speed))
+        return speed
+
+    def set_goal(self, goal: Union[str, float]) -> None:
+        """
+        Start moving the winch to a named setpoint or a pot position, the profile starts from where
+        the winch is now. A goal outside the thresholds is held just inside them.
+        """
+        if isinstance(goal, str):
+            goal = self._config.control.setpoint(goal)
+        if self._pot_limiter is None:
+            self._goal = goal
+            return
+        self._goal = max(self._pot_retracted_threshold, min(self._pot_extended_threshold, goal))
+        self._controller.reset(self._pot_position.get())
+        self._controller.setGoal(self._goal)
+        self._goal_entry.set(self._goal)
+
+    def move_to_goal(self) -> None:
+        """Drive the winch towards the goal for this loop, without a pot the winch is stopped."""
+        if self._pot_limiter is None or self._goal is None:
+            self._drive_winch(0.0)
+            return
+        output = self._controller.calculate(self._pot_position.get())
+        output += self._config.control.kv * self._controller.getSetpoint().velocity
+        self._drive_winch(max(-self._max_speed, min(self._max_speed, output)))
+
+    def at_goal(self) -> bool:
+        """True once the winch is within tolerance of the goal, always without a pot."""
+        if self._pot_limiter is None:
+            return True
+        return self._goal is not None and self._controller.atGoal()
+
     def potentiometer(self) -> AnalogPotentiometer:
         return self._pot_limiter
 
+    def pot_position(self) -> float:
+        """
+        Return the potentiometer position in degrees, as sampled at the start of the current loop
+        """
+        return self._pot_position.get()
+
     def pot_range(self) -> float:
         return self._pot_full_range
 
@@ -81,4 +190,14 @@ class Climber(Subsystem):
         return self._pot_offset
 
     def is_climber_between_limits(self):
-        return self._pot_retracted_threshold < self._pot_limiter.get() < self._pot_extended_threshold
+        return self._pot_retracted_threshold < self._pot_position.get() < self._pot_extended_threshold
+
+    @property
+    def goal(self) -> Optional[float]:
+        """The pot position the winch was last sent to, None before the first goal."""
+        return self._goal
+
+    @property
+    def output(self) -> float:
+        """The motor controller output last set, 0 when the motor is disabled."""
+        return self._output.get()
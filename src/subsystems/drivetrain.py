@@ -2,15 +2,24 @@
 # Open Source Software; you can modify and / or share it under the terms of
 # the MIT license file in the root directory of this project
 import logging
+import math
 from configparser import ConfigParser
-from typing import Optional
+from typing import Optional, Union
 
 from commands2 import Subsystem
-from wpilib import ADXRS450_Gyro, MotorControllerGroup, PWMSparkMax, PWMTalonSRX
-from wpilib import PWMMotorController
-from wpilib import SmartDashboard
+from wpilib import ADXRS450_Gyro, Encoder, MotorControllerGroup, PWMSparkMax, PWMTalonSRX
+from wpilib import PWMMotorController, SPI
 from wpilib.drive import DifferentialDrive
-from wpimath.filter import SlewRateLimiter
+from wpimath.geometry import Rotation2d
+from wpimath.kinematics import DifferentialDriveKinematics
+
+from robot_config import DrivetrainConfig, EncoderConfig, MotorConfig
+from util.accel_limiter import AccelLimiter
+from util.motor_output import VoltageCompensation
+from util.power_budget import PowerBudget
+from util.sensor_snapshot import SensorSnapshot, SensorReading
+from util.stopwatch import TimerService, timer_service
+from util.telemetry import Telemetry
 
 
 class Drivetrain(Subsystem):
@@ -41,67 +50,202 @@ class Drivetrain(Subsystem):
 
     def __init__(
             self,
-            config: ConfigParser,
+            config: Union[DrivetrainConfig, ConfigParser],
+            telemetry: Optional[Telemetry] = None,
+            sensors: Optional[SensorSnapshot] = None,
+            timer: Optional[TimerService] = None,
+            power: Optional[PowerBudget] = None,
     ):
+        if isinstance(config, ConfigParser):
+            config = DrivetrainConfig.from_parser(config)
         self._config = config
+        self._sensors = sensors if sensors is not None else SensorSnapshot()
+        self._timer = timer if timer is not None else timer_service
+        self._power = power if power is not None else PowerBudget()
         self._init_components()
         self._gyro: Optional[ADXRS450_Gyro] = None
+        if self._config.gyro.enabled:
+            # the gyro's CHANNEL is the SPI port it is plugged into
+            self._gyro = ADXRS450_Gyro(SPI.Port(self._config.gyro.channel))
+        self._gyro_reading: Optional[SensorReading[float]] = None
+        if self._gyro is not None:
+            self._gyro_reading = self._sensors.add("Drivetrain Gyro", self._gyro.getAngle)
         self._gyro_angle: float = 0.0
         self._slow: bool = False
         self._turbo: bool = False
-        # TODO: refactor smartdashboard updates into robot controller
-        Drivetrain._update_smartdashboard_tank_drive(0.0, 0.0)
-        Drivetrain._update_smartdashboard_arcade_drive(0.0, 0.0)
+        self._init_wheel_travel()
+        self._init_telemetry(telemetry if telemetry is not None else Telemetry())
         super().__init__()
 
     def _init_components(self):
-        self._max_speed = self._config.getfloat(
-            Drivetrain.GENERAL_SECTION, Drivetrain.MAX_SPEED_KEY
-        )
-        self._slow_scaling = self._config.getfloat(
-            Drivetrain.GENERAL_SECTION, Drivetrain.SLOW_SCALING_KEY
-        )
-        self._turbo_scaling = self._config.getfloat(
-            Drivetrain.GENERAL_SECTION, Drivetrain.TURBO_SCALING_KEY
-        )
-        self._scaling = self._config.getfloat(
-            Drivetrain.GENERAL_SECTION, Drivetrain.DEFAULT_SCALING_KEY
-        )
+        self._max_speed = self._config.max_speed
+        self._slow_scaling = self._config.slow_scaling
+        self._turbo_scaling = self._config.turbo_scaling
+        self._scaling = self._config.default_scaling
 
-        self._left_motor1 = self._init_motor(Drivetrain.LEFT_MOTOR_SECTION1)
-        self._left_motor2 = self._init_motor(Drivetrain.LEFT_MOTOR_SECTION2)
+        self._left_motor1 = self._init_motor(self._config.left_motor1)
+        self._left_motor2 = self._init_motor(self._config.left_motor2)
         self._left_m = MotorControllerGroup(self._left_motor1, self._left_motor2)
-        self._left_m.setInverted(self._config.getboolean(Drivetrain.LEFT_MOTORG_SECTION, Drivetrain.INVERTED_KEY))
-        if not self._config.getboolean(Drivetrain.LEFT_MOTORG_SECTION, Drivetrain.ENABLED_KEY):
+        self._left_m.setInverted(self._config.left_group.inverted)
+        if not self._config.left_group.enabled:
             self._left_m.disable()
 
-        self._right_motor1 = self._init_motor(Drivetrain.RIGHT_MOTOR_SECTION1)
-        self._right_motor2 = self._init_motor(Drivetrain.RIGHT_MOTOR_SECTION2)
+        self._right_motor1 = self._init_motor(self._config.right_motor1)
+        self._right_motor2 = self._init_motor(self._config.right_motor2)
         self._right_m = MotorControllerGroup(self._right_motor1, self._right_motor2)
-        self._right_m.setInverted(self._config.getboolean(Drivetrain.RIGHT_MOTORG_SECTION, Drivetrain.INVERTED_KEY))
-        if not self._config.getboolean(Drivetrain.LEFT_MOTORG_SECTION, Drivetrain.ENABLED_KEY):
+        self._right_m.setInverted(self._config.right_group.inverted)
+        if not self._config.right_group.enabled:
             self._right_m.disable()
 
         if self._left_m and self._right_m:
             self._robot_drive = DifferentialDrive(self._left_m, self._right_m)
             self._robot_drive.setSafetyEnabled(False)
 
-        self._l_slew_rate_limiter = SlewRateLimiter(0.5)
-        self._r_slew_rate_limiter = SlewRateLimiter(0.5)
+        self._init_output_stage()
+
+    def _init_output_stage(self) -> None:
+        """
+        Every drive request passes through one output stage: the driver's turbo / slow scaling,
+        each side's acceleration and deceleration limits, voltage compensation, then the
+        drivetrain's share of the power budget
+        """
+        output = self._config.output
+        self._l_slew_rate_limiter = AccelLimiter(output.accel_rate, output.decel_rate, self._timer)
+        self._r_slew_rate_limiter = AccelLimiter(output.accel_rate, output.decel_rate, self._timer)
+        self._compensation = VoltageCompensation.create(
+            self._sensors, output.voltage_compensation, output.nominal_voltage)
+        self._power_channel = self._power.channel("Drivetrain")
+
+    def _init_wheel_travel(self) -> None:
+        """
+        Track the travel of each side from the wheel encoders, or without encoders by integrating
+        the commanded output of each side at the configured max velocity
+        """
+        self._kinematics = DifferentialDriveKinematics(self._config.kinematics.track_width)
+        self._left_encoder = self._init_encoder(self._config.left_encoder)
+        self._right_encoder = self._init_encoder(self._config.right_encoder)
+        self._left_distance_reading: Optional[SensorReading[float]] = None
+        self._right_distance_reading: Optional[SensorReading[float]] = None
+        if self._left_encoder is not None and self._right_encoder is not None:
+            self._left_distance_reading = self._sensors.add("Drivetrain Left Distance", self._left_encoder.getDistance)
+            self._right_distance_reading = self._sensors.add("Drivetrain Right Distance",
+                                                             self._right_encoder.getDistance)
+        self._left_distance = 0.0
+        self._right_distance = 0.0
+        self._last_distance_update: Optional[int] = None
 
-    def _init_motor(self, config_section: str) -> PWMMotorController:
-        if self._config.get(config_section, Drivetrain.TYPE_KEY) == "SPARKMAX":
-            motor = PWMSparkMax(self._config.getint(config_section, Drivetrain.CHANNEL_KEY))
-            logging.info(f"{config_section} motor initialized as PWMSparkMax")
+    @staticmethod
+    def _init_encoder(encoder_config: EncoderConfig) -> Optional[Encoder]:
+        if not encoder_config.enabled:
+            return None
+        encoder = Encoder(encoder_config.channel_a, encoder_config.channel_b, encoder_config.inverted)
+        encoder.setDistancePerPulse(encoder_config.distance_per_pulse)
+        return encoder
+
+    def _init_telemetry(self, telemetry: Telemetry) -> None:
+        self._telemetry = telemetry
+        self._left_speed_entry = telemetry.add_number("Drivetrain Left Speed", epsilon=0.001)
+        self._right_speed_entry = telemetry.add_number("Drivetrain Right Speed", epsilon=0.001)
+        self._linear_speed_entry = telemetry.add_number("Drivetrain Linear Speed", epsilon=0.001)
+        self._turn_speed_entry = telemetry.add_number("Drivetrain Turn Speed", epsilon=0.001)
+        self._gyro_angle_entry = telemetry.add_number("Gyro Angle", epsilon=0.1)
+
+    def _init_motor(self, motor_config: MotorConfig) -> PWMMotorController:
+        if motor_config.type == "SPARKMAX":
+            motor = PWMSparkMax(motor_config.channel)
+            logging.info("Drivetrain motor on channel %d initialized as PWMSparkMax", motor_config.channel)
         else:
-            motor = PWMTalonSRX(self._config.getint(config_section, Drivetrain.CHANNEL_KEY))
-            logging.info(f"{config_section} motor initialized as PWMTalonSRX")
+            motor = PWMTalonSRX(motor_config.channel)
+            logging.info("Drivetrain motor on channel %d initialized as PWMTalonSRX", motor_config.channel)
 
-        # motor.setInverted(self._config.getboolean(config_section, Drivetrain.INVERTED_KEY))
-        if not self._config.getboolean(config_section, Drivetrain.ENABLED_KEY):
+        # motor.setInverted(motor_config.inverted)
+        if not motor_config.enabled:
             motor.disable()
         return motor
 
+    @property
+    def heading(self) -> Rotation2d:
+        """
+        The gyro is clockwise positive while odometry is counter-clockwise positive, without a
+        gyro the heading comes from the difference in travel of the two sides
+        """
+        if self._gyro_reading is not None:
+            return Rotation2d.fromDegrees(-self.get_gyro_angle())
+        return Rotation2d((self._right_distance - self._left_distance) / self._config.kinematics.track_width)
+
+    def update_wheel_distances(self) -> tuple[float, float]:
+        """
+        Update the travel of each side in meters since boot, called once per loop by odometry
+        """
+        now = self._timer.now()
+        if self._left_distance_reading is not None:
+            self._left_distance = self._left_distance_reading.get()
+            self._right_distance = self._right_distance_reading.get()
+        elif self._last_distance_update is not None:
+            travel = self._config.kinematics.max_velocity * (now - self._last_distance_update) / 1e9
+            self._left_distance += self._left_m.get() * travel
+            self._right_distance += self._right_m.get() * travel
+        self._last_distance_update = now
+        return self._left_distance, self._right_distance
+
+    @property
+    def kinematics(self) -> DifferentialDriveKinematics:
+        return self._kinematics
+
+    @property
+    def wheel_distances(self) -> tuple[float, float]:
+        return self._left_distance, self._right_distance
+
+    def drive_wheel_speeds(self, left_velocity: float, right_velocity: float) -> None:
+        """
+        Drive each side at a wheel speed in meters per second, converted to motor output with a
+        static friction term plus the fraction of the configured max velocity
+        """
+        self._output_stage(self._wheel_output(left_velocity), self._wheel_output(right_velocity))
+
+    def _wheel_output(self, velocity: float) -> float:
+        kinematics = self._config.kinematics
+        output = velocity / kinematics.max_velocity
+        if abs(velocity) > 1e-3:
+            output += math.copysign(kinematics.ks, velocity)
+        return output
+
+    def _drive_output(self, left: float, right: float, scaled: bool) -> tuple[float, float]:
+        """
+        Drive each side at a fraction of the max speed through the output stage, `scaled` applies
+        the driver's turbo / slow scaling on top
+        """
+        scaling = self._max_speed * self.speed_scaling if scaled else self._max_speed
+        return self._output_stage(left * scaling, right * scaling)
+
+    def _output_stage(self, left: float, right: float) -> tuple[float, float]:
+        """
+        The output stage: limit each side's acceleration, compensate for the battery voltage,
+        clamp to the max speed and scale to the power budget, then set the motors
+        """
+        left = self._l_slew_rate_limiter.calculate(left)
+        right = self._r_slew_rate_limiter.calculate(right)
+        left = self._compensation.duty_cycle(left)
+        right = self._compensation.duty_cycle(right)
+        max_speed = self._max_speed
+        left = max(-max_speed, min(max_speed, left))
+        right = max(-max_speed, min(max_speed, right))
+        power_scale = self._power_channel.request_pair(left, right)
+        left *= power_scale
+        right *= power_scale
+        self._robot_drive.tankDrive(left, right, False)
+        self._update_smartdashboard_tank_drive(left, right)
+        return left, right
+
+    @property
+    def speed_scaling(self) -> float:
+        """The driver's scaling of the drive speed: slow, turbo or the default."""
+        if self._slow:
+            return self._slow_scaling
+        if self._turbo:
+            return self._turbo_scaling
+        return self._scaling
+
     def is_gyro_enabled(self) -> bool:
         return self._gyro is not None
 
@@ -109,12 +253,12 @@ class Drivetrain(Subsystem):
     def arcade_rotation_modifier(self) -> float:
         return self._arcade_rotation_modifier
 
-    def tank_drive(self, left_speed: float, right_speed: float):
-        # TODO: Insert slew rate filters
-        left = left_speed * self._max_speed
-        right = right_speed * self._max_speed
-        self._robot_drive.tankDrive(left, right, False)
-        Drivetrain._update_smartdashboard_tank_drive(left_speed, right_speed)
+    def tank_drive(self, left_speed: float, right_speed: float, scaled: bool = False):
+        """
+        Drive each side at a fraction of the max speed, `scaled` applies the driver's turbo / slow
+        scaling on top
+        """
+        self._drive_output(left_speed, right_speed, scaled)
         self.get_gyro_angle()
         self._update_smartdashboard_sensors(self._gyro_angle)
 
@@ -122,14 +266,17 @@ class Drivetrain(Subsystem):
             self,
             linear_distance: float,
             turn_angle: float,
-            squared_inputs: bool = True
+            squared_inputs: bool = True,
+            scaled: bool = False,
     ):
+        """
+        Drive forward and turn, each side at a fraction of the max speed, `scaled` applies the
+        driver's turbo / slow scaling on top exactly as for tank drive
+        """
         determined_turn_angle = self._modify_turn_angle(turn_angle)
-        if self._robot_drive:
-            self._robot_drive.arcadeDrive(
-                linear_distance, determined_turn_angle, squared_inputs
-            )
-        Drivetrain._update_smartdashboard_arcade_drive(
+        wheels = DifferentialDrive.arcadeDriveIK(linear_distance, determined_turn_angle, squared_inputs)
+        self._drive_output(wheels.left, wheels.right, scaled)
+        self._update_smartdashboard_arcade_drive(
             linear_distance, determined_turn_angle
         )
         self.get_gyro_angle()
@@ -142,19 +289,16 @@ class Drivetrain(Subsystem):
         """
         return self._arcade_rotation_modifier * turn_angle
 
-    @staticmethod
-    def _update_smartdashboard_tank_drive(left: float, right: float):
-        SmartDashboard.putNumber("Drivetrain Left Speed", left)
-        SmartDashboard.putNumber("Drivetrain Right Speed", right)
+    def _update_smartdashboard_tank_drive(self, left: float, right: float):
+        self._left_speed_entry.set(left)
+        self._right_speed_entry.set(right)
 
-    @staticmethod
-    def _update_smartdashboard_arcade_drive(linear: float, turn: float):
-        SmartDashboard.putNumber("Drivetrain Linear Speed", linear)
-        SmartDashboard.putNumber("Drivetrain Turn Speed", turn)
+    def _update_smartdashboard_arcade_drive(self, linear: float, turn: float):
+        self._linear_speed_entry.set(linear)
+        self._turn_speed_entry.set(turn)
 
-    @staticmethod
-    def _update_smartdashboard_sensors(gyro_angle: float):
-        SmartDashboard.putNumber("Gyro Angle", gyro_angle)
+    def _update_smartdashboard_sensors(self, gyro_angle: float):
+        self._gyro_angle_entry.set(gyro_angle)
 
     @property
     def left_motor(self) -> MotorControllerGroup:
@@ -185,8 +329,11 @@ class Drivetrain(Subsystem):
         return self._scaling
 
     def get_gyro_angle(self) -> float:
-        if self._gyro:
-            self._gyro_angle = self._gyro.getAngle()
+        """
+        Return the gyro angle sampled at the start of the current loop, or the last known angle without a gyro
+        """
+        if self._gyro_reading is not None:
+            self._gyro_angle = self._gyro_reading.get()
         return self._gyro_angle
 
     @property
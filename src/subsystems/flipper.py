@@ -1,4 +1,5 @@
 import configparser
+from typing import Union
 
 from commands.shooter_commands import LowerShooter
 from commands2 import Subsystem
@@ -6,6 +7,8 @@ from wpilib import PneumaticsModuleType
 from wpilib import SmartDashboard
 from wpilib import Solenoid
 
+from robot_config import SolenoidConfig
+
 
 class Flipper(Subsystem):
     GENERAL_SECTION = "FlipperGeneral"
@@ -20,28 +23,23 @@ class Flipper(Subsystem):
     _enabled: bool = False
 
     def __init__(
-        self, robot, name="Flipper", configfile="/home/lvuser/py/configs/subsystems.ini"
+        self, robot, config: Union[SolenoidConfig, configparser.ConfigParser], name="Flipper"
     ):
         self._robot = robot
-        self._config = configparser.ConfigParser()
-        self._config.read(configfile)
-        self._enabled = self._config.getboolean(
-            Flipper.GENERAL_SECTION, Flipper.ENABLED_KEY
-        )
+        if isinstance(config, configparser.ConfigParser):
+            config = SolenoidConfig.from_parser(config, Flipper.GENERAL_SECTION)
+        self._config = config
+        self._enabled = self._config.enabled
         self._init_components()
-        self.setName(name)
         super().__init__()
+        self.setName(name)
 
     def _init_components(self):
         if self._enabled:
-            self._solenoid_inverted = self._config.getboolean(
-                Flipper.GENERAL_SECTION, Flipper.SOLENOID_INVERTED_KEY
-            )
+            self._solenoid_inverted = self._config.solenoid_inverted
             self._solenoid = Solenoid(
                 PneumaticsModuleType.CTREPCM,
-                self._config.getint(
-                    Flipper.GENERAL_SECTION, Flipper.SOLENOID_CHANNEL_KEY
-                ),
+                self._config.solenoid_channel,
             )
 
     def initDefaultCommand(self):
@@ -2,10 +2,13 @@
 # Open Source Software; you can modify and / or share it under the terms of
 # the MIT license file in the root directory of this project
 from configparser import ConfigParser
+from typing import Union
 
-from commands2 import SubsystemBase, Subsystem
+from commands2 import Subsystem
 from wpilib import PneumaticsModuleType, Solenoid, SmartDashboard
 
+from robot_config import SolenoidConfig
+
 
 class Grabber(Subsystem):
     # Config file section name
@@ -18,15 +21,17 @@ class Grabber(Subsystem):
     SOLENOID_CHANNEL_KEY = "SOLENOID_CHANNEL"
     SOLENOID_INVERTED_KEY = "SOLENOID_INVERTED"
 
-    def __init__(self, config: ConfigParser):
+    def __init__(self, config: Union[SolenoidConfig, ConfigParser]):
         super().__init__()
+        if isinstance(config, ConfigParser):
+            config = SolenoidConfig.from_parser(config, Grabber.GENERAL_SECTION)
         self._config = config
         self._init_components()
 
     def _init_components(self) -> None:
-        self._enabled = self._config.getboolean(Grabber.GENERAL_SECTION, Grabber.ENABLED_KEY)
+        self._enabled = self._config.enabled
 
-        self._channel = self._config.getint(Grabber.GENERAL_SECTION, Grabber.SOLENOID_CHANNEL_KEY)
+        self._channel = self._config.solenoid_channel
         self._solenoid = Solenoid(PneumaticsModuleType.CTREPCM, self._channel)
         SmartDashboard.putNumber("Grabber Solenoid DIO Channel", self._solenoid.getChannel())   
 
@@ -0,0 +1,102 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Optional
+
+from commands2 import Subsystem
+from wpilib import Field2d, SmartDashboard
+from wpimath.estimator import DifferentialDrivePoseEstimator
+from wpimath.geometry import Pose2d
+from wpimath.interpolation import TimeInterpolatablePose2dBuffer
+
+from subsystems.drivetrain import Drivetrain
+from util.stopwatch import TimerService, timer_service
+from util.telemetry import Telemetry
+
+
+class Odometry(Subsystem):
+    """
+    Field pose of the robot, fused from the gyro and the drivetrain wheel travel every loop
+
+    The pose estimator accepts latency compensated corrections (e.g. from vision) through
+    `add_vision_measurement`, and a bounded history of timestamped poses lets any consumer look
+    up where the robot was when a measurement was taken. Timestamps are seconds on the same
+    clock as the shared timer service. The pose is published to the dashboard once per loop.
+    """
+
+    # seconds of pose history kept for latency compensation
+    HISTORY_SECONDS = 1.5
+
+    def __init__(
+            self,
+            drivetrain: Drivetrain,
+            telemetry: Optional[Telemetry] = None,
+            timer: Optional[TimerService] = None,
+            history_seconds: float = HISTORY_SECONDS,
+    ) -> None:
+        self._drivetrain = drivetrain
+        self._timer = timer if timer is not None else timer_service
+        left, right = drivetrain.wheel_distances
+        self._estimator = DifferentialDrivePoseEstimator(
+            drivetrain.kinematics, drivetrain.heading, left, right, Pose2d()
+        )
+        self._history = TimeInterpolatablePose2dBuffer(history_seconds)
+        self._pose = Pose2d()
+        self._init_telemetry(telemetry if telemetry is not None else Telemetry())
+        super().__init__()
+
+    def _init_telemetry(self, telemetry: Telemetry) -> None:
+        self._x_entry = telemetry.add_number("Odometry X", epsilon=0.005)
+        self._y_entry = telemetry.add_number("Odometry Y", epsilon=0.005)
+        self._heading_entry = telemetry.add_number("Odometry Heading", epsilon=0.1)
+        self._field = Field2d()
+        # not "Field", which is the simulator's field holding the true pose of the simulated robot
+        SmartDashboard.putData("Odometry Field", self._field)
+
+    def periodic(self) -> None:
+        self.update()
+
+    def update(self) -> Pose2d:
+        """
+        Advance the pose by the drivetrain travel since the last loop, record it in the history
+        and publish it
+        """
+        self._drivetrain.update_wheel_distances()
+        left, right = self._drivetrain.wheel_distances
+        timestamp = self.timestamp()
+        self._pose = self._estimator.updateWithTime(timestamp, self._drivetrain.heading, left, right)
+        self._history.addSample(timestamp, self._pose)
+        self._publish(self._pose)
+        return self._pose
+
+    def _publish(self, pose: Pose2d) -> None:
+        self._x_entry.set(pose.X())
+        self._y_entry.set(pose.Y())
+        self._heading_entry.set(pose.rotation().degrees())
+        self._field.setRobotPose(pose)
+
+    def timestamp(self) -> float:
+        """The current time in seconds on the clock used for the pose history."""
+        return self._timer.now() / 1e9
+
+    def reset_pose(self, pose: Pose2d) -> None:
+        left, right = self._drivetrain.wheel_distances
+        self._estimator.resetPosition(self._drivetrain.heading, left, right, pose)
+        self._history.clear()
+        self._pose = pose
+
+    def add_vision_measurement(self, pose: Pose2d, timestamp: float) -> None:
+        """Correct the pose with a field pose measured at an earlier timestamp."""
+        self._estimator.addVisionMeasurement(pose, timestamp)
+
+    def pose_at(self, timestamp: float) -> Optional[Pose2d]:
+        """The interpolated pose at a timestamp within the history, None when the history is empty."""
+        return self._history.sample(timestamp)
+
+    @property
+    def pose(self) -> Pose2d:
+        return self._pose
+
+    @property
+    def history(self) -> TimeInterpolatablePose2dBuffer:
+        return self._history
@@ -1,8 +1,15 @@
 import configparser
 import logging
+from typing import Optional, Union
 
 from commands2 import Subsystem
-from wpilib import SmartDashboard, PWMSparkMax
+from wpilib import PWMSparkMax
+
+from robot_config import PWMSubsystemConfig
+from util.motor_output import MotorOutput, VoltageCompensation
+from util.power_budget import PowerBudget
+from util.sensor_snapshot import SensorSnapshot
+from util.telemetry import Telemetry
 
 
 class Shooter(Subsystem):
@@ -16,29 +23,46 @@ class Shooter(Subsystem):
     MAX_SPEED_KEY = "MAX_SPEED"
     MODIFIER_SCALING_KEY = "MODIFIER_SCALING"
 
-    def __init__(self, config: configparser.ConfigParser):
+    def __init__(
+            self,
+            config: Union[PWMSubsystemConfig, configparser.ConfigParser],
+            telemetry: Optional[Telemetry] = None,
+            sensors: Optional[SensorSnapshot] = None,
+            power: Optional[PowerBudget] = None,
+    ):
         super().__init__()
+        if isinstance(config, configparser.ConfigParser):
+            config = PWMSubsystemConfig.from_parser(config, Shooter.GENERAL_SECTION)
         self._config = config
+        self._sensors = sensors if sensors is not None else SensorSnapshot()
+        self._power = power if power is not None else PowerBudget()
         self._init_components()
         logging.info("Shooter initialized")
-        # TODO move smartdashboard update to Robot Controller
-        Shooter._update_smartdashboard(0.0)
+        telemetry = telemetry if telemetry is not None else Telemetry()
+        self._speed_entry = telemetry.add_number("Shooter Speed", epsilon=0.001)
 
     def _init_components(self):
-        self._enabled = self._config.getboolean(Shooter.GENERAL_SECTION, Shooter.ENABLED_KEY)
-        self._max_speed = self._config.getfloat(Shooter.GENERAL_SECTION, Shooter.MAX_SPEED_KEY)
+        self._enabled = self._config.enabled
+        self._max_speed = self._config.max_speed
 
+        self._motor: Optional[PWMSparkMax] = None
         if self._enabled:
             logging.info("Conveyor enabled")
-            self._motor = PWMSparkMax(self._config.getint(Shooter.GENERAL_SECTION, Shooter.CHANNEL_KEY))
-            self._motor.setInverted(self._config.getboolean(Shooter.GENERAL_SECTION, Shooter.INVERTED_KEY))
+            self._motor = PWMSparkMax(self._config.channel)
+            self._motor.setInverted(self._config.inverted)
+        compensation = VoltageCompensation.create(
+            self._sensors, self._config.voltage_compensation, self._config.nominal_voltage)
+        self._output = MotorOutput(self._motor, compensation, power=self._power.channel("Shooter"))
 
     def move(self, speed: float):
         adjusted_speed = speed * self._max_speed
-        if self._motor:
-            self._motor.set(adjusted_speed)
-        Shooter._update_smartdashboard(adjusted_speed)
+        self._output.set(adjusted_speed)
+        self._update_smartdashboard(adjusted_speed)
+
+    def _update_smartdashboard(self, speed: float = 0.0):
+        self._speed_entry.set(speed)
 
-    @staticmethod
-    def _update_smartdashboard(speed: float = 0.0):
-        SmartDashboard.putNumber("Shooter Speed", speed)
+    @property
+    def output(self) -> float:
+        """The motor controller output last set, 0 when the motor is disabled."""
+        return self._output.get()
@@ -1,8 +1,14 @@
 from configparser import ConfigParser
+from typing import Optional, Union
 
 from commands2 import Subsystem
 from wpilib import PWMVictorSPX, PWMTalonSRX
-from wpilib import SmartDashboard
+
+from robot_config import PWMSubsystemConfig
+from util.motor_output import MotorOutput, VoltageCompensation
+from util.power_budget import PowerBudget
+from util.sensor_snapshot import SensorSnapshot
+from util.telemetry import Telemetry
 
 
 class Vacuum(Subsystem):
@@ -17,32 +23,43 @@ class Vacuum(Subsystem):
 
     def __init__(
             self,
-            config: ConfigParser,
+            config: Union[PWMSubsystemConfig, ConfigParser],
+            telemetry: Optional[Telemetry] = None,
+            sensors: Optional[SensorSnapshot] = None,
+            power: Optional[PowerBudget] = None,
     ):
+        if isinstance(config, ConfigParser):
+            config = PWMSubsystemConfig.from_parser(config, Vacuum.GENERAL_SECTION)
         self._config = config
+        self._sensors = sensors if sensors is not None else SensorSnapshot()
+        self._power = power if power is not None else PowerBudget()
+        telemetry = telemetry if telemetry is not None else Telemetry()
+        self._speed_entry = telemetry.add_number("Vacuum Speed", epsilon=0.001)
         self._init_components()
         super().__init__()
 
     def _init_components(self):
-        self._max_speed = self._config.getfloat(
-            Vacuum.GENERAL_SECTION, Vacuum.MAX_SPEED_KEY
-        )
-        if self._config.getboolean(Vacuum.GENERAL_SECTION, Vacuum.ENABLED_KEY):
-            self._motor = PWMTalonSRX(
-                self._config.getint(Vacuum.GENERAL_SECTION, Vacuum.CHANNEL_KEY)
-            )
-            self._motor.setInverted(
-                self._config.getboolean(Vacuum.GENERAL_SECTION, Vacuum.INVERTED_KEY)
-            )
-        Vacuum._update_smartdashboard(0.0)
+        self._max_speed = self._config.max_speed
+        self._motor: Optional[PWMTalonSRX] = None
+        if self._config.enabled:
+            self._motor = PWMTalonSRX(self._config.channel)
+            self._motor.setInverted(self._config.inverted)
+        compensation = VoltageCompensation.create(
+            self._sensors, self._config.voltage_compensation, self._config.nominal_voltage)
+        self._output = MotorOutput(self._motor, compensation, power=self._power.channel("Vacuum"))
+        self._update_smartdashboard(0.0)
 
     def move(self, speed: float):
         adjusted_speed = 0.0
         if self._motor:
             adjusted_speed = speed * self._max_speed
-            self._motor.set(adjusted_speed)
-        Vacuum._update_smartdashboard(adjusted_speed)
+            self._output.set(adjusted_speed)
+        self._update_smartdashboard(adjusted_speed)
+
+    def _update_smartdashboard(self, speed: float):
+        self._speed_entry.set(speed)
 
-    @staticmethod
-    def _update_smartdashboard(speed: float):
-        SmartDashboard.putNumber("Vacuum Speed", speed)
+    @property
+    def output(self) -> float:
+        """The motor controller output last set, 0 when the motor is disabled."""
+        return self._output.get()
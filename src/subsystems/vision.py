@@ -0,0 +1,85 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import ntcore
+from commands2 import Subsystem
+from wpimath.geometry import Rotation2d
+
+from subsystems.odometry import Odometry
+from util.telemetry import Telemetry
+from vision.targeting import TARGET_TOPIC, VISION_TABLE
+
+
+@dataclass(frozen=True, slots=True)
+class VisionMeasurement:
+    """A target published by the camera process, placed on the field with the pose when it was seen"""
+    # capture time, seconds on the pose history clock
+    timestamp: float
+    # degrees from the camera center, counter-clockwise positive
+    yaw: float
+    pitch: float
+    # meters, nan when unknown
+    distance: float
+    id: int
+    # field relative heading from the robot to the target: the robot's heading when the frame was
+    # captured plus the yaw, so it stays correct however the robot turned since
+    heading: Rotation2d
+
+
+class Vision(Subsystem):
+    """
+    The latest target from the camera process, latency compensated with the odometry pose history
+
+    The camera process publishes each target stamped with the robot clock time its frame was
+    captured. Each loop a new target is matched with the pose the robot had at that time, which
+    turns the camera relative yaw into a field relative heading to the target.
+    """
+
+    def __init__(
+            self,
+            odometry: Odometry,
+            telemetry: Optional[Telemetry] = None,
+            instance: Optional[ntcore.NetworkTableInstance] = None,
+    ):
+        super().__init__()
+        self._odometry = odometry
+        instance = instance if instance is not None else ntcore.NetworkTableInstance.getDefault()
+        self._target_subscriber = instance.getTable(VISION_TABLE).getDoubleArrayTopic(TARGET_TOPIC).subscribe([])
+        self._latest: Optional[VisionMeasurement] = None
+        telemetry = telemetry if telemetry is not None else Telemetry()
+        self._heading_entry = telemetry.add_number("Vision Target Heading", epsilon=0.1)
+        self._age_entry = telemetry.add_number("Vision Target Age", epsilon=0.01)
+
+    def periodic(self) -> None:
+        self.update()
+
+    def update(self) -> Optional[VisionMeasurement]:
+        """Take a target published since the last loop, returning the latest target."""
+        values = self._target_subscriber.get()
+        if len(values) >= 5 and (self._latest is None or values[0] != self._latest.timestamp):
+            timestamp = values[0]
+            pose = self._odometry.pose_at(timestamp)
+            pose = pose if pose is not None else self._odometry.pose
+            self._latest = VisionMeasurement(timestamp, values[1], values[2], values[3], int(values[4]),
+                                             pose.rotation() + Rotation2d.fromDegrees(values[1]))
+            self._heading_entry.set(self._latest.heading.degrees())
+        self._age_entry.set(min(self.age(), 999.0))
+        return self._latest
+
+    def age(self) -> float:
+        """Seconds since the latest target's frame was captured, infinite before the first target."""
+        if self._latest is None:
+            return math.inf
+        return self._odometry.timestamp() - self._latest.timestamp
+
+    def target(self, max_age: float) -> Optional[VisionMeasurement]:
+        """The latest target, None when there is none captured within max_age seconds."""
+        return self._latest if self.age() <= max_age else None
+
+    @property
+    def latest(self) -> Optional[VisionMeasurement]:
+        return self._latest
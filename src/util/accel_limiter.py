@@ -0,0 +1,69 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Optional
+
+from util.stopwatch import TimerService, timer_service
+
+
+class AccelLimiter:
+    """
+    Limits how fast a motor output ramps up in magnitude, and separately how fast it comes back
+    down towards zero (or reverses)
+
+    Unlike `SlewRateLimiter`, which limits rising and falling values, the rates here follow the
+    magnitude: a robot may be allowed to pull away quickly but must not stop (or reverse) so
+    hard it tips. A rate of 0 leaves that direction unlimited. Time comes from the shared timer
+    service, so calls made in the same loop all start from the output at the start of the loop
+    and the last one wins.
+    """
+
+    __slots__ = ("_accel_rate", "_decel_rate", "_unlimited", "_timer", "_value", "_base", "_time", "_dt")
+
+    # seconds assumed for the first call, there is no previous loop to measure from
+    FIRST_PERIOD = 0.02
+
+    def __init__(self, accel_rate: float, decel_rate: float, timer: Optional[TimerService] = None):
+        self._accel_rate = accel_rate
+        self._decel_rate = decel_rate
+        # with neither rate set the output follows the target, without reading the clock
+        self._unlimited = accel_rate <= 0.0 and decel_rate <= 0.0
+        self._timer = timer if timer is not None else timer_service
+        self._value = 0.0
+        self._base = 0.0
+        self._time: Optional[int] = None
+        self._dt = 0.0
+
+    def calculate(self, target: float) -> float:
+        if self._unlimited:
+            self._value = target
+            return target
+        now = self._timer.now()
+        if now != self._time:
+            self._dt = self.FIRST_PERIOD if self._time is None else (now - self._time) / 1e9
+            self._time = now
+            self._base = self._value
+        current = self._base
+        if target * current >= 0.0 and abs(target) >= abs(current):
+            # speeding up, from rest or in the direction already moving
+            value = self._step(current, target, self._accel_rate)
+        else:
+            # slowing down, a reversal comes to a stop before it may speed up the other way
+            value = self._step(current, target if target * current >= 0.0 else 0.0, self._decel_rate)
+        self._value = value
+        return value
+
+    def _step(self, current: float, goal: float, rate: float) -> float:
+        if rate <= 0.0:
+            return goal
+        step = rate * self._dt
+        return max(current - step, min(current + step, goal))
+
+    def reset(self, value: float = 0.0) -> None:
+        self._value = value
+        self._base = value
+        self._time = None
+
+    @property
+    def value(self) -> float:
+        return self._value
@@ -0,0 +1,59 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Optional, Union
+
+from wpilib import AnalogInput, AnalogPotentiometer
+from wpimath.filter import LinearFilter, MedianFilter
+
+from robot_config import AnalogFilterConfig
+from util.sensor_snapshot import SensorReading, SensorSnapshot
+
+
+class FilteredPotentiometer:
+    """
+    A potentiometer read through the FPGA's oversample and average engine, then filtered over the
+    last few robot loops
+
+    The filter keeps its window in a fixed size ring buffer, and is fed by `sample` exactly once
+    per loop when registered with a `SensorSnapshot` through `add_to`. Limit checks, control
+    and telemetry all read the filtered value from the snapshot.
+    """
+
+    __slots__ = ("_input", "_pot", "_filter")
+
+    def __init__(self, channel: int, full_range: float, offset: float, config: AnalogFilterConfig):
+        self._input = AnalogInput(channel)
+        self._input.setOversampleBits(config.oversample_bits)
+        self._input.setAverageBits(config.average_bits)
+        # reads the averaged voltage of the input
+        self._pot = AnalogPotentiometer(self._input, full_range, offset)
+        self._filter: Optional[Union[MedianFilter, LinearFilter]] = None
+        if config.filter == "median":
+            self._filter = MedianFilter(config.window)
+        elif config.filter == "average":
+            self._filter = LinearFilter.movingAverage(config.window)
+
+    def add_to(self, sensors: SensorSnapshot, name: str) -> SensorReading[float]:
+        """Register the filtered position as a sensor, sampled once at the start of each loop."""
+        return sensors.add(name, self.sample)
+
+    def sample(self) -> float:
+        """Read the pot and feed the reading to the filter, returning the filtered position."""
+        position = self._pot.get()
+        if self._filter is None:
+            return position
+        return self._filter.calculate(position)
+
+    def get_raw(self) -> float:
+        """The position read now, without the loop filter."""
+        return self._pot.get()
+
+    def reset(self) -> None:
+        """Empty the filter window, the next sample starts a new one."""
+        if self._filter is not None:
+            self._filter.reset()
+
+    @property
+    def potentiometer(self) -> AnalogPotentiometer:
+        return self._pot
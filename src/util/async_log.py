@@ -0,0 +1,182 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import logging
+import math
+import queue
+import sys
+import time
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional, Sequence
+
+DEFAULT_FORMAT = "%(levelname)s:%(name)s:%(message)s"
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Passes each message at most once per interval, reporting the repeats it suppresses
+
+    Only repeats are limited: a message is keyed by its call site, template and arguments, so
+    "Motor on channel %d initialized" passes once per channel, or by a `rate_key` given through
+    `extra` to group messages that differ, such as a count logged every loop. Once the interval of
+    a key is over, the first repeat suppressed is handed to `report` with the number suppressed
+    after it as `record.suppressed`. This happens as the next record is logged, or on
+    `report_pending`. The repeat is formatted as it is kept, and a key is forgotten as its interval
+    ends, so no logged object is held for longer than the interval.
+    """
+
+    def __init__(
+            self,
+            report: Callable[[logging.LogRecord], None],
+            interval: float = 1.0,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self._report = report
+        self._interval = interval
+        self._clock = clock
+        # key -> [time passed, suppressed since, first record suppressed], oldest interval first
+        self._keys: OrderedDict[object, list] = OrderedDict()
+        # when the oldest interval ends
+        self._due = math.inf
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = self._clock()
+        if now >= self._due:
+            self._end_intervals(now)
+        key = getattr(record, "rate_key", None) or (record.pathname, record.lineno, record.msg, record.args)
+        try:
+            entry = self._keys.get(key)
+        except TypeError:
+            # unhashable arguments are never compared, the message always passes
+            return True
+        if entry is None:
+            self._keys[key] = [now, 0, None]
+            self._due = min(self._due, now + self._interval)
+            return True
+        entry[1] += 1
+        if entry[2] is None:
+            record.msg = record.getMessage()
+            record.args = None
+            # the first of the message passed with its traceback
+            record.exc_info = None
+            entry[2] = record
+        return False
+
+    def report_pending(self) -> None:
+        """Report the repeats suppressed so far without waiting for their intervals to end."""
+        self._end_intervals(math.inf)
+
+    def _end_intervals(self, now: float) -> None:
+        while self._keys:
+            key, entry = next(iter(self._keys.items()))
+            if now - entry[0] < self._interval:
+                self._due = entry[0] + self._interval
+                return
+            self._keys.popitem(last=False)
+            if entry[1]:
+                record = entry[2]
+                record.suppressed = entry[1] - 1
+                self._report(record)
+        self._due = math.inf
+
+
+class SuppressedCountFormatter(logging.Formatter):
+    """Appends how many repeats of the message the rate limit suppressed"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} (repeated {suppressed} more times)" if suppressed else text
+
+
+class _LogWriter(QueueListener):
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        # the writer holds its last record until the next one arrives, which must not keep the
+        # logged objects (a subsystem and its motor controllers) alive. The record is shared with
+        # any other handler, so it keeps the formatted message (and traceback text)
+        try:
+            record.msg = record.getMessage()
+        except (TypeError, ValueError):
+            pass
+        record.args = None
+        record.exc_info = None
+
+    def enqueue_sentinel(self) -> None:
+        # wait for room rather than fail when stopping with a full queue
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogHandler(QueueHandler):
+    """
+    Hands log records to a background thread, which formats and writes them
+
+    The robot loop only filters the record and puts it on a bounded queue, the message is not
+    formatted until the writer thread reaches it, so a slow console or disk never stalls the loop.
+    When the writer falls a whole queue behind, new records are dropped and counted rather than
+    blocking. Arguments are formatted late, so log values rather than objects that change.
+    """
+
+    def __init__(self, handlers: Sequence[logging.Handler], queue_size: int = 1000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self._writer = _LogWriter(self.queue, *handlers, respect_handler_level=True)
+        self._running = False
+        self._dropped = 0
+
+    def start(self) -> None:
+        self._writer.start()
+        self._running = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # formatting is left to the writer thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._dropped += 1
+
+    def close(self) -> None:
+        """Write every queued record, with the repeats still suppressed, and stop the writer thread."""
+        for log_filter in self.filters:
+            if isinstance(log_filter, RateLimitFilter):
+                log_filter.report_pending()
+        if self._running:
+            self._running = False
+            self._writer.stop()
+        if self._dropped:
+            sys.stderr.write(f"{self._dropped} log records dropped, the log writer fell behind\n")
+        super().close()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+
+def configure_logging(
+        level: int = logging.INFO,
+        interval: float = 1.0,
+        queue_size: int = 1000,
+        handlers: Optional[Sequence[logging.Handler]] = None,
+) -> AsyncLogHandler:
+    """
+    Route all logging through one rate limited `AsyncLogHandler` on the root logger, writing to
+    stderr unless other handlers are given. Calling it again returns the handler already installed.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, AsyncLogHandler):
+            return handler
+    if handlers is None:
+        stream = logging.StreamHandler()
+        stream.setFormatter(SuppressedCountFormatter(DEFAULT_FORMAT))
+        handlers = [stream]
+    handler = AsyncLogHandler(handlers, queue_size)
+    handler.addFilter(RateLimitFilter(handler.enqueue, interval))
+    root.addHandler(handler)
+    root.setLevel(level)
+    handler.start()
+    return handler
@@ -0,0 +1,152 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import builtins
+import logging
+import os
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+# set this environment variable to record the import time of every module loaded during boot
+BOOT_PROFILE_ENV = "ROBOT_BOOT_PROFILE"
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class ImportTimer:
+    """
+    Records how long each module takes to import, in the style of `python -X importtime`
+
+    While installed, every module imported for the first time is timed. The self time excludes
+    the modules it imports in turn, the cumulative time includes them. Modules already in
+    `sys.modules` are not recorded, so the report only holds what boot actually paid for.
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        self._clock = clock
+        self._records: list[ImportRecord] = []
+        self._original_import = None
+        # stack of child time (ns) accumulated by the imports currently in progress
+        self._children: list[int] = []
+
+    def install(self) -> None:
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self) -> None:
+        if self._original_import is None:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        depth = len(self._children)
+        self._children.append(0)
+        start = self._clock()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = self._clock() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self._records.append(ImportRecord(name, (elapsed - children) // 1000, elapsed // 1000, depth))
+
+    def report(self, limit: Optional[int] = None) -> list[str]:
+        """Format the recorded imports, slowest cumulative first, like `-X importtime` output."""
+        records = sorted(self._records, key=lambda r: r.cumulative_us, reverse=True)
+        if limit is not None:
+            records = records[:limit]
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for record in records:
+            lines.append(f"import time: {record.self_us:>9} | {record.cumulative_us:>10} | "
+                         f"{'  ' * record.depth}{record.name}")
+        return lines
+
+    @property
+    def records(self) -> list[ImportRecord]:
+        return self._records
+
+    def __enter__(self) -> "ImportTimer":
+        self.install()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.uninstall()
+
+
+class BootPhase(NamedTuple):
+    name: str
+    duration_ms: float
+    elapsed_ms: float
+
+
+class BootTimeline:
+    """
+    Timeline of the phases of robot boot, from `robotInit` to robot code ready
+
+    `mark` closes the phase that has been running since the previous mark. When the
+    `ROBOT_BOOT_PROFILE` environment variable is set, an `ImportTimer` is installed for the
+    duration of boot and its slowest imports are included in the report.
+    """
+
+    REPORT_IMPORT_LIMIT = 25
+
+    def __init__(self, profile_imports: Optional[bool] = None, clock: Callable[[], int] = time.perf_counter_ns):
+        if profile_imports is None:
+            profile_imports = bool(os.environ.get(BOOT_PROFILE_ENV))
+        self._clock = clock
+        self._start = clock()
+        self._last = self._start
+        self._phases: list[BootPhase] = []
+        self._import_timer: Optional[ImportTimer] = None
+        if profile_imports:
+            self._import_timer = ImportTimer(clock)
+            self._import_timer.install()
+
+    def mark(self, name: str) -> BootPhase:
+        """End the current phase, recording how long it took."""
+        now = self._clock()
+        phase = BootPhase(name, (now - self._last) / 1e6, (now - self._start) / 1e6)
+        self._phases.append(phase)
+        self._last = now
+        return phase
+
+    def finish(self) -> list[str]:
+        """Stop profiling imports and log the boot report, returning its lines."""
+        if self._import_timer is not None:
+            self._import_timer.uninstall()
+        lines = self.report()
+        for line in lines:
+            logging.info(line)
+        return lines
+
+    def report(self) -> list[str]:
+        lines = [f"Boot phase {phase.name}: {phase.duration_ms:.1f} ms (at {phase.elapsed_ms:.1f} ms)"
+                 for phase in self._phases]
+        lines.append(f"Boot total: {self.total_ms:.1f} ms")
+        if self._import_timer is not None:
+            lines.extend(self._import_timer.report(self.REPORT_IMPORT_LIMIT))
+        return lines
+
+    @property
+    def phases(self) -> list[BootPhase]:
+        return self._phases
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self._start) / 1e6
+
+    @property
+    def import_timer(self) -> Optional[ImportTimer]:
+        return self._import_timer
@@ -0,0 +1,84 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Optional
+
+from wpimath import inputModulus
+from wpimath.controller import ProfiledPIDController
+from wpimath.trajectory import TrapezoidProfile
+
+from robot_config import TurnControllerConfig
+from util.stopwatch import Stopwatch, TimerService
+
+
+class HeadingController:
+    """
+    Profiled PID control of the robot heading, in degrees
+
+    The heading follows a trapezoid profile towards the goal. A continuous controller treats the
+    heading as an angle, so a turn to an absolute heading always takes the short way around. With
+    `continuous` off headings are not wrapped, so a relative turn past 180 degrees turns all the
+    way. The turn is finished once the heading has stayed within the tolerance for the
+    configured settle time.
+    """
+
+    def __init__(
+            self,
+            config: TurnControllerConfig,
+            tolerance: float,
+            max_output: float,
+            period: float = 0.02,
+            timer: Optional[TimerService] = None,
+            continuous: bool = True,
+    ):
+        self._config = config
+        self._continuous = continuous
+        self._max_output = abs(max_output)
+        self._controller = ProfiledPIDController(
+            config.kp,
+            config.ki,
+            config.kd,
+            TrapezoidProfile.Constraints(config.max_velocity, config.max_acceleration),
+            period,
+        )
+        if continuous:
+            self._controller.enableContinuousInput(-180.0, 180.0)
+        self._controller.setTolerance(tolerance, config.velocity_tolerance)
+        self._settle = Stopwatch(timer)
+
+    @staticmethod
+    def wrap(degrees: float) -> float:
+        """Wrap an angle in degrees into (-180, 180]."""
+        return inputModulus(degrees, -180.0, 180.0)
+
+    def _heading(self, degrees: float) -> float:
+        return self.wrap(degrees) if self._continuous else degrees
+
+    def reset(self, heading: float, goal: float) -> None:
+        """Start a new turn from the current heading towards the goal heading."""
+        self._controller.reset(self._heading(heading))
+        self._controller.setGoal(self._heading(goal))
+        self._settle.stop()
+
+    def set_goal(self, goal: float) -> None:
+        """Move the goal of the turn in progress, the profile carries on from where it is."""
+        self._controller.setGoal(self._heading(goal))
+
+    def calculate(self, heading: float) -> float:
+        """Return the turn speed for the current heading, limited to the maximum output."""
+        output = self._controller.calculate(self._heading(heading))
+        output += self._config.kv * self._controller.getSetpoint().velocity
+        if self._controller.atGoal():
+            if not self._settle.running:
+                self._settle.start()
+        elif self._settle.running:
+            self._settle.stop()
+        return max(-self._max_output, min(self._max_output, output))
+
+    def at_goal(self) -> bool:
+        """True once the heading has stayed at the goal for the settle time."""
+        return self._settle.running and self._settle.elapsed_time_in_secs() >= self._config.settle_time
+
+    @property
+    def controller(self) -> ProfiledPIDController:
+        return self._controller
@@ -0,0 +1,77 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import math
+from typing import Callable, Optional
+
+from wpimath.filter import SlewRateLimiter
+
+from robot_config import AxisShapingConfig
+
+
+def compile_shaper(config: AxisShapingConfig) -> Callable[[float], float]:
+    """
+    Build the stateless part of an axis' shaping into a single function
+
+    Inversion, the dead zone (rescaled so the output still starts at zero and reaches one) and
+    the expo curve are folded into constants once, so shaping a sample is a handful of float
+    operations with no config lookups.
+    """
+    sign = -1.0 if config.inverted else 1.0
+    dead_zone = config.dead_zone
+    scale = 1.0 / (1.0 - dead_zone)
+    cubic = config.expo
+    linear = 1.0 - cubic
+
+    if cubic == 0.0:
+        def shape(value: float) -> float:
+            magnitude = abs(value)
+            if magnitude <= dead_zone:
+                return 0.0
+            return math.copysign(min(1.0, (magnitude - dead_zone) * scale), value * sign)
+    else:
+        def shape(value: float) -> float:
+            magnitude = abs(value)
+            if magnitude <= dead_zone:
+                return 0.0
+            rescaled = min(1.0, (magnitude - dead_zone) * scale)
+            return math.copysign(cubic * rescaled * rescaled * rescaled + linear * rescaled, value * sign)
+    return shape
+
+
+class ShapedAxis:
+    """
+    One controller axis with its input shaping applied
+
+    `sample` polls the controller, shapes the value and slew limits it, and is called once per
+    robot loop. `get` then returns the cached value to every command reading the axis during
+    the loop. Before the first sample (for example a command used on its own) `get` polls and
+    shapes the axis directly, without slew limiting.
+    """
+
+    __slots__ = ("_name", "_read", "_shape", "_slew", "_value", "_sampled")
+
+    def __init__(self, read: Callable[[], float], config: AxisShapingConfig):
+        self._name = config.name
+        self._read = read
+        self._shape = compile_shaper(config)
+        self._slew: Optional[SlewRateLimiter] = SlewRateLimiter(config.slew_rate) if config.slew_rate > 0.0 else None
+        self._value = 0.0
+        self._sampled = False
+
+    def sample(self) -> float:
+        value = self._shape(self._read())
+        if self._slew is not None:
+            value = self._slew.calculate(value)
+        self._value = value
+        self._sampled = True
+        return value
+
+    def get(self) -> float:
+        if self._sampled:
+            return self._value
+        return self._shape(self._read())
+
+    @property
+    def name(self) -> str:
+        return self._name
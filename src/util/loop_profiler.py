@@ -0,0 +1,212 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import functools
+import logging
+import time
+from array import array
+from typing import Callable, Optional
+
+from commands2 import Command, Subsystem
+from wpilib import SmartDashboard
+
+PROFILER_DASHBOARD_PREFIX = "LoopProfiler/"
+PROFILER_DASHBOARD_HISTOGRAM = "LoopProfiler/Loop-Histogram"
+PROFILER_DASHBOARD_OVERRUNS = "LoopProfiler/Loop-Overruns"
+
+NANOS_PER_MILLI = 1_000_000
+NANOS_PER_SEC = 1_000_000_000
+
+
+class PhaseTimer:
+    """Rolling timing statistics for a single phase of the robot loop.
+
+    Samples are kept in a fixed-size ring buffer of nanosecond durations so that
+    recording a sample never allocates. Percentiles are only computed when a
+    summary is requested.
+
+    """
+
+    __slots__ = ("_name", "_size", "_samples", "_index", "_count")
+
+    def __init__(self, name: str, size: int):
+        self._name = name
+        self._size = size
+        self._samples = array("q", bytes(8 * size))
+        self._index = 0
+        self._count = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        """Store a single phase duration in nanoseconds, overwriting the oldest sample when full."""
+        index = self._index
+        self._samples[index] = elapsed_ns
+        index += 1
+        self._index = 0 if index == self._size else index
+        if self._count < self._size:
+            self._count += 1
+
+    def summary(self) -> Optional[tuple[float, float, float, float]]:
+        """Return the (p50, p95, p99, max) of the current window in milliseconds, or None without samples."""
+        count = self._count
+        if count == 0:
+            return None
+        ordered = sorted(self._samples[:count])
+        last = count - 1
+        return (
+            ordered[(last * 50) // 100] / NANOS_PER_MILLI,
+            ordered[(last * 95) // 100] / NANOS_PER_MILLI,
+            ordered[(last * 99) // 100] / NANOS_PER_MILLI,
+            ordered[last] / NANOS_PER_MILLI,
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+
+class LoopProfiler:
+    """Times each phase of the robot loop and publishes a compact summary at a low rate.
+
+    The robot loop calls `begin_loop`, then `mark` after each phase, then `end_loop`.
+    Subsystem `periodic` and command `execute`/`isFinished` calls are timed by
+    wrapping the bound methods on the instances, so the scheduler itself is untouched.
+
+    """
+
+    LOOP_PHASE = "loop"
+    # Upper bounds (in milliseconds) of the loop time histogram buckets, the last bucket is unbounded
+    HISTOGRAM_BUCKETS_MS = (5, 10, 15, 20, 25, 30, 40, 50)
+
+    def __init__(
+            self,
+            period: float = 0.02,
+            window: int = 250,
+            publish_period: float = 1.0,
+            clock: Callable[[], int] = time.perf_counter_ns,
+    ):
+        self._period_ns = int(period * NANOS_PER_SEC)
+        self._window = window
+        self._publish_period_ns = int(publish_period * NANOS_PER_SEC)
+        self._clock = clock
+
+        self._phases: dict[str, PhaseTimer] = {}
+        self._loop_timer = self.phase(LoopProfiler.LOOP_PHASE)
+        self._bucket_bounds_ns = tuple(bound * NANOS_PER_MILLI for bound in LoopProfiler.HISTOGRAM_BUCKETS_MS)
+        self._histogram = array("q", bytes(8 * (len(self._bucket_bounds_ns) + 1)))
+        self._overruns = 0
+        self._published_overruns = 0
+
+        self._loop_start = 0
+        self._last_mark = 0
+        self._last_publish = clock()
+
+    def phase(self, name: str) -> PhaseTimer:
+        """Return the timer for the named phase, creating it the first time it is seen."""
+        timer = self._phases.get(name)
+        if timer is None:
+            timer = PhaseTimer(name, self._window)
+            self._phases[name] = timer
+        return timer
+
+    def begin_loop(self) -> None:
+        """Mark the start of a robot loop iteration."""
+        self._loop_start = self._last_mark = self._clock()
+
+    def mark(self, name: str) -> None:
+        """Record the time since the previous mark (or the start of the loop) against the named phase."""
+        now = self._clock()
+        self.phase(name).record(now - self._last_mark)
+        self._last_mark = now
+
+    def end_loop(self) -> None:
+        """Record the total loop time, update the overrun histogram and publish the summary when due."""
+        now = self._clock()
+        elapsed = now - self._loop_start
+        self._loop_timer.record(elapsed)
+
+        bucket = 0
+        for bound in self._bucket_bounds_ns:
+            if elapsed < bound:
+                break
+            bucket += 1
+        self._histogram[bucket] += 1
+        if elapsed > self._period_ns:
+            self._overruns += 1
+
+        if now - self._last_publish >= self._publish_period_ns:
+            self._last_publish = now
+            self.publish()
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """Wrap a callable so that every call is recorded against the named phase."""
+        timer = self.phase(name)
+        clock = self._clock
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.record(clock() - start)
+
+        return wrapper
+
+    def instrument_subsystem(self, subsystem: Subsystem) -> None:
+        """Time the `periodic` method of a subsystem each time the scheduler runs it."""
+        if hasattr(subsystem.periodic, "__wrapped__"):
+            return
+        subsystem.periodic = self.timed(f"{subsystem.getName()}.periodic", subsystem.periodic)
+
+    def instrument_command(self, command: Command) -> None:
+        """
+        Time the `execute` and `isFinished` methods of a command
+
+        Intended to be registered with `CommandScheduler.onCommandInitialize`, so a command is
+        only instrumented the first time it is scheduled.
+        """
+        if hasattr(command.execute, "__wrapped__"):
+            return
+        name = command.getName()
+        command.execute = self.timed(f"{name}.execute", command.execute)
+        command.isFinished = self.timed(f"{name}.isFinished", command.isFinished)
+
+    def summary(self) -> dict[str, tuple[float, float, float, float]]:
+        """Return the (p50, p95, p99, max) in milliseconds for every phase with samples."""
+        summaries = {}
+        for name, timer in self._phases.items():
+            stats = timer.summary()
+            if stats is not None:
+                summaries[name] = stats
+        return summaries
+
+    def publish(self) -> None:
+        """Publish the per-phase summary, the loop time histogram and the overrun count."""
+        for name, stats in self.summary().items():
+            SmartDashboard.putNumberArray(PROFILER_DASHBOARD_PREFIX + name, stats)
+        SmartDashboard.putNumberArray(PROFILER_DASHBOARD_HISTOGRAM, self._histogram.tolist())
+        SmartDashboard.putNumber(PROFILER_DASHBOARD_OVERRUNS, self._overruns)
+
+        if self._overruns > self._published_overruns:
+            loop_stats = self._loop_timer.summary()
+            logging.warning(
+                "Loop overruns: %d since last summary, loop p99 %.2f ms, max %.2f ms",
+                self._overruns - self._published_overruns, loop_stats[2], loop_stats[3]
+            )
+            self._published_overruns = self._overruns
+
+    @property
+    def histogram(self) -> list[int]:
+        return self._histogram.tolist()
+
+    @property
+    def overruns(self) -> int:
+        return self._overruns
+
+    @property
+    def phases(self) -> dict[str, PhaseTimer]:
+        return self._phases
@@ -0,0 +1,219 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from operator import call
+from typing import Any, Callable, Iterator, Optional
+
+MAGIC = b"R94LOG"
+VERSION = 1
+# header length following the magic and version
+_PREAMBLE = struct.Struct("<6sHI")
+
+
+@dataclass(frozen=True, slots=True)
+class LogField:
+    """One value recorded every loop, `code` is its `struct` format character"""
+    name: str
+    code: str
+    getter: Callable[[], Any]
+
+
+class MatchLogger:
+    """
+    Records one fixed size binary record per robot loop
+
+    Fields are registered once, then `start` freezes the record layout and writes a header
+    describing it. `record` packs every field straight into the next slot of a preallocated ring
+    of blocks. Each full block is handed to a background thread that appends it to the log file,
+    so a slow disk (or USB stick) never stalls the robot loop. A block handed to the writer is
+    never written over until the writer is done with it: when the writer falls a whole ring
+    behind, the block just filled is dropped and counted, and filled again from the next loop.
+    """
+
+    FILE_SUFFIX = ".r94log"
+
+    def __init__(self, block_loops: int = 50, blocks: int = 8):
+        self._block_loops = max(1, block_loops)
+        # one block being filled, one being written and the rest waiting for the writer
+        self._blocks = max(3, blocks)
+        self._fields: list[LogField] = []
+        self._struct: Optional[struct.Struct] = None
+        self._ring: Optional[bytearray] = None
+        self._getters: tuple[Callable[[], Any], ...] = ()
+        self._slot = 0
+        self._records = 0
+        self._dropped = 0
+        # blocks queued for or being written by the writer, cleared by the writer once written
+        self._in_use = [False] * self._blocks
+        self._pending: "queue.Queue[Optional[tuple[int, int, int]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._path: Optional[str] = None
+
+    def add_field(self, name: str, code: str, getter: Callable[[], Any]) -> None:
+        if self._struct is not None:
+            raise RuntimeError("fields can not be added once the match log has started")
+        struct.calcsize("<" + code)
+        self._fields.append(LogField(name, code, getter))
+
+    def start(self, directory: str, metadata: Optional[dict] = None) -> str:
+        """Create the log file in the directory and start the writer, returning the file path."""
+        self._struct = struct.Struct("<" + "".join(field.code for field in self._fields))
+        self._getters = tuple(field.getter for field in self._fields)
+        self._ring = bytearray(self._struct.size * self._block_loops * self._blocks)
+
+        os.makedirs(directory, exist_ok=True)
+        name = time.strftime("match_%Y%m%d_%H%M%S") + self.FILE_SUFFIX
+        self._path = os.path.join(directory, name)
+        header = json.dumps({
+            "format": self._struct.format,
+            "fields": [field.name for field in self._fields],
+            "metadata": metadata or {},
+        }).encode()
+        log_file = open(self._path, "wb")
+        log_file.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        log_file.write(header)
+        log_file.flush()
+        self._writer = threading.Thread(target=self._write_blocks, args=(log_file, memoryview(self._ring)),
+                                        name="MatchLogWriter", daemon=True)
+        self._writer.start()
+        return self._path
+
+    def record(self) -> None:
+        """Pack the current value of every field into the ring, called once per robot loop."""
+        if self._ring is None:
+            return
+        offset = self._slot * self._struct.size
+        self._struct.pack_into(self._ring, offset, *map(call, self._getters))
+        self._slot += 1
+        self._records += 1
+        if self._slot % self._block_loops == 0:
+            if not self._hand_over(self._slot // self._block_loops - 1, self._block_loops):
+                # the writer still has every other block, fill this one again
+                self._dropped += 1
+                self._slot -= self._block_loops
+
+    def flush(self) -> None:
+        """
+        Hand the partially filled block to the writer now, the next loop starts a new block
+
+        Called as the robot is disabled, so the end of a match is on disk without waiting for
+        the block to fill. Kept for the next full block when the writer holds every other block.
+        """
+        if self._ring is None:
+            return
+        partial = self._slot % self._block_loops
+        if partial:
+            self._hand_over(self._slot // self._block_loops, partial)
+
+    def _hand_over(self, block: int, loops: int) -> bool:
+        """Hand the first loops of a block to the writer and move on to the next block, if it is free."""
+        following = block + 1 if block + 1 < self._blocks else 0
+        if self._in_use[following]:
+            return False
+        self._flush_block(block, loops)
+        self._slot = following * self._block_loops
+        return True
+
+    def _flush_block(self, block: int, loops: int) -> None:
+        """Hand the first loops of a block to the writer, the block is not filled again until written."""
+        first = block * self._block_loops * self._struct.size
+        self._in_use[block] = True
+        self._pending.put_nowait((block, first, first + loops * self._struct.size))
+
+    def _write_blocks(self, log_file, ring: memoryview) -> None:
+        with log_file:
+            while True:
+                block = self._pending.get()
+                if block is None:
+                    return
+                index, first, end = block
+                log_file.write(ring[first:end])
+                log_file.flush()
+                self._in_use[index] = False
+                self._pending.task_done()
+
+    def close(self) -> None:
+        """Write the partially filled block and wait for the writer to finish."""
+        if self._writer is None:
+            return
+        partial = self._slot % self._block_loops
+        if partial:
+            self._flush_block(self._slot // self._block_loops, partial)
+        self._pending.put(None)
+        self._writer.join()
+        self._writer = None
+        self._ring = None
+        if self._dropped:
+            logging.warning("Match log dropped %d blocks of %d loops", self._dropped, self._block_loops)
+
+    @property
+    def fields(self) -> list[LogField]:
+        return self._fields
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    @property
+    def records(self) -> int:
+        return self._records
+
+    @property
+    def dropped_blocks(self) -> int:
+        return self._dropped
+
+
+class MatchLog:
+    """A recorded match log, read back record by record"""
+
+    def __init__(self, fields: list[str], record_format: str, metadata: dict, data: bytes):
+        self._fields = fields
+        self._index = {name: i for i, name in enumerate(fields)}
+        self._struct = struct.Struct(record_format)
+        self._metadata = metadata
+        # a log cut short by a power loss ends in a partial record, which is ignored
+        usable = len(data) - len(data) % self._struct.size
+        self._records = list(self._struct.iter_unpack(data[:usable]))
+
+    @staticmethod
+    def read(path: str) -> "MatchLog":
+        with open(path, "rb") as log_file:
+            magic, version, header_length = _PREAMBLE.unpack(log_file.read(_PREAMBLE.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a match log")
+            if version != VERSION:
+                raise ValueError(f"{path} is match log version {version}, expected {VERSION}")
+            header = json.loads(log_file.read(header_length))
+            return MatchLog(header["fields"], header["format"], header["metadata"], log_file.read())
+
+    def index(self, name: str) -> int:
+        return self._index[name]
+
+    def column(self, name: str) -> list:
+        i = self._index[name]
+        return [record[i] for record in self._records]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._records)
+
+    def __getitem__(self, i: int) -> tuple:
+        return self._records[i]
+
+    @property
+    def fields(self) -> list[str]:
+        return self._fields
+
+    @property
+    def metadata(self) -> dict:
+        return self._metadata
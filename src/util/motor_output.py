@@ -0,0 +1,118 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import TYPE_CHECKING, Optional
+
+from wpilib import RobotController
+from wpilib.interfaces import MotorController
+
+from util.sensor_snapshot import SensorReading, SensorSnapshot
+
+if TYPE_CHECKING:
+    from util.power_budget import PowerChannel
+
+BATTERY_SENSOR = "Battery Voltage"
+
+
+def battery_voltage(sensors: SensorSnapshot) -> SensorReading[float]:
+    """The battery voltage, read once per loop and shared by every motor output on the snapshot."""
+    return sensors.add(BATTERY_SENSOR, RobotController.getBatteryVoltage)
+
+
+class VoltageCompensation:
+    """
+    Turns an output given as a fraction of the nominal voltage into the duty cycle that applies
+    that voltage from the battery as sampled at the start of the loop
+
+    A subsystem driven this way does the same whether the battery is fresh or has sagged late in
+    a match, as long as the battery can still supply the nominal voltage. Without a battery
+    reading compensation is off and the output is passed through as a duty cycle.
+    """
+
+    __slots__ = ("_battery", "_nominal_voltage")
+
+    # below this the roboRIO has browned out, and compensation would only multiply noise
+    MIN_VOLTAGE = 6.0
+
+    def __init__(self, battery: Optional[SensorReading[float]], nominal_voltage: float = 12.0):
+        self._battery = battery
+        self._nominal_voltage = nominal_voltage
+
+    @staticmethod
+    def create(sensors: SensorSnapshot, enabled: bool, nominal_voltage: float) -> "VoltageCompensation":
+        """Compensation for a subsystem's config, the battery is only sampled when it is enabled."""
+        return VoltageCompensation(battery_voltage(sensors) if enabled else None, nominal_voltage)
+
+    def duty_cycle(self, output: float) -> float:
+        """The duty cycle applying output x the nominal voltage, not clamped."""
+        if self._battery is None:
+            return output
+        return output * self._nominal_voltage / max(self._battery.get(), self.MIN_VOLTAGE)
+
+    def volts_to_duty_cycle(self, volts: float) -> float:
+        if self._battery is None:
+            return volts / self._nominal_voltage
+        return volts / max(self._battery.get(), self.MIN_VOLTAGE)
+
+    @property
+    def nominal_voltage(self) -> float:
+        return self._nominal_voltage
+
+    @property
+    def enabled(self) -> bool:
+        return self._battery is not None
+
+
+class MotorOutput:
+    """
+    A PWM motor controller set through voltage compensation, None when the motor is disabled
+
+    `set` takes the output as a fraction of the nominal voltage and `set_voltage` takes volts,
+    both clamp the duty cycle to the max output, scale it by the subsystem's share of the power
+    budget and return what was applied. Every call into a motor controller crosses into the HAL,
+    so the motor is only set when the duty cycle changes and `get` returns the one last set.
+    """
+
+    __slots__ = ("_motor", "_compensation", "_max_output", "_power", "_duty_cycle")
+
+    def __init__(
+            self,
+            motor: Optional[MotorController],
+            compensation: VoltageCompensation,
+            max_output: float = 1.0,
+            power: Optional["PowerChannel"] = None,
+    ):
+        self._motor = motor
+        self._compensation = compensation
+        self._max_output = max_output
+        self._power = power
+        self._duty_cycle: Optional[float] = None
+
+    def set(self, output: float) -> float:
+        return self._apply(self._compensation.duty_cycle(output))
+
+    def set_voltage(self, volts: float) -> float:
+        return self._apply(self._compensation.volts_to_duty_cycle(volts))
+
+    def _apply(self, duty_cycle: float) -> float:
+        duty_cycle = max(-self._max_output, min(self._max_output, duty_cycle))
+        if self._motor is None:
+            return 0.0
+        if self._power is not None:
+            duty_cycle *= self._power.request(duty_cycle)
+        if duty_cycle != self._duty_cycle:
+            self._motor.set(duty_cycle)
+            self._duty_cycle = duty_cycle
+        return duty_cycle
+
+    def get(self) -> float:
+        """The duty cycle last set, 0 when the motor is disabled or not yet set."""
+        return self._duty_cycle or 0.0
+
+    @property
+    def motor(self) -> Optional[MotorController]:
+        return self._motor
+
+    @property
+    def compensation(self) -> VoltageCompensation:
+        return self._compensation
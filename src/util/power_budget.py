@@ -0,0 +1,177 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import logging
+from typing import Optional
+
+from wpilib import PowerDistribution
+
+from robot_config import PowerBudgetConfig
+from util.motor_output import battery_voltage
+from util.sensor_snapshot import SensorReading, SensorSnapshot
+from util.telemetry import Telemetry
+
+POWER_DISTRIBUTION_SENSOR = "PDP Total Current"
+
+
+class PowerChannel:
+    """
+    One subsystem's share of the power budget
+
+    The subsystem reports the output it sets each loop with `request`, or both sides of a
+    drivetrain with `request_pair`, and scales them by the returned factor. A channel the budget
+    does not list is never limited.
+    """
+
+    __slots__ = ("_name", "_peak_current", "_demand", "_scale")
+
+    def __init__(self, name: str, peak_current: float = 0.0):
+        self._name = name
+        self._peak_current = peak_current
+        self._demand = 0.0
+        self._scale = 1.0
+
+    def request(self, output: float) -> float:
+        """Estimate the current of this loop's output (the last call wins), returning the scale for it."""
+        self._demand = self._peak_current * abs(output)
+        return self._scale
+
+    def request_pair(self, left: float, right: float) -> float:
+        """As `request`, for a drivetrain whose peak current is shared by its two sides."""
+        self._demand = self._peak_current * (abs(left) + abs(right)) * 0.5
+        return self._scale
+
+    def set_scale(self, scale: float) -> None:
+        """Set the fraction of the requested output the budget allows from the next request."""
+        self._scale = scale
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def demand(self) -> float:
+        """Amps the last requested outputs would draw before scaling."""
+        return self._demand
+
+    @property
+    def scale(self) -> float:
+        return self._scale
+
+
+class PowerBudget:
+    """
+    Keeps the subsystems together under a current budget so heavy driving does not brown out the
+    robot
+
+    `update` is called once per loop after the sensors are sampled. It shares the budget out in
+    priority order against the currents the subsystems requested in the last loop: a subsystem
+    whose request fits keeps full output, the first that does not is scaled down to what is left
+    and everything after it is stopped. The budget shrinks as the sampled battery voltage sags
+    towards brownout, and with a power distribution panel any current the subsystems do not
+    account for (compressor, roboRIO, radio) is taken off the top. Each change to which
+    subsystems are limited is logged.
+    """
+
+    def __init__(
+            self,
+            config: Optional[PowerBudgetConfig] = None,
+            sensors: Optional[SensorSnapshot] = None,
+            telemetry: Optional[Telemetry] = None,
+    ):
+        self._config = config if config is not None else PowerBudgetConfig()
+        sensors = sensors if sensors is not None else SensorSnapshot()
+        telemetry = telemetry if telemetry is not None else Telemetry()
+        self._channels = {name: PowerChannel(name, current) for name, current in self._config.channels}
+        # highest priority first
+        self._priority = list(self._channels.values())
+        self._battery: Optional[SensorReading[float]] = None
+        self._total_current: Optional[SensorReading[float]] = None
+        if self._config.enabled:
+            self._battery = battery_voltage(sensors)
+            if self._config.power_distribution:
+                self._power_distribution = PowerDistribution()
+                self._total_current = sensors.add(POWER_DISTRIBUTION_SENSOR, self._power_distribution.getTotalCurrent)
+        self._available = self._config.total_current
+        self._limited: tuple[str, ...] = ()
+        self._interventions = 0
+        self._available_entry = telemetry.add_number("Power Budget", epsilon=1.0)
+        self._demand_entry = telemetry.add_number("Power Demand", epsilon=1.0)
+        self._limited_entry = telemetry.add_boolean("Power Limited")
+
+    def channel(self, name: str) -> PowerChannel:
+        """The channel of a subsystem, one the budget does not list is added with no current so it is never limited."""
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = PowerChannel(name)
+            self._channels[name] = channel
+        return channel
+
+    def update(self) -> None:
+        """Share the budget out for this loop from the currents requested in the last loop."""
+        if not self._config.enabled:
+            return
+        available = self._budget()
+        if self._total_current is not None:
+            drawn = sum(channel.demand * channel.scale for channel in self._priority)
+            available -= max(0.0, self._total_current.get() - drawn)
+        self._available = available
+        remaining = max(0.0, available)
+        demand = 0.0
+        for channel in self._priority:
+            requested = channel.demand
+            demand += requested
+            if requested <= remaining:
+                channel.set_scale(1.0)
+                remaining -= requested
+            else:
+                channel.set_scale(remaining / requested)
+                remaining = 0.0
+        self._log_intervention(demand)
+        self._available_entry.set(available)
+        self._demand_entry.set(demand)
+
+    def _budget(self) -> float:
+        """The total current, scaled down linearly from the low voltage to nothing at brownout."""
+        config = self._config
+        volts = self._battery.get()
+        if volts >= config.low_voltage:
+            return config.total_current
+        if volts <= config.brownout_voltage:
+            return 0.0
+        return config.total_current * (volts - config.brownout_voltage) / (config.low_voltage - config.brownout_voltage)
+
+    def _log_intervention(self, demand: float) -> None:
+        limited = tuple(channel for channel in self._priority if channel.scale < 1.0)
+        names = tuple(channel.name for channel in limited)
+        if names == self._limited:
+            return
+        if limited:
+            self._interventions += 1
+            logging.warning("Power budget of %.0f A limiting %s, %.0f A requested at %.1f V", self._available,
+                            ", ".join(f"{channel.name} to {channel.scale:.0%}" for channel in limited),
+                            demand, self._battery.get(), extra={"rate_key": "power_budget"})
+        else:
+            logging.info("Power budget no longer limiting %s", ", ".join(self._limited),
+                         extra={"rate_key": "power_budget"})
+        self._limited = names
+        self._limited_entry.set(bool(names))
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    @property
+    def available(self) -> float:
+        """Amps shared out this loop."""
+        return self._available
+
+    @property
+    def limited(self) -> tuple[str, ...]:
+        """The subsystems scaled down this loop, highest priority first."""
+        return self._limited
+
+    @property
+    def interventions(self) -> int:
+        """How many times the budget has started limiting a different set of subsystems."""
+        return self._interventions
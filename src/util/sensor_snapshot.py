@@ -0,0 +1,100 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SensorReading(Generic[T]):
+    """A single sensor registered with a `SensorSnapshot`.
+
+    Once the snapshot has been sampled by the robot loop, `get` returns the value
+    captured at the start of the current loop. Before the first sample (for example
+    a subsystem used on its own) `get` reads the sensor directly.
+
+    """
+
+    __slots__ = ("_name", "_sampler", "_value", "_snapshot")
+
+    def __init__(self, name: str, sampler: Callable[[], T], snapshot: "SensorSnapshot"):
+        self._name = name
+        self._sampler = sampler
+        self._snapshot = snapshot
+        self._value: T = sampler()
+
+    def sample(self) -> T:
+        """Read the physical sensor and cache the value."""
+        self._value = self._sampler()
+        return self._value
+
+    def load(self, value: T) -> T:
+        """Cache a value read elsewhere (a replayed log) instead of the physical sensor."""
+        self._value = value
+        return value
+
+    def get(self) -> T:
+        """Return the value sampled this loop, or a live reading if the snapshot has never been sampled."""
+        if self._snapshot.sampled:
+            return self._value
+        return self._sampler()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+class SensorSnapshot:
+    """
+    Samples every registered sensor exactly once per robot loop
+
+    Subsystems register a sampler for each physical sensor and read the returned `SensorReading`
+    instead of the sensor itself, so every consumer during a loop sees the same value and each
+    sensor is only read once. `sample` is called at the start of `robotPeriodic`, replacing the
+    values from the previous loop.
+
+    A source set with `set_source` replaces the physical sensors, so a recorded match can be
+    replayed through the robot code with the sensor values it saw.
+    """
+
+    def __init__(self):
+        self._readings: dict[str, SensorReading] = {}
+        self._sampled = False
+        self._source: Optional[Callable[[str], Optional[Any]]] = None
+
+    def add(self, name: str, sampler: Callable[[], T]) -> SensorReading[T]:
+        """Register a sensor, returning the existing reading if the name was already registered."""
+        reading = self._readings.get(name)
+        if reading is None:
+            reading = SensorReading(name, sampler, self)
+            self._readings[name] = reading
+        return reading
+
+    def sample(self) -> None:
+        """Read every registered sensor once, the values are held until the next call."""
+        if self._source is None:
+            for reading in self._readings.values():
+                reading.sample()
+        else:
+            for name, reading in self._readings.items():
+                value = self._source(name)
+                if value is None:
+                    reading.sample()
+                else:
+                    reading.load(value)
+        self._sampled = True
+
+    def set_source(self, source: Optional[Callable[[str], Optional[Any]]]) -> None:
+        """
+        Take sensor values from source(name) instead of the sensors, a sensor the source returns
+        None for is still read. None goes back to reading every sensor.
+        """
+        self._source = source
+
+    @property
+    def sampled(self) -> bool:
+        return self._sampled
+
+    @property
+    def readings(self) -> dict[str, SensorReading]:
+        return self._readings
@@ -1,61 +1,123 @@
 import time
-from typing import Optional
+from typing import Callable, Optional
+
+
+def fpga_clock() -> int:
+    """The FPGA timestamp in nanoseconds, this is simulated time when running in simulation."""
+    from wpilib import RobotController
+
+    return RobotController.getFPGATime() * 1000
+
+
+def _default_clock() -> Callable[[], int]:
+    """Use the FPGA timestamp on the robot, and the monotonic clock everywhere else."""
+    from wpilib import RobotBase
+
+    if RobotBase.isReal():
+        return fpga_clock
+    return time.monotonic_ns
+
+
+class TimerService(object):
+    """Provides one shared timestamp per robot loop.
+
+    The robot loop calls `tick` once at its start and `release` at its end. In
+    between, every stopwatch using this service compares against the same cached
+    timestamp instead of reading the clock itself. Outside of the loop the clock
+    is read directly.
+
+    """
+
+    __slots__ = ("_clock", "_now", "_ticked")
+
+    def __init__(self, clock: Optional[Callable[[], int]] = None):
+        """Create a timer service reading the given nanosecond clock."""
+        self._clock = clock if clock is not None else _default_clock()
+        self._now = 0
+        self._ticked = False
+
+    def use_clock(self, clock: Callable[[], int]) -> Callable[[], int]:
+        """Read a different nanosecond clock from now on and return the clock used before."""
+        previous = self._clock
+        self._clock = clock
+        self._ticked = False
+        return previous
+
+    def tick(self) -> int:
+        """Read the clock once for this loop and return the timestamp in nanoseconds."""
+        self._now = self._clock()
+        self._ticked = True
+        return self._now
+
+    def release(self):
+        """End the loop, later reads go back to the clock until the next tick."""
+        self._ticked = False
+
+    def now(self) -> int:
+        """Return the timestamp of this loop, or the current time outside of the loop, in nanoseconds."""
+        if self._ticked:
+            return self._now
+        return self._clock()
+
+
+# shared by every stopwatch unless one is given explicitly, ticked by the robot loop
+timer_service = TimerService()
 
 
 class Stopwatch(object):
     """Provides stopwatch timing functionality.
 
-    This class provides simple time keeping functionality like a stopwatch.
+    This class provides simple time keeping functionality like a stopwatch. Times are
+    integer nanoseconds from a monotonic clock, read through a `TimerService` so that
+    every stopwatch checked during a robot loop sees the same timestamp.
 
     """
 
-    _running: bool = False
-    _start: Optional[float] = None
-    _end: Optional[float] = None
-    _secs: Optional[float] = None
-    _msecs: Optional[float] = None
+    __slots__ = ("_timer", "_start", "_end", "_running")
 
-    def __init__(self):
+    def __init__(self, timer: Optional[TimerService] = None):
         """Create and initialize a Stopwatch."""
-        self._start = None
-        self._end = None
-        self._secs = None
-        self._msecs = None
+        self._timer = timer if timer is not None else timer_service
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
         self._running = False
 
     def start(self):
         """Mark current time as the starting time."""
-        self._start = time.time()
+        self._start = self._timer.now()
         self._running = True
         self._end = None
-        self._secs = None
-        self._msecs = None
 
     def reset(self):
         """Reset the timer to zero.
 
         This doesn't stop the timer, but simply moves the starting
-        time to the current time and clears the end and elapses times.
+        time to the current time and clears the end time.
 
         """
-        self._start = time.time()
+        self._start = self._timer.now()
         self._end = None
-        self._secs = None
-        self._msecs = None
 
     def stop(self):
-        """Mark current time as ending time and calculate duration.
+        """Mark current time as ending time.
 
-        If the stopwatch has been started, mark the current time as the end time
-        and calculate the time difference between the start and end points in
-        both seconds and milliseconds.  If the stopwatch was never started, do
-        nothing.
+        If the stopwatch has been started, mark the current time as the end time.
+        If the stopwatch was never started, do nothing.
 
         """
         if self._running:
-            self._end = time.time()
+            self._end = self._timer.now()
             self._running = False
 
+    def _elapsed_ns(self) -> Optional[int]:
+        if self._start is None:
+            return None
+        if self._running:
+            return self._timer.now() - self._start
+        if self._end is None:
+            return None
+        return self._end - self._start
+
     def elapsed_time_in_secs(self) -> Optional[float]:
         """Return elapsed time in seconds.
 
@@ -64,11 +126,10 @@ class Stopwatch(object):
         as the end time.  If the stopwatch was never started, return None.
 
         """
-        if self._running:
-            self._end = time.time()
-        if self._start and self._end:
-            self._secs = self._end - self._start
-        return self._secs
+        elapsed = self._elapsed_ns()
+        if elapsed is None:
+            return None
+        return elapsed / 1e9
 
     def elapsed_time_in_msecs(self) -> Optional[float]:
         """Return elapsed time in milliseconds.
@@ -79,8 +140,11 @@ class Stopwatch(object):
         return None.
 
         """
-
-        secs = self.elapsed_time_in_secs()
-        if secs:
-            self._msecs = secs * 1000
-        return self._msecs
+        elapsed = self._elapsed_ns()
+        if elapsed is None:
+            return None
+        return elapsed / 1e6
+
+    @property
+    def running(self) -> bool:
+        return self._running
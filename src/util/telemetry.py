@@ -0,0 +1,117 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from typing import Optional, Union
+
+from ntcore import NetworkTable, NetworkTableInstance
+
+
+class TelemetryEntry:
+    """A single dashboard value registered with `Telemetry`.
+
+    Setting the value only stores it, the value is written to NetworkTables when the
+    telemetry is flushed and only if it moved by more than the entry's epsilon since
+    it was last published.
+
+    """
+
+    __slots__ = ("_key", "_value", "_epsilon", "_published", "_publisher")
+
+    def __init__(self, key: str, value: Union[float, bool], epsilon: float):
+        self._key = key
+        self._value = value
+        self._epsilon = epsilon
+        self._published: Optional[Union[float, bool]] = None
+        self._publisher = None
+
+    def set(self, value: Union[float, bool]) -> None:
+        """Stage a value to be published on the next flush."""
+        self._value = value
+
+    def get(self) -> Union[float, bool]:
+        """Return the most recently staged value."""
+        return self._value
+
+    def flush(self, table: NetworkTable) -> bool:
+        """Publish the staged value if it changed beyond epsilon, returning whether a write happened."""
+        value = self._value
+        published = self._published
+        if published is not None and abs(value - published) <= self._epsilon:
+            return False
+        if self._publisher is None:
+            if isinstance(value, bool):
+                self._publisher = table.getBooleanTopic(self._key).publish()
+            else:
+                self._publisher = table.getDoubleTopic(self._key).publish()
+        self._publisher.set(value)
+        self._published = value
+        return True
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def epsilon(self) -> float:
+        return self._epsilon
+
+
+class Telemetry:
+    """
+    Collects dashboard values during the robot loop and publishes them in one batch
+
+    Subsystems register their keys once at construction and set values on the returned entries
+    in their hot paths. `periodic` is called once per robot loop and flushes every `flush_period`
+    loops, writing only the values that changed through cached NetworkTables publishers rather
+    than string keyed SmartDashboard lookups.
+    """
+
+    DEFAULT_TABLE = "SmartDashboard"
+
+    def __init__(self, flush_period: int = 1, table: str = DEFAULT_TABLE):
+        self._flush_period = max(1, flush_period)
+        self._table_name = table
+        self._table: Optional[NetworkTable] = None
+        self._entries: dict[str, TelemetryEntry] = {}
+        self._loops = 0
+
+    def add_number(self, key: str, value: float = 0.0, epsilon: float = 0.0) -> TelemetryEntry:
+        """Register a numeric dashboard key, returning the existing entry if it was already registered."""
+        return self._add(key, float(value), epsilon)
+
+    def add_boolean(self, key: str, value: bool = False) -> TelemetryEntry:
+        """Register a boolean dashboard key, returning the existing entry if it was already registered."""
+        return self._add(key, bool(value), 0.0)
+
+    def _add(self, key: str, value: Union[float, bool], epsilon: float) -> TelemetryEntry:
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = TelemetryEntry(key, value, epsilon)
+            self._entries[key] = entry
+        return entry
+
+    def periodic(self) -> None:
+        """Called once per robot loop, flushes the staged values every `flush_period` loops."""
+        self._loops += 1
+        if self._loops >= self._flush_period:
+            self._loops = 0
+            self.flush()
+
+    def flush(self) -> int:
+        """Publish every staged value that changed, returning the number of values written."""
+        if self._table is None:
+            self._table = NetworkTableInstance.getDefault().getTable(self._table_name)
+        table = self._table
+        written = 0
+        for entry in self._entries.values():
+            if entry.flush(table):
+                written += 1
+        return written
+
+    @property
+    def entries(self) -> dict[str, TelemetryEntry]:
+        return self._entries
+
+    @property
+    def flush_period(self) -> int:
+        return self._flush_period
@@ -0,0 +1,92 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Benchmark the vision pipeline on a recorded video, from the `src` directory
+
+The video is played into the frame ring at its own frame rate (as fast as it decodes with
+`--fast`) by the same capture thread and processing loop the camera process runs, and the
+capture to publish latency and processed FPS are reported:
+
+    python -m vision.benchmark match_camera.mp4 --pipeline hsv
+"""
+import argparse
+import dataclasses
+import statistics
+import time
+
+import cv2
+import ntcore
+import numpy as np
+
+from robot_config import VisionConfig
+from vision.frame_ring import FrameGrabber, FrameRing
+from vision.pipelines import create_pipeline
+from vision.targeting import FrameSkipper
+from vision.vision import CONFIG_PATH, TargetPublisher, now_us, process_frames
+
+
+class VideoSource:
+    """Grabs the frames of a video file like a camera, resized to the configured resolution"""
+
+    def __init__(self, path: str, width: int, height: int, realtime: bool = True):
+        self._capture = cv2.VideoCapture(path)
+        if not self._capture.isOpened():
+            raise ValueError(f"Could not open video {path}")
+        fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self._interval = 1.0 / fps if realtime and fps > 0 else 0.0
+        self._size = (width, height)
+        self._raw = None
+        self._next = time.perf_counter()
+        self.finished = False
+
+    def grab(self, frame: np.ndarray) -> tuple[int, np.ndarray]:
+        ok, self._raw = self._capture.read(self._raw)
+        if not ok:
+            self.finished = True
+            return 0, frame
+        if self._interval:
+            # a camera delivers a frame every interval, however fast the video decodes
+            self._next += self._interval
+            delay = self._next - time.perf_counter()
+            if delay > 0.0:
+                time.sleep(delay)
+        frame = cv2.resize(self._raw, self._size, dst=frame)
+        return now_us(), frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the vision pipeline on a recorded video")
+    parser.add_argument("video", help="video file recorded from the robot camera")
+    parser.add_argument("--config", default=CONFIG_PATH, help="subsystems.ini holding the [Vision] section")
+    parser.add_argument("--pipeline", choices=VisionConfig.PIPELINES, help="override the configured pipeline")
+    parser.add_argument("--fast", action="store_true", help="feed frames as fast as they decode")
+    args = parser.parse_args()
+
+    config = VisionConfig.load(args.config)
+    if args.pipeline:
+        config = dataclasses.replace(config, pipeline=args.pipeline)
+    source = VideoSource(args.video, config.width, config.height, realtime=not args.fast)
+    ring = FrameRing(config.height, config.width)
+    latencies: list[float] = []
+    grabber = FrameGrabber(source.grab, ring, lambda: ring.close() if source.finished else None)
+    skipper = FrameSkipper(config.process_fps, config.cpu_budget)
+
+    start = time.perf_counter()
+    grabber.start()
+    process_frames(ring, create_pipeline(config), TargetPublisher(ntcore.NetworkTableInstance.create()), skipper,
+                   on_published=latencies.append)
+    elapsed = time.perf_counter() - start
+
+    print(f"{config.pipeline} pipeline at {config.width}x{config.height}, {elapsed:.1f}s")
+    print(f"  captured {ring.captured} frames ({ring.captured / elapsed:.1f} fps), processed {len(latencies)} "
+          f"({len(latencies) / elapsed:.1f} fps), skipped {skipper.skipped}, dropped {ring.dropped}")
+    if len(latencies) >= 2:
+        milliseconds = sorted(latency * 1000.0 for latency in latencies)
+        p99 = milliseconds[min(len(milliseconds) - 1, int(0.99 * len(milliseconds)))]
+        print(f"  capture to publish latency: mean {statistics.fmean(milliseconds):.1f} ms, "
+              f"p50 {statistics.median(milliseconds):.1f} ms, p99 {p99:.1f} ms, max {milliseconds[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    A fixed ring of preallocated frames handed from the capture thread to the processing loop
+
+    The capture thread grabs each frame straight into a free slot and commits it as the latest
+    frame. The processing loop always takes the latest frame, so a frame that was not taken before
+    the next one arrived is dropped (counted) rather than queued, and processing never works on a
+    stale frame. Slots are never copied: with three slots there is always one free to capture into
+    while one holds the latest frame and the processing loop reads a third.
+    """
+
+    def __init__(self, height: int, width: int, slots: int = 3):
+        if slots < 3:
+            raise ValueError(f"a frame ring needs at least 3 slots, got {slots}")
+        self._frames = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(slots)]
+        self._timestamps = [0] * slots
+        self._condition = threading.Condition()
+        self._latest = -1
+        self._reading = -1
+        self._writing = -1
+        self._next = 0
+        self._captured = 0
+        self._dropped = 0
+        self._closed = False
+
+    def acquire_write(self) -> tuple[int, np.ndarray]:
+        """The next free slot and its frame, for the capture thread to grab into."""
+        with self._condition:
+            slot = self._next
+            while slot == self._latest or slot == self._reading:
+                slot = (slot + 1) % len(self._frames)
+            self._next = (slot + 1) % len(self._frames)
+            self._writing = slot
+            return slot, self._frames[slot]
+
+    def commit(self, slot: int, timestamp: int, frame: Optional[np.ndarray] = None) -> None:
+        """
+        Make a captured slot the latest frame, dropping a latest frame that was never taken
+
+        :param frame: the captured frame when the grabber had to replace the slot's array
+        """
+        with self._condition:
+            if frame is not None:
+                self._frames[slot] = frame
+            if self._latest >= 0:
+                self._dropped += 1
+            self._latest = slot
+            self._timestamps[slot] = timestamp
+            self._writing = -1
+            self._captured += 1
+            self._condition.notify()
+
+    def abort_write(self, slot: int) -> None:
+        """Give back a slot the capture failed for."""
+        with self._condition:
+            if self._writing == slot:
+                self._writing = -1
+
+    def take_latest(self, timeout: Optional[float] = None) -> Optional[tuple[int, np.ndarray, int]]:
+        """
+        Wait for a frame newer than the last one taken and take it as (slot, frame, timestamp),
+        None on timeout or once the ring is closed. The slot must be released once processed.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._latest >= 0 or self._closed, timeout):
+                return None
+            if self._latest < 0:
+                return None
+            slot = self._latest
+            self._latest = -1
+            self._reading = slot
+            return slot, self._frames[slot], self._timestamps[slot]
+
+    def release(self, slot: int) -> None:
+        with self._condition:
+            if self._reading == slot:
+                self._reading = -1
+
+    def close(self) -> None:
+        """Wake the processing loop and stop handing out frames."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def captured(self) -> int:
+        return self._captured
+
+    @property
+    def dropped(self) -> int:
+        """Frames replaced by a newer frame before the processing loop took them."""
+        return self._dropped
+
+
+class FrameGrabber(threading.Thread):
+    """
+    Captures frames into the ring until it is closed
+
+    :param grab: grabs into the given frame and returns (capture time in us, frame), a capture
+                 time of 0 is a failed grab, like `CvSink.grabFrame`
+    """
+
+    def __init__(self, grab: Callable[[np.ndarray], tuple[int, np.ndarray]], ring: FrameRing,
+                 on_error: Optional[Callable[[], None]] = None):
+        super().__init__(name="FrameGrabber", daemon=True)
+        self._grab = grab
+        self._ring = ring
+        self._on_error = on_error
+
+    def run(self) -> None:
+        while not self._ring.closed:
+            slot, frame = self._ring.acquire_write()
+            capture_us, grabbed = self._grab(frame)
+            if capture_us == 0:
+                self._ring.abort_write(slot)
+                if self._on_error is not None:
+                    self._on_error()
+                continue
+            self._ring.commit(slot, capture_us, grabbed if grabbed is not frame else None)
@@ -0,0 +1,87 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Target detection run by the camera process, never imported by the robot code
+
+Every image buffer a pipeline needs is allocated once for the configured resolution, OpenCV
+writes into them through `dst` so processing a frame allocates no new images. The returned
+image is used in case OpenCV had to reallocate (a camera ignoring the configured resolution).
+"""
+import math
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from robot_config import VisionConfig
+from vision.targeting import CameraModel, Target
+
+# BGR
+ANNOTATION_COLOR = (0, 255, 0)
+
+
+class HsvPipeline:
+    """Finds the largest blob of pixels between two HSV colours (an orange note)"""
+
+    def __init__(self, config: VisionConfig, model: CameraModel):
+        self._model = model
+        self._lower = np.array(config.hsv_lower, dtype=np.uint8)
+        self._upper = np.array(config.hsv_upper, dtype=np.uint8)
+        self._min_area = config.min_area
+        self._hsv = np.zeros((config.height, config.width, 3), dtype=np.uint8)
+        self._mask = np.zeros((config.height, config.width), dtype=np.uint8)
+
+    def process(self, frame: np.ndarray) -> Optional[Target]:
+        self._hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._hsv)
+        self._mask = cv2.inRange(self._hsv, self._lower, self._upper, dst=self._mask)
+        contours, _ = cv2.findContours(self._mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return None
+        largest = max(contours, key=cv2.contourArea)
+        moments = cv2.moments(largest)
+        if moments["m00"] < self._min_area:
+            return None
+        return self._model.target(moments["m10"] / moments["m00"], moments["m01"] / moments["m00"])
+
+
+class AprilTagPipeline:
+    """Finds AprilTags, the target is the tag detected with the most confidence"""
+
+    def __init__(self, config: VisionConfig, model: CameraModel):
+        # only the camera process loads the detector
+        import robotpy_apriltag
+
+        self._model = model
+        self._detector = robotpy_apriltag.AprilTagDetector()
+        if not self._detector.addFamily(config.tag_family):
+            raise ValueError(f"Unknown AprilTag family {config.tag_family}")
+        cx, cy = model.center
+        self._estimator = robotpy_apriltag.AprilTagPoseEstimator(robotpy_apriltag.AprilTagPoseEstimator.Config(
+            config.tag_size, model.focal_length, model.focal_length, cx, cy))
+        self._gray = np.zeros((config.height, config.width), dtype=np.uint8)
+
+    def process(self, frame: np.ndarray) -> Optional[Target]:
+        self._gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        detections = self._detector.detect(self._gray)
+        if not detections:
+            return None
+        best = max(detections, key=lambda detection: detection.getDecisionMargin())
+        center = best.getCenter()
+        distance = self._estimator.estimate(best).translation().norm()
+        return self._model.target(center.x, center.y, distance if math.isfinite(distance) else math.nan,
+                                  best.getId())
+
+
+def create_pipeline(config: VisionConfig, model: Optional[CameraModel] = None):
+    """The configured pipeline, each has `process(frame) -> Optional[Target]`."""
+    model = model if model is not None else CameraModel.from_config(config)
+    if config.pipeline == "hsv":
+        return HsvPipeline(config, model)
+    return AprilTagPipeline(config, model)
+
+
+def annotate(frame: np.ndarray, target: Optional[Target]) -> None:
+    """Mark the target on the frame streamed to the dashboard, in place."""
+    if target is not None:
+        cv2.drawMarker(frame, (round(target.x), round(target.y)), ANNOTATION_COLOR, cv2.MARKER_CROSS, 20, 2)
@@ -0,0 +1,148 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Camera geometry and scheduling shared by the vision pipelines
+
+Only the standard library is used here, never `wpilib` or OpenCV, so this runs in the camera
+process (and in tests without a camera or OpenCV).
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from robot_config import VisionConfig
+
+# NetworkTables table the camera process publishes to
+VISION_TABLE = "Vision"
+# [capture time (robot FPGA seconds), yaw, pitch, distance, tag id] of the latest target
+TARGET_TOPIC = "target"
+HAS_TARGET_TOPIC = "has_target"
+FPS_TOPIC = "fps"
+# milliseconds from capturing a frame to publishing its result
+LATENCY_TOPIC = "latency"
+
+
+@dataclass(frozen=True, slots=True)
+class Target:
+    """
+    A target seen in one frame
+
+    Angles are in degrees from the center of the image, yaw counter-clockwise positive (a target
+    left of center) like every other robot heading, pitch positive above center.
+    """
+    yaw: float
+    pitch: float
+    # meters from the camera, nan when it can not be estimated
+    distance: float
+    # pixel position of the target center
+    x: float
+    y: float
+    # tag id, -1 for the hsv pipeline
+    id: int = -1
+
+
+class CameraModel:
+    """
+    A pinhole camera with square pixels, converting pixel positions to angles
+
+    The focal length comes from the image width and horizontal field of view. The distance to a
+    target at a known height follows from its pitch and the camera's height and tilt.
+    """
+
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            horizontal_fov: float,
+            camera_height: float = 0.0,
+            camera_pitch: float = 0.0,
+            target_height: float = 0.0,
+    ):
+        self._cx = (width - 1) / 2.0
+        self._cy = (height - 1) / 2.0
+        self._focal_length = (width / 2.0) / math.tan(math.radians(horizontal_fov) / 2.0)
+        self._height_difference = target_height - camera_height
+        self._camera_pitch = camera_pitch
+
+    @staticmethod
+    def from_config(config: VisionConfig) -> "CameraModel":
+        return CameraModel(config.width, config.height, config.horizontal_fov, config.camera_height,
+                           config.camera_pitch, config.target_height)
+
+    def yaw(self, x: float) -> float:
+        return math.degrees(math.atan2(self._cx - x, self._focal_length))
+
+    def pitch(self, y: float) -> float:
+        return math.degrees(math.atan2(self._cy - y, self._focal_length))
+
+    def distance(self, pitch: float) -> float:
+        """Floor distance to a target at the configured height seen at the given pitch, nan if it can not be."""
+        tangent = math.tan(math.radians(self._camera_pitch + pitch))
+        if self._height_difference == 0.0 or tangent == 0.0 or (self._height_difference > 0.0) != (tangent > 0.0):
+            return math.nan
+        return self._height_difference / tangent
+
+    def target(self, x: float, y: float, distance: float = math.nan, id: int = -1) -> Target:
+        """A target at a pixel position, its distance estimated from its pitch unless given."""
+        pitch = self.pitch(y)
+        if math.isnan(distance):
+            distance = self.distance(pitch)
+        return Target(self.yaw(x), pitch, distance, x, y, id)
+
+    @property
+    def focal_length(self) -> float:
+        """Pixels."""
+        return self._focal_length
+
+    @property
+    def center(self) -> tuple[float, float]:
+        return self._cx, self._cy
+
+
+class FrameSkipper:
+    """
+    Decides which camera frames to process so vision stays inside its CPU budget
+
+    A frame is processed once the interval since the last processed frame has passed. The interval
+    is the longer of 1 / max_fps and the (smoothed) time processing takes divided by the share of a
+    core vision may use, so a slow pipeline processes fewer frames instead of starving the robot
+    code. Frames in between are skipped without being processed.
+    """
+
+    # weight of the latest processing time in the smoothed processing time
+    SMOOTHING = 0.2
+    # share of the interval a frame may arrive early by, so capture jitter does not skip it
+    JITTER = 0.1
+
+    def __init__(self, max_fps: float, cpu_budget: float = 1.0):
+        self._min_interval = 1.0 / max_fps
+        self._cpu_budget = cpu_budget
+        self._processing_time: Optional[float] = None
+        self._interval = self._min_interval
+        self._last = -math.inf
+        self._skipped = 0
+
+    def should_process(self, timestamp: float) -> bool:
+        """Whether to process the frame captured at timestamp (seconds)."""
+        if timestamp - self._last < self._interval * (1.0 - self.JITTER):
+            self._skipped += 1
+            return False
+        self._last = timestamp
+        return True
+
+    def processed(self, duration: float) -> None:
+        """Report how long processing the last frame took (seconds)."""
+        if self._processing_time is None:
+            self._processing_time = duration
+        else:
+            self._processing_time += self.SMOOTHING * (duration - self._processing_time)
+        self._interval = max(self._min_interval, self._processing_time / self._cpu_budget)
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def skipped(self) -> int:
+        return self._skipped
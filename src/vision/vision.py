@@ -1,31 +1,134 @@
-import cv2
-import numpy as np
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+The camera process, launched by the robot through the CameraServer when vision is enabled
+
+A capture thread grabs frames at the configured resolution and FPS into a ring of preallocated
+frames, while the processing loop works on the latest one. The frame skipper picks the frames
+the pipeline has CPU budget for, and each result is published to the `Vision` NetworkTables
+table stamped with the time its frame was captured, along with the capture to publish latency.
+
+**Never import `wpilib` here**, cscore and wpilib must not share a process.
+"""
+import logging
+import os
+import time
+from typing import Callable, Optional
+
+import ntcore
 from cscore import CameraServer as CS
 
+from robot_config import VisionConfig
+from vision.frame_ring import FrameGrabber, FrameRing
+from vision.pipelines import annotate, create_pipeline
+from vision.targeting import (FPS_TOPIC, HAS_TARGET_TOPIC, LATENCY_TOPIC, TARGET_TOPIC, VISION_TABLE, FrameSkipper,
+                              Target)
 
-def start_camera():
-    CS.enableLogging()
-    usb_camera = CS.startAutomaticCapture()
-    usb_camera.setResolution(320, 420)
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "configs", "subsystems.ini")
 
-    cv_sink = CS.getVideo()
 
-    output_stream = CS.putVideo("Rectangle", 320, 420)
+def now_us() -> int:
+    """wpi::Now in microseconds, the clock cscore stamps captured frames with."""
+    return ntcore._now()
+
+
+class TargetPublisher:
+    """
+    Publishes each processed frame's target to NetworkTables
+
+    The target is one array so the robot always reads a yaw, pitch and distance from the same
+    frame. The capture time is converted from this process' clock to the robot's (the server's)
+    and is also the timestamp of the published values.
+    """
+
+    def __init__(self, instance: Optional[ntcore.NetworkTableInstance] = None, clock: Callable[[], int] = now_us):
+        self._nt = instance if instance is not None else ntcore.NetworkTableInstance.getDefault()
+        self._clock = clock
+        table = self._nt.getTable(VISION_TABLE)
+        self._target = table.getDoubleArrayTopic(TARGET_TOPIC).publish(ntcore.PubSubOptions(sendAll=True))
+        self._has_target = table.getBooleanTopic(HAS_TARGET_TOPIC).publish()
+        self._fps = table.getDoubleTopic(FPS_TOPIC).publish()
+        self._latency = table.getDoubleTopic(LATENCY_TOPIC).publish()
+        self._values = [0.0] * 5
+        self._processed = 0
+        self._window_start = time.monotonic()
 
-    img = np.zeros(shape=(420, 320, 3), dtype=np.uint8)
+    def publish(self, capture_us: int, target: Optional[Target]) -> float:
+        """Publish the result of the frame captured at capture_us, returning the capture to publish latency in seconds."""
+        self._has_target.set(target is not None, capture_us)
+        if target is not None:
+            offset = self._nt.getServerTimeOffset()
+            self._values[0] = (capture_us + (offset or 0)) / 1e6
+            self._values[1] = target.yaw
+            self._values[2] = target.pitch
+            self._values[3] = target.distance
+            self._values[4] = target.id
+            self._target.set(self._values, capture_us)
+        latency = (self._clock() - capture_us) / 1e6
+        self._latency.set(latency * 1000.0, capture_us)
+        self._processed += 1
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._fps.set(self._processed / (now - self._window_start))
+            self._processed = 0
+            self._window_start = now
+        return latency
 
+
+def process_frames(
+        ring: FrameRing,
+        pipeline,
+        publisher: TargetPublisher,
+        skipper: FrameSkipper,
+        output_stream=None,
+        on_published: Optional[Callable[[float], None]] = None,
+) -> None:
+    """
+    Process the latest frame of the ring until it is closed, publishing each result
+
+    :param on_published: called with the capture to publish latency (seconds) of each result
+    """
     while True:
-        time, img = cv_sink.grabFrame(img)
-        if time == 0:
-            output_stream.notifyError(cv_sink.getError())
-            continue
-        cv2.rectangle(img, (100, 100), (300, 300), (255, 255, 255), 5)
-        output_stream.putFrame(img)
+        taken = ring.take_latest()
+        if taken is None:
+            return
+        slot, frame, capture_us = taken
+        try:
+            if not skipper.should_process(capture_us / 1e6):
+                continue
+            start = time.perf_counter()
+            target = pipeline.process(frame)
+            skipper.processed(time.perf_counter() - start)
+            latency = publisher.publish(capture_us, target)
+            if on_published is not None:
+                on_published(latency)
+            if output_stream is not None:
+                annotate(frame, target)
+                output_stream.putFrame(frame)
+        finally:
+            ring.release(slot)
 
 
-if __name__ == "__main__":
-    import logging
+def start_camera(config_path: str = CONFIG_PATH) -> None:
+    config = VisionConfig.load(config_path)
+    CS.enableLogging()
+    usb_camera = CS.startAutomaticCapture()
+    usb_camera.setResolution(config.width, config.height)
+    usb_camera.setFPS(config.fps)
 
+    cv_sink = CS.getVideo()
+    output_stream = CS.putVideo("Vision", config.width, config.height) if config.stream else None
+
+    ring = FrameRing(config.height, config.width)
+    on_error = (lambda: output_stream.notifyError(cv_sink.getError())) if output_stream is not None else None
+    FrameGrabber(cv_sink.grabFrame, ring, on_error).start()
+    logging.info("Vision %s pipeline at %dx%d %d fps", config.pipeline, config.width, config.height, config.fps)
+    process_frames(ring, create_pipeline(config), TargetPublisher(),
+                   FrameSkipper(config.process_fps, config.cpu_budget), output_stream)
+
+
+if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
 
     # You should uncomment these to connect to the RoboRIO
@@ -0,0 +1,133 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+"""
+Timing of the code that runs every robot loop, compared with stored baselines
+
+The benchmarks only run when the `ROBOT_BENCHMARK` environment variable is set, from the `src`
+directory in the HAL simulator:
+
+    ROBOT_BENCHMARK=check python -m robotpy test -- ../tests/benchmarks
+    ROBOT_BENCHMARK=save python -m robotpy test -- ../tests/benchmarks
+
+`check` fails a benchmark whose fastest round is more than `ROBOT_BENCHMARK_THRESHOLD` (0.25 is 25%)
+slower than its baseline, `save` records every benchmark as the new baseline. Baselines depend on the
+machine, save them on the machine that runs the check.
+"""
+import json
+import math
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+BENCHMARK_ENV = "ROBOT_BENCHMARK"
+THRESHOLD_ENV = "ROBOT_BENCHMARK_THRESHOLD"
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+
+class Benchmark:
+    """
+    Times a callable like pytest-benchmark: calls are batched into rounds long enough for the clock
+    to resolve them. The fastest round is what is compared, other processes and the garbage
+    collector only ever make a round slower, so it varies far less between runs than the median
+    """
+    WARMUP_ROUNDS = 5
+    ROUNDS = 50
+    MIN_ROUND_NS = 1_000_000
+
+    def __init__(self, name: str, baselines: "Baselines"):
+        self.name = name
+        self.timings: list[float] = []
+        self._baselines = baselines
+
+    def __call__(self, function: Callable[..., Any], *args) -> Any:
+        iterations = self._calibrate(function, args)
+        for _ in range(self.WARMUP_ROUNDS):
+            self._round(function, args, iterations)
+        self.timings = [self._round(function, args, iterations) / iterations for _ in range(self.ROUNDS)]
+        self._baselines.check(self)
+        return function(*args)
+
+    def _calibrate(self, function: Callable[..., Any], args: tuple) -> int:
+        iterations = 1
+        while self._round(function, args, iterations) < self.MIN_ROUND_NS and iterations < 1_000_000:
+            iterations *= 2
+        return iterations
+
+    @staticmethod
+    def _round(function: Callable[..., Any], args: tuple, iterations: int) -> int:
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            function(*args)
+        return time.perf_counter_ns() - start
+
+    @property
+    def fastest(self) -> float:
+        """Nanoseconds per call in the fastest round."""
+        return min(self.timings) if self.timings else math.nan
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings) if self.timings else math.nan
+
+
+class Baselines:
+    """The fastest round of each benchmark when the baselines were saved, in nanoseconds per call"""
+
+    def __init__(self, path: Path, threshold: float, saving: bool):
+        self._path = path
+        self._threshold = threshold
+        self._saving = saving
+        self._baselines: dict[str, float] = json.loads(path.read_text()) if path.exists() else {}
+        self._measured: dict[str, float] = {}
+
+    def check(self, benchmark: Benchmark) -> None:
+        self._measured[benchmark.name] = benchmark.fastest
+        baseline = self._baselines.get(benchmark.name)
+        if baseline is None or self._saving:
+            return
+        limit = baseline * (1.0 + self._threshold)
+        if benchmark.fastest > limit:
+            pytest.fail(f"{benchmark.name} regressed: {benchmark.fastest / 1000.0:.2f} us, "
+                        f"baseline {baseline / 1000.0:.2f} us (limit {limit / 1000.0:.2f} us)")
+
+    def save(self) -> None:
+        baselines = {**self._baselines, **{name: round(ns, 1) for name, ns in self._measured.items()}}
+        self._path.write_text(json.dumps(dict(sorted(baselines.items())), indent=2) + "\n")
+
+    def report(self) -> list[str]:
+        lines = []
+        for name, ns in self._measured.items():
+            baseline = self._baselines.get(name)
+            change = f"{(ns / baseline - 1.0) * 100.0:+.0f}%" if baseline else "new"
+            lines.append(f"{name:<40} {ns / 1000.0:>9.2f} us  {change}")
+        return lines
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if os.environ.get(BENCHMARK_ENV):
+        return
+    skip = pytest.mark.skip(reason=f"set {BENCHMARK_ENV}=check (or save) to run the benchmarks")
+    here = Path(__file__).parent
+    for item in items:
+        if here in Path(item.fspath).parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    saving = os.environ.get(BENCHMARK_ENV) == "save"
+    baselines = Baselines(BASELINES_PATH, float(os.environ.get(THRESHOLD_ENV, "0.25")), saving)
+    yield baselines
+    print("\n" + "\n".join(baselines.report()))
+    if saving:
+        baselines.save()
+
+
+@pytest.fixture(scope="function")
+def benchmark(request: pytest.FixtureRequest, baselines: Baselines) -> Benchmark:
+    return Benchmark(request.node.name, baselines)
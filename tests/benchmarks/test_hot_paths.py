@@ -0,0 +1,92 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from configparser import ConfigParser
+
+import pytest
+from commands2 import CommandScheduler
+from wpilib.simulation import DriverStationSim
+
+from commands.tank_drive_commands import TankDrive
+from oi import OI
+from robot_controller import RobotController
+from subsystems.climber import Climber
+from subsystems.drivetrain import Drivetrain
+from util.stopwatch import Stopwatch, timer_service
+
+SUBSYSTEMS_CONFIG_PATH = "./test_configs/subsystems_default.ini"
+JOYSTICK_CONFIG_PATH = "./test_configs/joysticks_default.ini"
+AUTONOMOUS_CONFIG_PATH = "./test_configs/autonomous_default.ini"
+
+
+@pytest.fixture(scope="function")
+def drivetrain() -> Drivetrain:
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+    return Drivetrain(config)
+
+
+@pytest.fixture(scope="function")
+def oi() -> OI:
+    config = ConfigParser()
+    config.read(JOYSTICK_CONFIG_PATH)
+    return OI(config)
+
+
+@pytest.fixture(scope="function")
+def robot_controller():
+    controller = RobotController(SUBSYSTEMS_CONFIG_PATH, JOYSTICK_CONFIG_PATH, AUTONOMOUS_CONFIG_PATH)
+    yield controller
+    CommandScheduler.resetInstance()
+
+
+def test_tank_drive_execute(benchmark, oi: OI, drivetrain: Drivetrain):
+    command = TankDrive(oi, drivetrain)
+    benchmark(command.execute)
+
+
+def test_drivetrain_tank_drive(benchmark, drivetrain: Drivetrain):
+    benchmark(drivetrain.tank_drive, 0.5, -0.5)
+
+
+def test_drivetrain_arcade_drive(benchmark, drivetrain: Drivetrain):
+    benchmark(drivetrain.arcade_drive, 0.5, 0.25)
+
+
+def test_climber_move_winch(benchmark):
+    config = ConfigParser()
+    config.read(SUBSYSTEMS_CONFIG_PATH)
+    climber = Climber(config)
+    benchmark(climber.move_winch, 0.5)
+
+
+def test_stopwatch_elapsed_time(benchmark):
+    stopwatch = Stopwatch()
+    stopwatch.start()
+    benchmark(stopwatch.elapsed_time_in_secs)
+
+
+def test_robot_controller_update_sensors(benchmark, robot_controller: RobotController):
+    robot_controller.sample_sensors()
+    benchmark(robot_controller.update_sensors)
+
+
+def test_scheduler_run(benchmark, robot_controller: RobotController):
+    # given: teleop enabled with every default command scheduled
+    DriverStationSim.setEnabled(True)
+    DriverStationSim.setAutonomous(False)
+    DriverStationSim.notifyNewData()
+    robot_controller.mappings()
+
+    def loop():
+        timer_service.tick()
+        robot_controller.sample_sensors()
+        CommandScheduler.getInstance().run()
+        timer_service.release()
+
+    loop()
+    scheduler = CommandScheduler.getInstance()
+    assert scheduler.isScheduled(scheduler.getDefaultCommand(robot_controller.drivetrain))
+    benchmark(loop)
+    DriverStationSim.setEnabled(False)
+    DriverStationSim.notifyNewData()
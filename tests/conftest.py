@@ -0,0 +1,30 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+
+from util.loop_profiler import NANOS_PER_MILLI
+
+
+class FakeClock:
+    """A clock for a `TimerService` or profiler that only moves when the test moves it, in nanoseconds"""
+
+    def __init__(self, now: int = 0):
+        self.now = now
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance_ms(self, millis: float) -> None:
+        self.now += int(millis * NANOS_PER_MILLI)
+
+
+@pytest.fixture(scope="function")
+def fake_clock_start() -> int:
+    """Time the fake clock starts at, override it in a test module to start elsewhere"""
+    return 0
+
+
+@pytest.fixture(scope="function")
+def fake_clock(fake_clock_start: int) -> FakeClock:
+    return FakeClock(fake_clock_start)
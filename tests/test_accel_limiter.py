@@ -0,0 +1,63 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+
+from tests.conftest import FakeClock
+from util.accel_limiter import AccelLimiter
+from util.stopwatch import TimerService
+
+PERIOD_NS = 20_000_000
+
+
+def run(limiter: AccelLimiter, clock: FakeClock, target: float, loops: int) -> list[float]:
+    outputs = []
+    for _ in range(loops):
+        outputs.append(limiter.calculate(target))
+        clock.now += PERIOD_NS
+    return outputs
+
+
+def test_accelerates_at_accel_rate(fake_clock: FakeClock):
+    limiter = AccelLimiter(2.0, 5.0, TimerService(fake_clock))
+
+    outputs = run(limiter, fake_clock, 1.0, 30)
+
+    # then: 0.04 more each 20 ms loop until it reaches the target
+    assert outputs[:3] == pytest.approx([0.04, 0.08, 0.12])
+    assert outputs[-1] == 1.0
+
+
+def test_decelerates_at_decel_rate(fake_clock: FakeClock):
+    limiter = AccelLimiter(2.0, 5.0, TimerService(fake_clock))
+    limiter.reset(-1.0)
+
+    outputs = run(limiter, fake_clock, -0.5, 3)
+
+    assert outputs == pytest.approx([-0.9, -0.8, -0.7])
+
+
+def test_reversal_stops_before_speeding_up(fake_clock: FakeClock):
+    limiter = AccelLimiter(1.0, 10.0, TimerService(fake_clock))
+    limiter.reset(0.3)
+
+    outputs = run(limiter, fake_clock, -1.0, 4)
+
+    # then: decelerates to a stop at the decel rate, then pulls away at the accel rate
+    assert outputs == pytest.approx([0.1, 0.0, -0.02, -0.04])
+
+
+def test_zero_rate_is_unlimited(fake_clock: FakeClock):
+    limiter = AccelLimiter(0.0, 0.0, TimerService(fake_clock))
+
+    assert limiter.calculate(1.0) == 1.0
+    assert limiter.calculate(-1.0) == -1.0
+
+
+def test_calls_in_one_loop_start_from_the_same_output(fake_clock: FakeClock):
+    limiter = AccelLimiter(2.0, 2.0, TimerService(fake_clock))
+    run(limiter, fake_clock, 0.5, 5)
+
+    # when: a second command overrides the output in the same loop
+    limiter.calculate(1.0)
+    assert limiter.calculate(0.0) == pytest.approx(0.16)
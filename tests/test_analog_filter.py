@@ -0,0 +1,77 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+from wpilib.simulation import AnalogInputSim
+
+from robot_config import AnalogFilterConfig, ConfigError
+from util.analog_filter import FilteredPotentiometer
+from util.sensor_snapshot import SensorSnapshot
+
+CHANNEL = 3
+
+
+def pot_of(filter: str, window: int = 3, **kwargs) -> FilteredPotentiometer:
+    # 0 V to 5 V reads as 0 to 500
+    return FilteredPotentiometer(CHANNEL, 500.0, 0.0, AnalogFilterConfig("Test", filter=filter, window=window, **kwargs))
+
+
+def feed(pot: FilteredPotentiometer, volts: list[float]) -> list[float]:
+    positions = []
+    for volt in volts:
+        AnalogInputSim(CHANNEL).setVoltage(volt)
+        positions.append(pot.sample())
+    return positions
+
+
+def test_median_rejects_spike():
+    pot = pot_of("median")
+
+    positions = feed(pot, [1.0, 1.0, 4.0, 1.0, 1.2])
+
+    # then: a single loop's spike never reaches the filtered position
+    assert positions == pytest.approx([100.0, 100.0, 100.0, 100.0, 120.0])
+
+
+def test_average_smooths_noise():
+    pot = pot_of("average", window=2)
+
+    positions = feed(pot, [1.0, 1.0, 2.0])
+
+    assert positions[-1] == pytest.approx(150.0)
+
+
+def test_no_filter_passes_reading_through():
+    pot = pot_of("none")
+
+    assert feed(pot, [1.0, 3.0]) == pytest.approx([100.0, 300.0])
+
+
+def test_sampling_bits_set_on_input():
+    pot = pot_of("none", oversample_bits=2, average_bits=5)
+
+    assert pot._input.getOversampleBits() == 2
+    assert pot._input.getAverageBits() == 5
+
+
+def test_filtered_once_per_loop():
+    pot = pot_of("median")
+    sensors = SensorSnapshot()
+    AnalogInputSim(CHANNEL).setVoltage(1.0)
+    reading = pot.add_to(sensors, "Test Potentiometer")
+    sensors.sample()
+
+    # when: the pot spikes after the loop's sample and the position is read many times
+    AnalogInputSim(CHANNEL).setVoltage(4.0)
+    positions = [reading.get() for _ in range(5)]
+
+    # then: every read sees the value filtered at the start of the loop
+    assert positions == pytest.approx([100.0] * 5)
+    assert pot.get_raw() == pytest.approx(400.0)
+
+
+def test_filter_config_checked():
+    with pytest.raises(ConfigError):
+        AnalogFilterConfig("Test", filter="kalman")
+    with pytest.raises(ConfigError):
+        AnalogFilterConfig("Test", average_bits=8)
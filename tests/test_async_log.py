@@ -0,0 +1,165 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import logging
+import threading
+
+import pytest
+
+from tests.conftest import FakeClock
+from util.async_log import AsyncLogHandler, RateLimitFilter, SuppressedCountFormatter
+
+
+class RecordingHandler(logging.Handler):
+    """Collects formatted messages and the thread that formatted them, optionally stalling first"""
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(SuppressedCountFormatter("%(message)s"))
+        self.messages: list[str] = []
+        self.threads: list[threading.Thread] = []
+        self.unstalled = threading.Event()
+        self.unstalled.set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.unstalled.wait()
+        self.messages.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+class FormatThread:
+    """A log argument remembering which thread formatted it"""
+
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self) -> str:
+        self.thread = threading.current_thread()
+        return "formatted"
+
+
+@pytest.fixture(scope="function")
+def recording() -> RecordingHandler:
+    return RecordingHandler()
+
+
+@pytest.fixture(scope="function")
+def logger():
+    logger = logging.getLogger("test_async_log")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_formats_on_writer_thread(logger: logging.Logger, recording: RecordingHandler):
+    handler = AsyncLogHandler([recording])
+    logger.addHandler(handler)
+    handler.start()
+    argument = FormatThread()
+
+    logger.info("value %s", argument)
+    handler.close()
+
+    # then: the message was only formatted by the writer, never by the logging thread
+    assert recording.messages == ["value formatted"]
+    assert argument.thread is not threading.current_thread()
+    assert recording.threads == [argument.thread]
+
+
+def test_record_keeps_message_for_other_handlers(logger: logging.Logger, recording: RecordingHandler):
+    kept: list[logging.LogRecord] = []
+    handler = AsyncLogHandler([recording])
+    logger.addHandler(handler)
+    # given: another handler holding on to records to format later (like pytest's log capture)
+    logger.addHandler(type("Keep", (logging.Handler,), {"emit": lambda self, record: kept.append(record)})())
+    handler.start()
+
+    logger.info("value %d", 42)
+    handler.close()
+
+    # then: the writer let go of the arguments but the message is intact
+    assert kept[0].args is None
+    assert kept[0].getMessage() == "value 42"
+
+
+def test_full_queue_drops(logger: logging.Logger, recording: RecordingHandler):
+    handler = AsyncLogHandler([recording], queue_size=2)
+    logger.addHandler(handler)
+    # given: the writer has stalled on the console
+    recording.unstalled.clear()
+    handler.start()
+    logger.info("first")
+    while handler.queue.qsize():
+        pass
+
+    # when: more records arrive than the queue holds
+    for i in range(5):
+        logger.info("record %d", i)
+
+    # then: the loop is never blocked, the overflow is counted
+    assert handler.dropped == 3
+    recording.unstalled.set()
+    handler.close()
+    assert recording.messages == ["first", "record 0", "record 1"]
+
+
+def test_rate_limit_repeats(logger: logging.Logger, recording: RecordingHandler, fake_clock: FakeClock):
+    rate_limit = RateLimitFilter(recording.emit, 0.99, fake_clock)
+    recording.addFilter(rate_limit)
+    logger.addHandler(recording)
+
+    # given: a message repeated every loop for 1.2 seconds, and another once
+    for loop in range(60):
+        fake_clock.now = loop * 0.02
+        logger.warning("Brownout at %.1f V", 6.8)
+        if loop == 5:
+            logger.warning("Arm stalled")
+
+    # then: the first of each passes, the repeats are reported as each interval ends
+    assert recording.messages == ["Brownout at 6.8 V", "Arm stalled", "Brownout at 6.8 V (repeated 48 more times)",
+                                  "Brownout at 6.8 V"]
+    # and: the repeats of the interval still running are reported on request
+    rate_limit.report_pending()
+    assert recording.messages[-1] == "Brownout at 6.8 V (repeated 8 more times)"
+
+
+def test_distinct_messages_from_one_call_site_pass(logger: logging.Logger, recording: RecordingHandler,
+                                                   fake_clock: FakeClock):
+    recording.addFilter(RateLimitFilter(recording.emit, 1.0, fake_clock))
+    logger.addHandler(recording)
+
+    for channel in range(4):
+        logger.info("Drivetrain motor on channel %d initialized", channel)
+
+    assert recording.messages == [f"Drivetrain motor on channel {channel} initialized" for channel in range(4)]
+
+
+def test_rate_key_groups_call_sites(logger: logging.Logger, recording: RecordingHandler, fake_clock: FakeClock):
+    rate_limit = RateLimitFilter(recording.emit, 1.0, fake_clock)
+    recording.addFilter(rate_limit)
+    logger.addHandler(recording)
+
+    logger.info("left stalled", extra={"rate_key": "stall"})
+    logger.info("right stalled", extra={"rate_key": "stall"})
+
+    assert recording.messages == ["left stalled"]
+    rate_limit.report_pending()
+    assert recording.messages == ["left stalled", "right stalled"]
+
+
+def test_close_reports_suppressed(logger: logging.Logger, recording: RecordingHandler, fake_clock: FakeClock):
+    handler = AsyncLogHandler([recording])
+    handler.addFilter(RateLimitFilter(handler.enqueue, 1.0, fake_clock))
+    logger.addHandler(handler)
+    handler.start()
+
+    # given: repeats still being suppressed as the robot shuts down
+    for _ in range(3):
+        logger.warning("Loop overrun")
+    handler.close()
+
+    # then: the count is written rather than lost
+    assert recording.messages == ["Loop overrun", "Loop overrun (repeated 1 more times)"]
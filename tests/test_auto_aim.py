@@ -0,0 +1,128 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from configparser import ConfigParser
+
+import ntcore
+import pytest
+
+from commands.vision_commands import AutoAim
+from oi import OI
+from robot_config import VisionConfig
+from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
+from subsystems.vision import Vision
+from tests.conftest import FakeClock
+from util.stopwatch import TimerService
+from vision.targeting import TARGET_TOPIC, VISION_TABLE
+
+PERIOD_NS = 20_000_000
+# the camera process publishes a target every third loop
+CAMERA_LOOPS = 3
+
+
+@pytest.fixture(scope="function")
+def fake_clock_start() -> int:
+    return 1_000_000_000
+
+
+@pytest.fixture(scope="function")
+def timer(fake_clock: FakeClock) -> TimerService:
+    return TimerService(fake_clock)
+
+
+@pytest.fixture(scope="function")
+def drivetrain(timer: TimerService) -> Drivetrain:
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+    return Drivetrain(config, timer=timer)
+
+
+@pytest.fixture(scope="function")
+def odometry(drivetrain: Drivetrain, timer: TimerService) -> Odometry:
+    return Odometry(drivetrain, timer=timer)
+
+
+@pytest.fixture(scope="function")
+def instance():
+    instance = ntcore.NetworkTableInstance.create()
+    yield instance
+    ntcore.NetworkTableInstance.destroy(instance)
+
+
+@pytest.fixture(scope="function")
+def publisher(instance: ntcore.NetworkTableInstance) -> ntcore.DoubleArrayPublisher:
+    return instance.getTable(VISION_TABLE).getDoubleArrayTopic(TARGET_TOPIC).publish()
+
+
+@pytest.fixture(scope="function")
+def vision(odometry: Odometry, instance: ntcore.NetworkTableInstance) -> Vision:
+    return Vision(odometry, instance=instance)
+
+
+@pytest.fixture(scope="function")
+def oi() -> OI:
+    config = ConfigParser()
+    config.read("./test_configs/joysticks_default.ini")
+    return OI(config)
+
+
+@pytest.fixture(scope="function")
+def auto_aim(oi: OI, drivetrain: Drivetrain, odometry: Odometry, vision: Vision, timer: TimerService) -> AutoAim:
+    return AutoAim(oi, drivetrain, odometry, vision, VisionConfig(aim_speed=1.0), timer=timer)
+
+
+def run_loop(fake_clock: FakeClock, odometry: Odometry, vision: Vision, auto_aim: AutoAim) -> None:
+    fake_clock.now += PERIOD_NS
+    odometry.update()
+    vision.periodic()
+    auto_aim.execute()
+
+
+def test_manual_without_target(auto_aim: AutoAim, drivetrain: Drivetrain, odometry: Odometry, vision: Vision,
+                               fake_clock: FakeClock):
+    auto_aim.initialize()
+    run_loop(fake_clock, odometry, vision, auto_aim)
+
+    # then: the driver's sticks (at rest) drive the robot
+    assert auto_aim.setpoint is None
+    assert not auto_aim.on_target()
+    assert drivetrain.left_motor.get() == 0.0
+    assert drivetrain.right_motor.get() == 0.0
+
+
+def test_turns_to_target(auto_aim: AutoAim, odometry: Odometry, vision: Vision,
+                         publisher: ntcore.DoubleArrayPublisher, fake_clock: FakeClock):
+    # given: a target 30 degrees to the left of where the robot starts
+    target_heading = 30.0
+    auto_aim.initialize()
+    for loop in range(150):
+        if loop % CAMERA_LOOPS == 0:
+            # the camera sees the target relative to the heading when the frame was captured
+            captured = odometry.timestamp()
+            yaw = target_heading - odometry.pose.rotation().degrees()
+            publisher.set([captured, yaw, 0.0, 2.0, 1.0])
+        run_loop(fake_clock, odometry, vision, auto_aim)
+
+    assert auto_aim.setpoint == pytest.approx(target_heading, abs=0.5)
+    assert odometry.pose.rotation().degrees() == pytest.approx(target_heading, abs=1.5)
+    assert auto_aim.on_target()
+
+
+def test_stale_target_falls_back_to_manual(auto_aim: AutoAim, drivetrain: Drivetrain, odometry: Odometry,
+                                           vision: Vision, publisher: ntcore.DoubleArrayPublisher,
+                                           fake_clock: FakeClock):
+    auto_aim.initialize()
+    publisher.set([odometry.timestamp(), 45.0, 0.0, 2.0, 1.0])
+    run_loop(fake_clock, odometry, vision, auto_aim)
+    assert auto_aim.setpoint == pytest.approx(45.0)
+
+    # when: the camera stops seeing the target for longer than the max age
+    for _ in range(20):
+        run_loop(fake_clock, odometry, vision, auto_aim)
+
+    assert auto_aim.setpoint is None
+    assert drivetrain.left_motor.get() == 0.0
+
+    auto_aim.end(False)
+    assert drivetrain.right_motor.get() == 0.0
@@ -0,0 +1,44 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import sys
+
+from tests.conftest import FakeClock
+from util.boot import BootTimeline, ImportTimer
+
+
+def test_timeline_phases(fake_clock: FakeClock):
+    timeline = BootTimeline(profile_imports=False, clock=fake_clock)
+
+    fake_clock.now = 5_000_000
+    timeline.mark("config")
+    fake_clock.now = 12_000_000
+    timeline.mark("subsystems")
+
+    assert [phase.name for phase in timeline.phases] == ["config", "subsystems"]
+    assert timeline.phases[1].duration_ms == 7.0
+    assert timeline.phases[1].elapsed_ms == 12.0
+    assert timeline.total_ms == 12.0
+    assert timeline.import_timer is None
+    assert timeline.report()[-1] == "Boot total: 12.0 ms"
+
+
+def test_import_timer_records_first_import_only():
+    sys.modules.pop("colorsys", None)
+    with ImportTimer() as timer:
+        import colorsys  # noqa: F401
+        import colorsys  # noqa: F401,F811
+
+    names = [record.name for record in timer.records]
+    assert names.count("colorsys") == 1
+    assert timer.report()[0] == "import time: self [us] | cumulative | imported package"
+
+
+def test_import_timer_uninstall_restores_import():
+    import builtins
+    original = builtins.__import__
+    timer = ImportTimer()
+    timer.install()
+    assert builtins.__import__ is not original
+    timer.uninstall()
+    assert builtins.__import__ is original
@@ -5,7 +5,10 @@ from configparser import ConfigParser
 
 import pytest
 from wpilib import PWMTalonSRX, AnalogPotentiometer
+from wpilib.simulation import AnalogInputSim
 
+from commands.climber_commands import ClimbToSetpoint
+from robot_config import ConfigError
 from subsystems.climber import Climber
 
 
@@ -32,7 +35,72 @@ def test__init_components(config_default: ConfigParser):
 
 def test_is_retracted(config_default: ConfigParser):
     climber = Climber(config_default)
-    
+
+
+def set_pot(climber: Climber, position: float) -> None:
+    """Put the simulated climber pot at a position in pot degrees."""
+    AnalogInputSim(climber._pot_channel).setVoltage((position - climber.pot_offset()) / climber.pot_range() * 5.0)
+
+
+def test_soft_limit_tapers_towards_threshold(config_default: ConfigParser):
+    climber = Climber(config_default)
+    control = climber._config.control
+
+    # given: half way through the soft limit zone below the extended threshold
+    set_pot(climber, climber._pot_extended_threshold - control.soft_limit_zone / 2)
+    climber.move_winch(1.0)
+    assert climber.output == pytest.approx(control.soft_limit_speed + (1 - control.soft_limit_speed) / 2, abs=0.01)
+
+    # and: moving away from the threshold is not limited
+    climber.move_winch(-1.0)
+    assert climber.output == pytest.approx(-1.0, abs=0.01)
+
+    # then: at the threshold the winch stops
+    set_pot(climber, climber._pot_extended_threshold + 1)
+    climber.move_winch(1.0)
+    assert climber.output == 0.0
+
+
+def test_moves_to_named_setpoint(config_default: ConfigParser):
+    climber = Climber(config_default)
+    set_pot(climber, climber._config.control.stowed)
+
+    climber.set_goal("reach")
+    outputs = []
+    for _ in range(5):
+        climber.move_to_goal()
+        outputs.append(climber.output)
+
+    # then: the winch eases out along the profile towards the reach setpoint
+    assert climber.goal == climber._config.control.reach
+    assert 0.0 < outputs[0] < outputs[-1]
+    assert not climber.at_goal()
+
+
+def test_goal_held_inside_thresholds(config_default: ConfigParser):
+    climber = Climber(config_default)
+
+    climber.set_goal(5000.0)
+
+    assert climber.goal == climber._pot_extended_threshold
+    with pytest.raises(ConfigError):
+        climber.set_goal("moon")
+
+
+def test_climb_to_setpoint_finishes_at_goal(config_default: ConfigParser):
+    climber = Climber(config_default)
+    set_pot(climber, climber._config.control.reach)
+    command = ClimbToSetpoint(climber, "reach")
+    holding = ClimbToSetpoint(climber, "reach", hold=True)
+
+    command.initialize()
+    command.execute()
+    holding.initialize()
+    holding.execute()
+
+    assert command.isFinished()
+    assert not holding.isFinished()
+
 
 @pytest.mark.skip(reason="Need to get pyfrc/sim working")
 def test_is_extended():
@@ -1,11 +1,14 @@
+import dataclasses
 from configparser import ConfigParser
 
 import pytest
 from wpilib import MotorControllerGroup, PWMTalonSRX, PWMSparkMax
 from wpilib.drive import DifferentialDrive
-from wpilib.simulation import PWMSim
+from wpilib.simulation import PWMSim, RoboRioSim
 
+from robot_config import DriveOutputConfig, DrivetrainConfig
 from subsystems.drivetrain import Drivetrain
+from util.sensor_snapshot import SensorSnapshot
 
 
 @pytest.fixture(scope="function")
@@ -437,3 +440,59 @@ def test__modify_turn_angle():
 @pytest.mark.skip(reason="implement later")
 def test__init_components():
     assert False
+
+
+def test_tank_drive_scaled_by_driver_mode(config_default: ConfigParser):
+    dt = Drivetrain(config_default)
+    # the differential drive's deadband takes up to 0.02 off each output
+    left = PWMSim(dt._left_motor1.getChannel())
+
+    dt.tank_drive(1.0, 1.0, scaled=True)
+    assert left.getSpeed() == pytest.approx(dt.scaling, abs=0.02)
+
+    dt.set_slow()
+    dt.tank_drive(1.0, 1.0, scaled=True)
+    assert left.getSpeed() == pytest.approx(dt.slow_scaling, abs=0.02)
+
+    # and: autonomous requests are not scaled
+    dt.tank_drive(1.0, 1.0)
+    assert left.getSpeed() == pytest.approx(1.0)
+
+
+def test_arcade_drive_scaled_as_tank_drive(config_half_speed: ConfigParser):
+    dt = Drivetrain(config_half_speed)
+    left = PWMSim(dt._left_motor1.getChannel())
+    dt.set_slow()
+
+    # when: full speed straight ahead in arcade, as tank drive would be asked
+    dt.arcade_drive(1.0, 0.0, False, scaled=True)
+    arcade = left.getSpeed()
+    dt.tank_drive(1.0, 1.0, scaled=True)
+
+    # then: both are scaled by the max speed and the driver's scaling
+    assert arcade == pytest.approx(0.5 * dt.slow_scaling, abs=0.02)
+    assert left.getSpeed() == pytest.approx(arcade)
+
+    # and: autonomous requests are only scaled by the max speed
+    dt.arcade_drive(1.0, 0.0, False)
+    assert left.getSpeed() == pytest.approx(0.5, abs=0.02)
+
+
+def test_output_voltage_compensated(config_default: ConfigParser):
+    config = dataclasses.replace(DrivetrainConfig.from_parser(config_default),
+                                 output=DriveOutputConfig(voltage_compensation=True, nominal_voltage=12.0))
+    sensors = SensorSnapshot()
+    dt = Drivetrain(config, sensors=sensors)
+    left = PWMSim(dt._left_motor1.getChannel())
+    # given: the battery has sagged to 10 V this loop
+    RoboRioSim.setVInVoltage(10.0)
+    sensors.sample()
+
+    dt.tank_drive(0.5, 0.5)
+    assert left.getSpeed() == pytest.approx(0.6, abs=0.02)
+
+    # and: compensation never drives past the max speed
+    dt.tank_drive(1.0, 1.0)
+    assert left.getSpeed() == pytest.approx(1.0)
+    RoboRioSim.setVInVoltage(12.0)
+
@@ -0,0 +1,102 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import threading
+
+import numpy as np
+import pytest
+
+from vision.frame_ring import FrameGrabber, FrameRing
+
+
+def capture(ring: FrameRing, timestamp: int) -> int:
+    slot, frame = ring.acquire_write()
+    frame[0, 0, 0] = timestamp % 256
+    ring.commit(slot, timestamp)
+    return slot
+
+
+def test_needs_three_slots():
+    with pytest.raises(ValueError):
+        FrameRing(2, 2, slots=2)
+
+
+def test_takes_latest_frame_dropping_stale():
+    ring = FrameRing(4, 4)
+
+    # given: three frames captured before the processing loop takes one
+    for timestamp in (100, 200, 300):
+        capture(ring, timestamp)
+
+    # then: the processing loop gets the newest, the older ones are dropped
+    slot, frame, timestamp = ring.take_latest()
+    assert timestamp == 300
+    assert frame[0, 0, 0] == 300 % 256
+    assert ring.dropped == 2
+    assert ring.captured == 3
+    ring.release(slot)
+    assert ring.take_latest(timeout=0.0) is None
+
+
+def test_never_captures_into_slot_being_read():
+    ring = FrameRing(4, 4)
+    capture(ring, 1)
+    reading, frame, _ = ring.take_latest()
+    frame_before = frame.copy()
+
+    # when: the camera keeps capturing while the frame is processed
+    written = {capture(ring, timestamp) for timestamp in range(2, 10)}
+
+    # then: the frame being processed is untouched, without any frame being copied
+    assert reading not in written
+    assert np.array_equal(frame, frame_before)
+    ring.release(reading)
+
+
+def test_replaced_frame_is_kept():
+    ring = FrameRing(4, 4)
+    slot, _ = ring.acquire_write()
+    # given: the grabber returned a new array (a camera at another resolution)
+    replaced = np.ones((8, 8, 3), dtype=np.uint8)
+    ring.commit(slot, 5, replaced)
+
+    _, frame, _ = ring.take_latest()
+    assert frame is replaced
+
+
+def test_grabber_fills_ring_until_closed():
+    ring = FrameRing(4, 4)
+    timestamps = iter(range(1, 6))
+    errors = []
+
+    def grab(frame: np.ndarray):
+        # a failed grab after the fifth frame ends the stream
+        return next(timestamps, 0), frame
+
+    def on_error():
+        errors.append(True)
+        ring.close()
+
+    grabber = FrameGrabber(grab, ring, on_error)
+    grabber.start()
+    grabber.join(timeout=5.0)
+
+    assert not grabber.is_alive()
+    assert ring.captured == 5
+    assert errors == [True]
+    # the latest frame is still handed out once the ring is closed, then nothing
+    assert ring.take_latest()[2] == 5
+    assert ring.take_latest() is None
+
+
+def test_close_wakes_processing_loop():
+    ring = FrameRing(4, 4)
+    taken = []
+    loop = threading.Thread(target=lambda: taken.append(ring.take_latest()))
+    loop.start()
+
+    ring.close()
+    loop.join(timeout=5.0)
+
+    assert not loop.is_alive()
+    assert taken == [None]
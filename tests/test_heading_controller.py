@@ -0,0 +1,78 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+
+from robot_config import TurnControllerConfig
+from tests.conftest import FakeClock
+from util.heading_controller import HeadingController
+from util.stopwatch import TimerService
+
+# degrees per second the simulated robot turns at full turn speed
+TURN_RATE = 400.0
+PERIOD = 0.02
+
+
+def run_turn(start: float, goal: float, tolerance: float = 2.0, max_output: float = 1.0, continuous: bool = True):
+    clock = FakeClock()
+    controller = HeadingController(TurnControllerConfig(), tolerance, max_output, PERIOD, TimerService(clock),
+                                   continuous)
+    heading = start
+    controller.reset(heading, goal)
+    headings = []
+    outputs = []
+    for _ in range(250):
+        output = controller.calculate(heading)
+        outputs.append(output)
+        if controller.at_goal():
+            break
+        heading += output * TURN_RATE * PERIOD
+        headings.append(heading)
+        clock.now += int(PERIOD * 1e9)
+    return controller, heading, headings, outputs
+
+
+@pytest.mark.parametrize("degrees", [-180.0, -360.0, 180.0, 540.0, 10.0])
+def test_wrap(degrees: float):
+    wrapped = HeadingController.wrap(degrees)
+    assert -180.0 < wrapped <= 180.0
+    assert (wrapped - degrees) % 360.0 == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("start,goal", [(0.0, 90.0), (0.0, -45.0), (30.0, 120.0)])
+def test_turn_settles_without_oscillating(start: float, goal: float):
+    controller, heading, headings, outputs = run_turn(start, goal)
+
+    assert controller.at_goal()
+    assert heading == pytest.approx(goal, abs=2.0)
+    # the heading never swings back and forth across the goal
+    crossings = sum(1 for a, b in zip(headings, headings[1:]) if (a - goal) * (b - goal) < 0)
+    assert crossings <= 1
+    assert max(abs(output) for output in outputs) <= 1.0
+
+
+def test_turn_takes_short_way_around():
+    # given: a robot at 170 degrees turning to -170 degrees
+    controller, heading, headings, outputs = run_turn(170.0, -170.0)
+
+    # then: it turns 20 degrees through 180 rather than 340 degrees the long way
+    assert controller.at_goal()
+    assert outputs[1] > 0.0
+    assert HeadingController.wrap(heading) == pytest.approx(-170.0, abs=2.0)
+
+
+def test_output_limited_to_max_output():
+    controller, heading, headings, outputs = run_turn(0.0, 170.0, max_output=0.3)
+    assert controller.at_goal()
+    assert max(abs(output) for output in outputs) <= 0.3
+
+
+@pytest.mark.parametrize("change", [270.0, 360.0, -270.0])
+def test_relative_turn_past_180_turns_all_the_way(change: float):
+    # given: a relative turn, whose target is not wrapped
+    controller, heading, headings, outputs = run_turn(10.0, 10.0 + change, continuous=False)
+
+    # then: the robot turns the whole way in the direction asked rather than the short way round
+    assert controller.at_goal()
+    assert heading == pytest.approx(10.0 + change, abs=2.0)
+    assert outputs[1] * change > 0.0
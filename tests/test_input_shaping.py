@@ -0,0 +1,117 @@
+import pytest
+from configparser import ConfigParser
+from wpilib.simulation import XboxControllerSim
+
+from oi import OI, UserController
+from robot_config import AxisShapingConfig, ConfigError, JoystickConfig
+from util.input_shaping import ShapedAxis, compile_shaper
+
+
+class FakeAxis:
+    def __init__(self, value: float = 0.0):
+        self.value = value
+        self.reads = 0
+
+    def __call__(self) -> float:
+        self.reads += 1
+        return self.value
+
+
+@pytest.fixture(scope="function")
+def config_default() -> ConfigParser:
+    config = ConfigParser()
+    config.read("./test_configs/joysticks_default.ini")
+    return config
+
+
+def test_dead_zone_reads_zero():
+    shape = compile_shaper(AxisShapingConfig("LEFTY", dead_zone=0.2))
+    assert shape(0.0) == 0.0
+    assert shape(0.2) == 0.0
+    assert shape(-0.19) == 0.0
+
+
+def test_dead_zone_rescales_remaining_range():
+    shape = compile_shaper(AxisShapingConfig("LEFTY", dead_zone=0.2))
+    assert shape(0.6) == pytest.approx(0.5)
+    assert shape(-0.6) == pytest.approx(-0.5)
+    assert shape(1.0) == pytest.approx(1.0)
+    assert shape(-1.0) == pytest.approx(-1.0)
+
+
+def test_expo_keeps_end_points():
+    shape = compile_shaper(AxisShapingConfig("LEFTY", dead_zone=0.0, expo=1.0))
+    assert shape(0.5) == pytest.approx(0.125)
+    assert shape(-0.5) == pytest.approx(-0.125)
+    assert shape(1.0) == pytest.approx(1.0)
+
+
+def test_inverted():
+    shape = compile_shaper(AxisShapingConfig("LEFTY", dead_zone=0.0, inverted=True))
+    assert shape(0.5) == pytest.approx(-0.5)
+    assert shape(-1.0) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("key,value", [("DEAD_ZONE", 1.0), ("EXPO", 1.5), ("SLEW_RATE", -1.0)])
+def test_invalid_config_raises(key: str, value: float):
+    parser = ConfigParser()
+    parser.read_dict({"JoyConfig0.LEFTY": {key: str(value)}})
+    with pytest.raises(ConfigError):
+        AxisShapingConfig.from_parser(parser, "JoyConfig0.LEFTY", "LEFTY", 0.1)
+
+
+def test_axis_defaults_to_controller_dead_zone(config_default: ConfigParser):
+    # given: a controller with a dead zone and no per axis sections
+    config = JoystickConfig.from_parser(config_default)
+    # then: every axis uses the controller dead zone
+    for axis in config.controllers[0].axes:
+        assert axis.dead_zone == config.controllers[0].dead_zone
+
+
+def test_sample_caches_value_for_the_loop():
+    # given: a sampled axis
+    read = FakeAxis(0.6)
+    axis = ShapedAxis(read, AxisShapingConfig("LEFTY", dead_zone=0.2))
+    axis.sample()
+    # when: the input changes and the axis is read several times
+    read.value = 1.0
+    values = [axis.get() for _ in range(3)]
+    # then: the controller was polled once and the sampled value is returned
+    assert read.reads == 1
+    assert values == [pytest.approx(0.5)] * 3
+
+
+def test_get_reads_live_before_first_sample():
+    read = FakeAxis(0.6)
+    axis = ShapedAxis(read, AxisShapingConfig("LEFTY", dead_zone=0.2))
+    assert axis.get() == pytest.approx(0.5)
+    read.value = 1.0
+    assert axis.get() == pytest.approx(1.0)
+
+
+def test_slew_rate_limits_change():
+    read = FakeAxis(0.0)
+    axis = ShapedAxis(read, AxisShapingConfig("LEFTY", dead_zone=0.0, slew_rate=1.0))
+    axis.sample()
+    read.value = 1.0
+    # a step to full output is limited to at most one unit per second
+    assert axis.sample() < 0.1
+
+
+def test_oi_shapes_axes_from_config():
+    # given: a scoring right stick with a dead zone and inversion
+    parser = ConfigParser()
+    parser.read_dict({
+        "JoyConfig0": {"PORT": "0"},
+        "JoyConfig1": {"PORT": "1"},
+        "JoyConfig1.RIGHTY": {"DEAD_ZONE": "0.2", "INVERTED": "True"},
+    })
+    oi = OI(parser)
+    controller = XboxControllerSim(1)
+    # when: the stick is moved and the OI samples the axes
+    controller.setRightY(0.6)
+    controller.notifyNewData()
+    oi.periodic()
+    # then: the shaped value is returned
+    assert oi.scontrol_right_y() == pytest.approx(-0.5)
+    assert oi.axis(UserController.SCORING, OI.RIGHT_Y_KEY) == pytest.approx(-0.5)
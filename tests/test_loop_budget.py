@@ -0,0 +1,94 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import os
+import subprocess
+import sys
+
+import pytest
+
+from simulation.loop_budget import JoystickEvent, JoystickScript, LoopBudgetResult
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# a teleop loop at rest, then a loop after a scripted spin to the left
+SCRIPTED_SPIN = """
+import wpilib
+from simulation.loop_budget import JoystickEvent, JoystickScript
+from simulation.runner import HeadlessSim
+
+script = JoystickScript([JoystickEvent(0.1, 0, "axis1", 0.8), JoystickEvent(0.1, 0, "axis5", -0.8)])
+with HeadlessSim() as sim:
+    script.connect()
+    script.apply(0.0)
+    rest = sim.step(autonomous=False, enabled=True)
+    script.apply(0.1)
+    wpilib.DriverStation.refreshData()
+    print("stick", wpilib.DriverStation.getStickAxis(0, 1))
+    spin = sim.step(autonomous=False, enabled=True)
+    print("outputs", rest.left, rest.right, spin.left, spin.right)
+"""
+
+
+def run_harness(*args: str) -> subprocess.CompletedProcess:
+    # the headless sim resets the HAL on close, so it runs in its own process
+    return subprocess.run([sys.executable, "-m", "simulation.loop_budget", "--disabled", "0.2",
+                           "--autonomous", "0.5", "--teleop", "1", *args],
+                          cwd=SRC_DIR, capture_output=True, text=True, timeout=120)
+
+
+def test_joystick_event_inputs():
+    assert JoystickEvent(0.0, 0, "axis5", 1.0).index == 5
+    assert JoystickEvent(0.0, 1, "button10", 1.0).kind == "button"
+    for bad in ("axis6", "button11", "trigger1", "axis"):
+        with pytest.raises(ValueError):
+            JoystickEvent(0.0, 0, bad, 1.0)
+
+
+def test_script_loads_in_time_order(tmp_path):
+    path = tmp_path / "script.csv"
+    path.write_text("time,port,input,value\n2.0,0,button6,1\n0.5,0,axis1,-0.5\n")
+
+    script = JoystickScript.load(str(path))
+
+    assert [event.time for event in script.events] == [0.5, 2.0]
+    assert script.events[0] == JoystickEvent(0.5, 0, "axis1", -0.5)
+
+
+def test_scripted_input_drives_the_robot():
+    completed = subprocess.run([sys.executable, "-c", SCRIPTED_SPIN], cwd=SRC_DIR, capture_output=True, text=True,
+                               timeout=120)
+
+    assert completed.returncode == 0, completed.stderr
+    lines = {line.split()[0]: line.split()[1:] for line in completed.stdout.splitlines()
+             if line.startswith(("stick", "outputs"))}
+    # then: the driver station reads the scripted value as soon as it is applied
+    assert float(lines["stick"][0]) == pytest.approx(0.8)
+    rest_left, rest_right, spin_left, spin_right = (float(value) for value in lines["outputs"])
+    # and: the drivetrain is at rest until the script moves the sticks, then spins on the next loop
+    assert rest_left == rest_right == 0.0
+    assert spin_left != 0.0
+    assert spin_right == pytest.approx(-spin_left, rel=0.01)
+
+
+def test_result_over_budget():
+    result = LoopBudgetResult(10.0, 20.0, {"auto": (2.0, 5.0, 12.0, 30.0), "teleop": (4.0, 15.0, 21.0, 25.0)})
+
+    assert result.over_budget() == ["teleop"]
+    assert not result.passed
+    assert "OVER BUDGET" in result.report()
+
+
+def test_harness_within_budget():
+    completed = run_harness("--slowdown", "1", "--budget", "1000")
+
+    assert completed.returncode == 0, completed.stderr
+    assert "teleop" in completed.stdout
+
+
+def test_harness_fails_over_budget():
+    # given: a budget no loop can meet
+    completed = run_harness("--budget", "0.0001")
+
+    assert completed.returncode == 1
+    assert "over 0.0001 ms" in completed.stderr
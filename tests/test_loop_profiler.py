@@ -0,0 +1,96 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+from commands2 import Command, Subsystem
+
+from tests.conftest import FakeClock
+from util.loop_profiler import LoopProfiler, PhaseTimer, NANOS_PER_MILLI
+
+
+@pytest.fixture(scope="function")
+def profiler(fake_clock: FakeClock) -> LoopProfiler:
+    return LoopProfiler(period=0.02, window=10, publish_period=1.0, clock=fake_clock)
+
+
+def test_phase_timer_empty():
+    timer = PhaseTimer("empty", 4)
+    assert timer.count == 0
+    assert timer.summary() is None
+
+
+def test_phase_timer_ring_buffer_wraps():
+    timer = PhaseTimer("wrap", 4)
+    for millis in (100, 1, 2, 3, 4):
+        timer.record(millis * NANOS_PER_MILLI)
+
+    # the 100 ms sample was overwritten once the window was full
+    assert timer.count == 4
+    assert timer.summary() == (2.0, 3.0, 3.0, 4.0)
+
+
+def test_mark_records_time_since_last_mark(profiler: LoopProfiler, fake_clock: FakeClock):
+    profiler.begin_loop()
+    fake_clock.advance_ms(2)
+    profiler.mark("sensors")
+    fake_clock.advance_ms(5)
+    profiler.mark("scheduler")
+    profiler.end_loop()
+
+    summary = profiler.summary()
+    assert summary["sensors"][3] == 2.0
+    assert summary["scheduler"][3] == 5.0
+    assert summary[LoopProfiler.LOOP_PHASE][3] == 7.0
+
+
+@pytest.mark.parametrize(
+    "loop_ms,bucket,overrun",
+    [
+        (1, 0, False),
+        (12, 2, False),
+        (20, 4, False),
+        (22, 4, True),
+        (75, 8, True),
+    ],
+)
+def test_end_loop_histogram(profiler: LoopProfiler, fake_clock: FakeClock, loop_ms: float, bucket: int, overrun: bool):
+    profiler.begin_loop()
+    fake_clock.advance_ms(loop_ms)
+    profiler.end_loop()
+
+    assert profiler.histogram[bucket] == 1
+    assert sum(profiler.histogram) == 1
+    assert profiler.overruns == (1 if overrun else 0)
+
+
+def test_timed(profiler: LoopProfiler, fake_clock: FakeClock):
+    def work(value: int) -> int:
+        fake_clock.advance_ms(3)
+        return value * 2
+
+    timed_work = profiler.timed("work", work)
+
+    assert timed_work(4) == 8
+    assert profiler.phases["work"].summary()[3] == 3.0
+
+
+def test_instrument_subsystem(profiler: LoopProfiler):
+    subsystem = Subsystem()
+    profiler.instrument_subsystem(subsystem)
+    profiler.instrument_subsystem(subsystem)
+    subsystem.periodic()
+
+    assert profiler.phases[f"{subsystem.getName()}.periodic"].count == 1
+
+
+def test_instrument_command_once(profiler: LoopProfiler):
+    command = Command()
+    command.setName("Profiled")
+    profiler.instrument_command(command)
+    profiler.instrument_command(command)
+
+    command.execute()
+    command.isFinished()
+
+    assert profiler.phases["Profiled.execute"].count == 1
+    assert profiler.phases["Profiled.isFinished"].count == 1
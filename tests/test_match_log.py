@@ -0,0 +1,245 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from util.match_log import MatchLog, MatchLogger
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# records a disabled, autonomous, driven teleop and disabled again run to a match log, reads back
+# what is on disk once disabled, then replays the whole log
+RECORD_AND_REPLAY = """
+import sys
+from configparser import ConfigParser
+from wpilib.simulation import DriverStationSim
+from simulation.replay import replay
+from simulation.runner import HeadlessSim
+from util.match_log import MatchLog
+
+directory = sys.argv[1]
+config = ConfigParser()
+config.read("configs/subsystems.ini")
+config["MatchLog"].update({"SIMULATION": "True", "DIRECTORY": directory, "USB_DIRECTORY": directory + "/usb/logs"})
+subsystems = directory + "/subsystems.ini"
+with open(subsystems, "w") as config_file:
+    config.write(config_file)
+
+with HeadlessSim(subsystems_config=subsystems) as sim:
+    sim.select_auto("Move_From_Line")
+    DriverStationSim.setJoystickAxisCount(0, 6)
+    for _ in range(5):
+        sim.step(autonomous=False, enabled=False)
+    for _ in range(50):
+        sim.step(autonomous=True, enabled=True)
+    for loop in range(60):
+        if loop == 10:
+            DriverStationSim.setJoystickAxis(0, 1, -0.8)
+            DriverStationSim.setJoystickAxis(0, 5, -0.4)
+        sim.step(autonomous=False, enabled=True)
+    for _ in range(5):
+        sim.step(autonomous=False, enabled=False)
+    recorded = sim.pose
+    logger = sim.robot.controller.match_logger
+    logger._pending.join()
+    path = logger.path
+    on_disk = len(MatchLog.read(path))
+
+log = MatchLog.read(path)
+with HeadlessSim(subsystems_config=subsystems) as sim:
+    replayed = replay(log, sim)
+print(on_disk, len(log), replayed.deterministic, replayed.divergence)
+print(recorded.X(), recorded.Y(), replayed.result.final_pose.X(), replayed.result.final_pose.Y())
+"""
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def get(self) -> int:
+        return self.value
+
+
+class BlockedWriterLogger(MatchLogger):
+    """A logger whose writer thread waits until released, as if the disk had stalled"""
+
+    def __init__(self, block_loops: int, blocks: int):
+        super().__init__(block_loops, blocks)
+        self.release = threading.Event()
+
+    def _write_blocks(self, log_file, ring) -> None:
+        self.release.wait()
+        super()._write_blocks(log_file, ring)
+
+
+class StalledWriteLogger(MatchLogger):
+    """A logger whose writer takes the first block, then stalls writing it until released"""
+
+    def __init__(self, block_loops: int, blocks: int):
+        super().__init__(block_loops, blocks)
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def _write_blocks(self, log_file, ring) -> None:
+        logger = self
+
+        class StalledFile:
+            def __getattr__(self, name):
+                return getattr(log_file, name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                log_file.close()
+
+            def write(self, data):
+                logger.writing.set()
+                logger.release.wait()
+                return log_file.write(data)
+
+        super()._write_blocks(StalledFile(), ring)
+
+
+def record_loops(logger: MatchLogger, counter: Counter, loops: int, paced: bool = False) -> None:
+    for _ in range(loops):
+        counter.value += 1
+        logger.record()
+        if paced:
+            # a robot loop leaves the writer 20 ms, wait for it to catch up instead
+            logger._pending.join()
+
+
+def test_roundtrip(tmp_path):
+    counter = Counter()
+    logger = MatchLogger(block_loops=4, blocks=3)
+    logger.add_field("loop", "i", counter.get)
+    logger.add_field("half", "d", lambda: counter.value / 2)
+    logger.add_field("odd", "?", lambda: counter.value % 2 == 1)
+
+    # given: more loops than the ring holds, ending part way through a block
+    path = logger.start(str(tmp_path), {"robot": "test"})
+    record_loops(logger, counter, 30, paced=True)
+    logger.close()
+
+    # then: every loop is read back in order
+    log = MatchLog.read(path)
+    assert len(log) == logger.records == 30
+    assert log.fields == ["loop", "half", "odd"]
+    assert log.metadata == {"robot": "test"}
+    assert log.column("loop") == list(range(1, 31))
+    assert log[9] == (10, 5.0, False)
+    assert logger.dropped_blocks == 0
+
+
+def test_fields_fixed_once_started(tmp_path):
+    logger = MatchLogger()
+    logger.add_field("loop", "i", lambda: 0)
+    logger.start(str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        logger.add_field("late", "i", lambda: 0)
+    logger.close()
+
+
+def test_stalled_writer_drops_blocks(tmp_path):
+    counter = Counter()
+    logger = BlockedWriterLogger(block_loops=2, blocks=3)
+    logger.add_field("loop", "i", counter.get)
+    path = logger.start(str(tmp_path))
+
+    # given: the writer is stalled, two blocks can wait for it
+    record_loops(logger, counter, 4)
+    # when: the last free block fills twice while it is still stalled
+    record_loops(logger, counter, 4)
+
+    # then: the block being filled is dropped instead of blocking the loop
+    assert logger.dropped_blocks == 2
+    logger.release.set()
+    logger.close()
+    assert MatchLog.read(path).column("loop") == [1, 2, 3, 4]
+
+
+def test_block_being_written_never_overwritten(tmp_path):
+    counter = Counter()
+    logger = StalledWriteLogger(block_loops=2, blocks=3)
+    logger.add_field("loop", "i", counter.get)
+    path = logger.start(str(tmp_path))
+
+    # given: the disk stalls part way through writing the first block
+    record_loops(logger, counter, 2)
+    logger.writing.wait(1.0)
+    # when: the ring comes all the way round to the block being written
+    record_loops(logger, counter, 6)
+
+    # then: the loops that had no free block are dropped, the first block is written as recorded
+    assert logger.dropped_blocks == 2
+    logger.release.set()
+    logger.close()
+    assert MatchLog.read(path).column("loop") == [1, 2, 3, 4]
+
+
+def test_partial_record_ignored(tmp_path):
+    counter = Counter()
+    logger = MatchLogger(block_loops=1)
+    logger.add_field("loop", "i", counter.get)
+    path = logger.start(str(tmp_path))
+    record_loops(logger, counter, 3)
+    logger.close()
+
+    # given: power was lost part way through writing a record
+    with open(path, "ab") as log_file:
+        log_file.write(b"\x01\x02")
+
+    assert MatchLog.read(path).column("loop") == [1, 2, 3]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.r94log"
+    path.write_bytes(b"not a match log at all")
+
+    with pytest.raises(ValueError):
+        MatchLog.read(str(path))
+
+
+def test_flush_writes_partial_block(tmp_path):
+    counter = Counter()
+    logger = MatchLogger(block_loops=4, blocks=3)
+    logger.add_field("loop", "i", counter.get)
+    path = logger.start(str(tmp_path))
+    record_loops(logger, counter, 6)
+
+    # when: the robot is disabled part way through a block
+    logger.flush()
+    logger._pending.join()
+
+    # then: every loop so far is on disk, and recording carries on into a new block
+    assert MatchLog.read(path).column("loop") == [1, 2, 3, 4, 5, 6]
+    record_loops(logger, counter, 2)
+    logger.close()
+    assert MatchLog.read(path).column("loop") == list(range(1, 9))
+
+
+def test_recorded_match_replays_deterministically(tmp_path):
+    # the headless sim resets the HAL on close, so it runs in its own process
+    completed = subprocess.run([sys.executable, "-c", RECORD_AND_REPLAY, str(tmp_path)],
+                               cwd=SRC_DIR, capture_output=True, text=True, timeout=120)
+
+    assert completed.returncode == 0, completed.stderr
+    counts, poses = completed.stdout.strip().splitlines()[-2:]
+    on_disk, loops, deterministic, divergence = counts.split(" ", 3)
+    # then: every enabled loop was written as the robot was disabled, not left in a partial block
+    assert int(on_disk) == 115
+    # and: every loop is replayed with the outputs the robot recorded
+    assert int(loops) == 120
+    assert deterministic == "True", divergence
+    # and: the replayed robot drove where the recorded one did
+    recorded_x, recorded_y, replayed_x, replayed_y = (float(value) for value in poses.split())
+    assert replayed_x == pytest.approx(recorded_x, abs=1e-3)
+    assert replayed_y == pytest.approx(recorded_y, abs=1e-3)
@@ -0,0 +1,95 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+from wpilib import PWMSparkMax
+from wpilib.simulation import RoboRioSim
+
+from util.motor_output import MotorOutput, VoltageCompensation
+from util.sensor_snapshot import SensorSnapshot
+
+
+@pytest.fixture(scope="function")
+def battery():
+    sensors = SensorSnapshot()
+    yield sensors
+    RoboRioSim.setVInVoltage(12.0)
+
+
+def sag_to(sensors: SensorSnapshot, volts: float) -> None:
+    RoboRioSim.setVInVoltage(volts)
+    sensors.sample()
+
+
+def test_compensates_for_sagged_battery(battery: SensorSnapshot):
+    compensation = VoltageCompensation.create(battery, True, 11.0)
+    sag_to(battery, 10.0)
+
+    assert compensation.duty_cycle(0.5) == pytest.approx(0.55)
+    assert compensation.volts_to_duty_cycle(5.0) == pytest.approx(0.5)
+
+
+def test_battery_read_once_per_loop(battery: SensorSnapshot):
+    compensation = VoltageCompensation.create(battery, True, 12.0)
+    sag_to(battery, 10.0)
+
+    # when: the battery sags further within the loop
+    RoboRioSim.setVInVoltage(8.0)
+
+    # then: outputs this loop still use the voltage sampled at the start of the loop
+    assert compensation.duty_cycle(0.5) == pytest.approx(0.6)
+
+
+def test_disabled_passes_output_through(battery: SensorSnapshot):
+    compensation = VoltageCompensation.create(battery, False, 11.0)
+    sag_to(battery, 10.0)
+
+    assert not compensation.enabled
+    assert compensation.duty_cycle(0.5) == 0.5
+    assert compensation.volts_to_duty_cycle(5.5) == pytest.approx(0.5)
+
+
+def test_brownout_voltage_does_not_multiply_output(battery: SensorSnapshot):
+    compensation = VoltageCompensation.create(battery, True, 12.0)
+    sag_to(battery, 3.0)
+
+    assert compensation.duty_cycle(0.25) == pytest.approx(0.5)
+
+
+def test_motor_output_clamps_and_sets_motor(battery: SensorSnapshot):
+    motor = PWMSparkMax(9)
+    output = MotorOutput(motor, VoltageCompensation.create(battery, True, 12.0), max_output=0.8)
+    sag_to(battery, 10.0)
+
+    assert output.set(0.5) == pytest.approx(0.6)
+    # the PWM signal is quantized, so the motor reads back close to what was set
+    assert output.get() == pytest.approx(0.6, abs=0.005)
+    assert output.set(-1.0) == pytest.approx(-0.8)
+    assert output.set_voltage(5.0) == pytest.approx(0.5)
+
+
+def test_disabled_motor_output():
+    output = MotorOutput(None, VoltageCompensation(None))
+
+    assert output.set(1.0) == 0.0
+    assert output.get() == 0.0
+
+
+def test_motor_only_set_when_output_changes(battery: SensorSnapshot):
+    class RecordingMotor:
+        def __init__(self):
+            self.calls = []
+
+        def set(self, duty_cycle: float) -> None:
+            self.calls.append(duty_cycle)
+
+    motor = RecordingMotor()
+    output = MotorOutput(motor, VoltageCompensation.create(battery, False, 12.0))
+
+    # when: the same output is set for several loops, then changed
+    for speed in (0.5, 0.5, 0.5, 0.25):
+        output.set(speed)
+
+    # then: the motor controller is only called for each change
+    assert motor.calls == [0.5, 0.25]
+    assert output.get() == 0.25
@@ -0,0 +1,120 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import dataclasses
+import math
+from configparser import ConfigParser
+
+import pytest
+from wpilib.simulation import ADXRS450_GyroSim
+from wpimath.geometry import Pose2d, Rotation2d
+
+from robot_config import DrivetrainConfig, GyroConfig
+from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
+from tests.conftest import FakeClock
+from util.stopwatch import TimerService
+
+PERIOD_NS = 20_000_000
+
+
+@pytest.fixture(scope="function")
+def config_default() -> ConfigParser:
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+    return config
+
+
+@pytest.fixture(scope="function")
+def timer(fake_clock: FakeClock) -> TimerService:
+    return TimerService(fake_clock)
+
+
+@pytest.fixture(scope="function")
+def drivetrain_default(config_default: ConfigParser, timer: TimerService) -> Drivetrain:
+    return Drivetrain(config_default, timer=timer)
+
+
+@pytest.fixture(scope="function")
+def odometry_default(drivetrain_default: Drivetrain, timer: TimerService) -> Odometry:
+    return Odometry(drivetrain_default, timer=timer)
+
+
+def run_loops(odometry: Odometry, fake_clock: FakeClock, loops: int):
+    for _ in range(loops):
+        fake_clock.now += PERIOD_NS
+        odometry.periodic()
+
+
+def test_init_default(odometry_default: Odometry):
+    assert odometry_default.pose == Pose2d()
+    assert odometry_default.pose_at(0.0) is None
+
+
+def test_drive_straight(drivetrain_default: Drivetrain, odometry_default: Odometry, fake_clock: FakeClock):
+    # given: the drivetrain driving both sides forward at 1 m/s for one second
+    odometry_default.periodic()
+    drivetrain_default.drive_wheel_speeds(1.0, 1.0)
+    run_loops(odometry_default, fake_clock, 50)
+
+    # then: the robot has moved forward without turning, travel is estimated from the PWM output
+    pose = odometry_default.pose
+    expected = 50 * 0.02 * (1.0 / 3.5 + 0.05) * 3.5
+    assert pose.X() == pytest.approx(expected, rel=0.05)
+    assert pose.Y() == pytest.approx(0.0, abs=1e-6)
+    assert pose.rotation().degrees() == pytest.approx(0.0, abs=1e-6)
+
+
+def test_turn_in_place(drivetrain_default: Drivetrain, odometry_default: Odometry, fake_clock: FakeClock):
+    odometry_default.periodic()
+    drivetrain_default.drive_wheel_speeds(-0.5, 0.5)
+    run_loops(odometry_default, fake_clock, 25)
+
+    pose = odometry_default.pose
+    assert pose.translation().norm() == pytest.approx(0.0, abs=1e-3)
+    # counter-clockwise is positive
+    assert pose.rotation().radians() > 0.0
+
+
+def test_heading_follows_gyro(config_default: ConfigParser, timer: TimerService, fake_clock: FakeClock):
+    config = dataclasses.replace(DrivetrainConfig.from_parser(config_default), gyro=GyroConfig(enabled=True))
+    drivetrain = Drivetrain(config, timer=timer)
+    odometry = Odometry(drivetrain, timer=timer)
+    gyro = ADXRS450_GyroSim(drivetrain.gyro)
+    assert drivetrain.is_gyro_enabled()
+    odometry.periodic()
+
+    # when: the gyro turns 30 degrees clockwise while the wheels stay still
+    gyro.setAngle(30.0)
+    run_loops(odometry, fake_clock, 5)
+
+    # then: the pose turns with the gyro, counter-clockwise positive
+    assert drivetrain.get_gyro_angle() == pytest.approx(30.0)
+    assert odometry.pose.rotation().degrees() == pytest.approx(-30.0, abs=0.5)
+
+
+def test_history_is_bounded_and_interpolated(drivetrain_default: Drivetrain, odometry_default: Odometry,
+                                             fake_clock: FakeClock):
+    odometry_default.periodic()
+    drivetrain_default.drive_wheel_speeds(1.0, 1.0)
+    run_loops(odometry_default, fake_clock, 200)
+
+    # given: four seconds of driving, only the last history window is kept
+    samples = odometry_default.history.getInternalBuffer()
+    assert samples[-1][0] - samples[0][0] <= Odometry.HISTORY_SECONDS + 1e-9
+
+    # then: a pose between two loops is interpolated
+    now = odometry_default.timestamp()
+    before = odometry_default.pose_at(now - 0.02)
+    after = odometry_default.pose_at(now)
+    halfway = odometry_default.pose_at(now - 0.01)
+    assert halfway.X() == pytest.approx((before.X() + after.X()) / 2.0)
+
+
+def test_reset_pose(odometry_default: Odometry, fake_clock: FakeClock):
+    start = Pose2d(1.0, 2.0, Rotation2d(math.pi / 2))
+    odometry_default.reset_pose(start)
+    run_loops(odometry_default, fake_clock, 1)
+    assert odometry_default.pose.X() == pytest.approx(1.0)
+    assert odometry_default.pose.Y() == pytest.approx(2.0)
+    assert odometry_default.pose.rotation().radians() == pytest.approx(math.pi / 2)
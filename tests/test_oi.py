@@ -4,6 +4,7 @@ import pytest
 
 from autonomous.autonomous_drive_commands import MoveFromLine
 from oi import OI
+from robot_config import JoystickConfig
 from subsystems.drivetrain import Drivetrain
 
 
@@ -52,7 +53,7 @@ def drivetrain_default(drivetrain_config: ConfigParser) -> Drivetrain:
 
 def test__init_joystick(oi_joy_ports: OI, config_joy_ports_01: ConfigParser):
     assert oi_joy_ports is not None
-    assert oi_joy_ports.config() == config_joy_ports_01
+    assert oi_joy_ports.config() == JoystickConfig.from_parser(config_joy_ports_01)
     assert len(oi_joy_ports.controllers()) == 2
     assert oi_joy_ports.controllers()[0] is not None
     assert oi_joy_ports.controllers()[1] is not None
@@ -60,7 +61,7 @@ def test__init_joystick(oi_joy_ports: OI, config_joy_ports_01: ConfigParser):
 
 def test__init_dead_zone(oi_joy_ports: OI, config_joy_ports_01: ConfigParser):
     assert oi_joy_ports is not None
-    assert oi_joy_ports.config() == config_joy_ports_01
+    assert oi_joy_ports.config() == JoystickConfig.from_parser(config_joy_ports_01)
     assert len(oi_joy_ports.controllers()) == 2
     assert oi_joy_ports.controllers()[0] is not None
     assert oi_joy_ports.controllers()[1] is not None
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from wpimath.system.plant import DCMotor
+
+from simulation.plant import Mechanism, RobotPlant
+
+
+@pytest.fixture(scope="function")
+def drive_side() -> Mechanism:
+    return Mechanism("left", DCMotor.CIM(), 2, 12.0, 27.5 * 0.0762 ** 2, 0.0)
+
+
+@pytest.fixture(scope="function")
+def impeller() -> Mechanism:
+    return Mechanism("vacuum", DCMotor.vex775Pro(), 1, 1.0, 0.000001, 0.0)
+
+
+def run(plant: RobotPlant, duty: np.ndarray, seconds: float, dt: float = 0.02) -> None:
+    for _ in range(round(seconds / dt)):
+        plant.step(duty, dt)
+
+
+def test_reaches_free_speed_without_load(drive_side: Mechanism):
+    # given: a mechanism without friction on an ideal battery
+    plant = RobotPlant([drive_side], battery_resistance=0.0)
+    # when: it is run at full output
+    run(plant, np.array([[1.0]]), 3.0)
+    # then: it spins at the motor free speed through the gearbox and draws no current
+    free_speed = drive_side.motor.Kv * plant.NOMINAL_BATTERY_VOLTAGE / drive_side.gearing
+    assert plant.velocity[0, 0] == pytest.approx(free_speed, rel=1e-3)
+    assert plant.current[0, 0] == pytest.approx(0.0, abs=0.1)
+
+
+def test_battery_sags_under_load(drive_side: Mechanism):
+    plant = RobotPlant([drive_side])
+    # the first step from standstill draws close to stall current
+    plant.step(np.array([[1.0]]), 0.02)
+    assert plant.battery_voltage[0] < plant.NOMINAL_BATTERY_VOLTAGE - 1.0
+    # and the battery recovers as the mechanism comes up to speed
+    run(plant, np.array([[1.0]]), 3.0)
+    assert plant.battery_voltage[0] == pytest.approx(plant.NOMINAL_BATTERY_VOLTAGE, abs=0.1)
+
+
+def test_braking_does_not_draw_from_battery(drive_side: Mechanism):
+    plant = RobotPlant([drive_side])
+    run(plant, np.array([[1.0]]), 3.0)
+    plant.step(np.array([[0.0]]), 0.02)
+    assert plant.battery_voltage[0] == plant.NOMINAL_BATTERY_VOLTAGE
+    assert plant.velocity[0, 0] > 0.0
+
+
+def test_light_mechanism_is_stable(impeller: Mechanism):
+    # a time constant far below the 20 ms step must not oscillate or blow up
+    plant = RobotPlant([impeller], battery_resistance=0.0)
+    run(plant, np.array([[0.5]]), 0.2)
+    free_speed = impeller.motor.Kv * plant.NOMINAL_BATTERY_VOLTAGE * 0.5
+    assert plant.velocity[0, 0] == pytest.approx(free_speed, rel=1e-3)
+
+
+def test_robots_step_independently(drive_side: Mechanism, impeller: Mechanism):
+    # given: three robots with a drive side and a vacuum each
+    plant = RobotPlant([drive_side, impeller], robots=3)
+    duty = np.array([[1.0, 0.0], [-1.0, 1.0], [0.0, 0.0]])
+    # when: they are stepped together
+    run(plant, duty, 1.0)
+    # then: each robot follows its own outputs
+    assert plant.velocity.shape == (3, 2)
+    assert plant.velocity[0, 0] == pytest.approx(-plant.velocity[1, 0], rel=0.05)
+    assert plant.velocity[1, 1] > 0.0
+    assert np.all(plant.velocity[2] == 0.0)
+    assert plant.battery_voltage[2] == plant.NOMINAL_BATTERY_VOLTAGE
+    assert plant.index("vacuum") == 1
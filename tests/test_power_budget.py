@@ -0,0 +1,144 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import logging
+from configparser import ConfigParser
+
+import pytest
+from wpilib.simulation import PowerDistributionSim, PWMSim, RoboRioSim
+
+from robot_config import PowerBudgetConfig
+from subsystems.drivetrain import Drivetrain
+from util.power_budget import PowerBudget
+from util.sensor_snapshot import SensorSnapshot
+
+CHANNELS = (("Drivetrain", 100.0), ("Climber", 40.0), ("Shooter", 40.0), ("Vacuum", 20.0))
+
+
+@pytest.fixture(scope="function")
+def config_default() -> ConfigParser:
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+    return config
+
+
+@pytest.fixture(scope="function")
+def sensors():
+    sensors = SensorSnapshot()
+    yield sensors
+    RoboRioSim.setVInVoltage(12.0)
+
+
+def budget_of(sensors: SensorSnapshot, total_current: float = 150.0, **kwargs) -> PowerBudget:
+    return PowerBudget(PowerBudgetConfig(enabled=True, total_current=total_current, channels=CHANNELS, **kwargs),
+                       sensors)
+
+
+def next_loop(sensors: SensorSnapshot, budget: PowerBudget) -> None:
+    sensors.sample()
+    budget.update()
+
+
+def test_shares_budget_in_priority_order(sensors: SensorSnapshot):
+    budget = budget_of(sensors)
+    drivetrain, climber, shooter, vacuum = (budget.channel(name) for name, _ in CHANNELS)
+    # given: everything asks for full output, 200 A against a 150 A budget
+    for channel in (drivetrain, climber, shooter, vacuum):
+        channel.request(1.0)
+
+    next_loop(sensors, budget)
+
+    # then: the drivetrain and climber keep full output, the shooter gets what is left
+    assert drivetrain.scale == 1.0
+    assert climber.scale == 1.0
+    assert shooter.scale == pytest.approx(0.25)
+    assert vacuum.scale == 0.0
+    assert budget.limited == ("Shooter", "Vacuum")
+
+
+def test_drivetrain_demand_is_the_mean_of_its_sides(sensors: SensorSnapshot):
+    budget = budget_of(sensors)
+    drivetrain = budget.channel("Drivetrain")
+
+    drivetrain.request_pair(1.0, -0.5)
+
+    assert drivetrain.demand == pytest.approx(75.0)
+
+
+def test_budget_shrinks_towards_brownout(sensors: SensorSnapshot):
+    budget = budget_of(sensors, low_voltage=9.0, brownout_voltage=7.0)
+    drivetrain = budget.channel("Drivetrain")
+    drivetrain.request(1.0)
+
+    # when: the battery sags halfway from the low voltage to brownout
+    RoboRioSim.setVInVoltage(8.0)
+    next_loop(sensors, budget)
+
+    assert budget.available == pytest.approx(75.0)
+    assert drivetrain.scale == pytest.approx(0.75)
+
+
+def test_unaccounted_current_counts_against_budget(sensors: SensorSnapshot):
+    budget = budget_of(sensors, power_distribution=True)
+    climber = budget.channel("Climber")
+    climber.request(1.0)
+    # given: the panel measures 60 A, 20 A more than the climber accounts for
+    PowerDistributionSim().setCurrent(0, 60.0)
+
+    next_loop(sensors, budget)
+
+    assert budget.available == pytest.approx(130.0)
+    PowerDistributionSim().setCurrent(0, 0.0)
+
+
+def test_unlisted_subsystem_never_limited(sensors: SensorSnapshot):
+    budget = budget_of(sensors, total_current=1.0)
+    arm = budget.channel("Arm")
+    arm.request(1.0)
+
+    next_loop(sensors, budget)
+
+    assert arm.scale == 1.0
+    assert budget.limited == ()
+
+
+def test_disabled_budget_never_limits(sensors: SensorSnapshot):
+    budget = PowerBudget(PowerBudgetConfig(enabled=False, total_current=1.0, channels=CHANNELS), sensors)
+    budget.channel("Drivetrain").request(1.0)
+
+    next_loop(sensors, budget)
+
+    assert budget.channel("Drivetrain").scale == 1.0
+
+
+def test_logs_each_intervention(sensors: SensorSnapshot, caplog):
+    budget = budget_of(sensors, total_current=110.0)
+    drivetrain, vacuum = budget.channel("Drivetrain"), budget.channel("Vacuum")
+    drivetrain.request(1.0)
+    vacuum.request(1.0)
+
+    with caplog.at_level(logging.INFO):
+        # when: over budget for two loops, then back under
+        next_loop(sensors, budget)
+        next_loop(sensors, budget)
+        vacuum.request(0.0)
+        next_loop(sensors, budget)
+
+    # then: the intervention is logged once as it starts and once as it ends
+    assert budget.interventions == 1
+    assert "limiting Vacuum to 50%" in caplog.text
+    assert "no longer limiting Vacuum" in caplog.text
+    assert caplog.text.count("limiting Vacuum to") == 1
+
+
+def test_drivetrain_output_scaled_to_budget(sensors: SensorSnapshot, config_default: ConfigParser):
+    budget = budget_of(sensors, total_current=50.0)
+    dt = Drivetrain(config_default, sensors=sensors, power=budget)
+    left = PWMSim(dt._left_motor1.getChannel())
+    dt.tank_drive(1.0, 1.0)
+
+    next_loop(sensors, budget)
+    dt.tank_drive(1.0, 1.0)
+
+    # then: the drivetrain's 100 A request is halved to fit the 50 A budget
+    assert left.getSpeed() == pytest.approx(0.5, abs=0.02)
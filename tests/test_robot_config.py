@@ -0,0 +1,93 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from configparser import ConfigParser
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from robot_config import (AutonomousConfig, ConfigError, DrivetrainConfig, JoystickConfig, PWMSubsystemConfig,
+                          RobotConfig, SubsystemsConfig, VisionConfig)
+
+
+def _parser(text: str) -> ConfigParser:
+    config = ConfigParser()
+    config.read_string(text)
+    return config
+
+
+def test_load_test_configs():
+    # given: the default test configs
+    config = RobotConfig.load("./test_configs/subsystems_default.ini",
+                              "./test_configs/joysticks_default.ini",
+                              "./test_configs/autonomous_default.ini")
+
+    # then: every section is parsed into its typed config
+    assert isinstance(config.subsystems, SubsystemsConfig)
+    assert config.subsystems.vacuum.section == "VacuumGeneral"
+    assert config.subsystems.climber.general.section == "ClimberGeneral"
+    assert isinstance(config.subsystems.climber.limits.full_range, int)
+    assert len(config.joysticks.controllers) == JoystickConfig.CONTROLLER_COUNT
+    assert config.autonomous.move_from_line.drive_speed == 0.5
+    assert config.autonomous.move_from_line.drive_time == 0.2
+
+
+def test_drivetrain_config():
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+
+    drivetrain = DrivetrainConfig.from_parser(config)
+    assert drivetrain.left_motor1.channel == 1
+    assert drivetrain.left_motor2.type == "SPARKMAX"
+    assert drivetrain.max_speed == 1.0
+    assert drivetrain.slow_scaling == 0.5
+
+
+def test_missing_optional_sections_use_defaults():
+    # given: an autonomous config without the DelayedMoveFromLine section
+    config = AutonomousConfig.from_parser(_parser("[MoveFromLine]\nDRIVE_SPEED : 0.4\n"))
+
+    # then: the missing values fall back to the declared defaults
+    assert config.move_from_line.drive_speed == 0.4
+    assert config.move_from_line.drive_time == 0.0
+    assert config.delayed_move_from_line == AutonomousConfig().delayed_move_from_line
+
+
+def test_joysticks_default_ports():
+    config = JoystickConfig.from_parser(ConfigParser())
+    assert [controller.port for controller in config.controllers] == [0, 1]
+    assert config == JoystickConfig()
+
+
+def test_configs_are_frozen():
+    config = PWMSubsystemConfig("VacuumGeneral")
+    with pytest.raises(FrozenInstanceError):
+        config.max_speed = 0.5
+
+
+def test_enabled_subsystem_requires_channel():
+    with pytest.raises(ConfigError, match=r"\[VacuumGeneral\] CHANNEL is required"):
+        PWMSubsystemConfig.from_parser(_parser("[VacuumGeneral]\nENABLED : true\n"), "VacuumGeneral")
+
+
+def test_out_of_range_value():
+    with pytest.raises(ConfigError, match="MAX_SPEED"):
+        PWMSubsystemConfig.from_parser(
+            _parser("[ShooterGeneral]\nENABLED : true\nCHANNEL : 1\nMAX_SPEED : 1.5\n"), "ShooterGeneral")
+
+
+def test_malformed_value():
+    with pytest.raises(ConfigError, match=r"\[JoyConfig0\] DEAD_ZONE"):
+        JoystickConfig.from_parser(_parser("[JoyConfig0]\nPORT : 0\nDEAD_ZONE : lots\n"))
+
+
+def test_vision_config():
+    config = VisionConfig.from_parser(_parser("[Vision]\nPIPELINE : HSV\nHSV_LOWER : 1, 2, 3\nPROCESS_FPS : 10\n"))
+    assert config.pipeline == "hsv"
+    assert config.hsv_lower == (1, 2, 3)
+    assert config.process_fps == 10.0
+
+    with pytest.raises(ConfigError, match="PIPELINE"):
+        VisionConfig.from_parser(_parser("[Vision]\nPIPELINE : lidar\n"))
+    with pytest.raises(ConfigError, match="PROCESS_FPS"):
+        VisionConfig.from_parser(_parser("[Vision]\nFPS : 15\nPROCESS_FPS : 30\n"))
@@ -1,10 +1,9 @@
-from configparser import ConfigParser
-
 from commands2.button import CommandXboxController
 from wpilib import MotorControllerGroup, SendableChooser, PWMTalonSRX, PWMSparkMax, AnalogPotentiometer
 
-from commands.do_nothing import DoNothing
+from autonomous.autonomous_drive_commands import DelayedMoveFromLine
 from oi import OI
+from robot_config import AutonomousConfig, JoystickConfig, SubsystemsConfig
 from robot_controller import RobotController
 from subsystems.climber import Climber
 from subsystems.drivetrain import Drivetrain
@@ -21,9 +20,9 @@ def test__init():
     controller = RobotController(SUBSYSTEMS_CONFIG_PATH, JOYSTICK_CONFIG_PATH, AUTONOMOUS_CONFIG_PATH)
 
     # then: all the controllers configs should be initialized
-    assert isinstance(controller.subsystems_config, ConfigParser)
-    assert isinstance(controller.joystick_config, ConfigParser)
-    assert isinstance(controller.autonomous_config, ConfigParser)
+    assert isinstance(controller.subsystems_config, SubsystemsConfig)
+    assert isinstance(controller.joystick_config, JoystickConfig)
+    assert isinstance(controller.autonomous_config, AutonomousConfig)
 
     # and all subsystems should be initialized
     assert isinstance(controller.drivetrain, Drivetrain)
@@ -36,22 +35,22 @@ def test__init():
     assert controller.oi.config() is controller.joystick_config
 
     assert isinstance(controller.oi.auto_chooser(), SendableChooser)
-    assert isinstance(controller.oi.auto_chooser().getSelected(), DoNothing)
+    assert isinstance(controller.oi.auto_chooser().getSelected(), DelayedMoveFromLine)
 
     assert isinstance(controller.vacuum, Vacuum)
-    assert controller.vacuum._config is controller.subsystems_config
+    assert controller.vacuum._config is controller.subsystems_config.vacuum
     assert isinstance(controller.vacuum._motor, PWMTalonSRX)
     assert not controller.vacuum._motor.getInverted()
     assert controller.vacuum._max_speed > 0.0
 
     assert isinstance(controller.shooter, Shooter)
-    assert controller.shooter._config is controller.subsystems_config
+    assert controller.shooter._config is controller.subsystems_config.shooter
     assert isinstance(controller.shooter._motor, PWMSparkMax)
     assert not controller.shooter._motor.getInverted()
     assert controller.shooter._max_speed > 0.0
 
     assert isinstance(controller.climber, Climber)
-    assert controller.climber._config is controller.subsystems_config
+    assert controller.climber._config is controller.subsystems_config.climber
     assert isinstance(controller.climber._motor, PWMTalonSRX)
     assert not controller.climber._motor.getInverted()
     assert controller.climber._max_speed > 0.0
@@ -61,3 +60,8 @@ def test__init():
     assert isinstance(controller.climber.pot_offset(), int)
     assert isinstance(controller.climber._pot_retracted_threshold, float)
     assert isinstance(controller.climber._pot_extended_threshold, float)
+
+    # and the optional subsystems are only constructed when enabled
+    assert controller.arm is None
+    assert controller.grabber is None
+    assert controller.flipper is None
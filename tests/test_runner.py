@@ -0,0 +1,80 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import csv
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# steps teleop with the sticks at rest, then pushes them forward between two loops
+JOYSTICK_BETWEEN_STEPS = """
+from wpilib.simulation import DriverStationSim
+from simulation.runner import HeadlessSim
+
+with HeadlessSim() as sim:
+    DriverStationSim.setJoystickAxisCount(0, 6)
+    for _ in range(5):
+        rest = sim.step(autonomous=False, enabled=True)
+    DriverStationSim.setJoystickAxis(0, 1, -0.8)
+    DriverStationSim.setJoystickAxis(0, 5, -0.8)
+    pushed = sim.step(autonomous=False, enabled=True)
+    print(rest.left, rest.right, pushed.left, pushed.right)
+"""
+
+# the same autonomous in two sims one after the other in one process, as the sweep runs them
+SIMS_IN_TURN = """
+from simulation.runner import HeadlessSim
+
+for _ in range(2):
+    with HeadlessSim() as sim:
+        print("final x", sim.run_auto("Move_From_Line", duration=1.0).final_pose.X())
+"""
+
+
+def run_sim(*args: str) -> subprocess.CompletedProcess:
+    # the headless sim resets the HAL on close, so it runs in its own process
+    return subprocess.run([sys.executable, *args], cwd=SRC_DIR, capture_output=True, text=True, timeout=120)
+
+
+def test_run_auto_final_pose_and_trace(tmp_path):
+    trace_path = tmp_path / "trace.csv"
+
+    completed = run_sim("-m", "simulation.runner", "--auto", "Move_From_Line", "--duration", "5",
+                        "--trace", str(trace_path))
+
+    # then: the robot has backed straight off the line
+    assert completed.returncode == 0, completed.stderr
+    assert "Move_From_Line: x=-2.2" in completed.stdout
+    assert "y=0.000 m heading=0.0 deg" in completed.stdout
+    # and: the trace has every loop, the settling period disabled and the rest in autonomous
+    with open(trace_path, newline="") as trace_file:
+        trace = list(csv.DictReader(trace_file))
+    assert len(trace) == 255
+    assert [row["mode"] for row in trace[:6]] == ["disabled"] * 5 + ["auto"]
+    assert float(trace[-1]["time"]) == pytest.approx(5.1)
+    assert float(trace[-1]["x"]) == pytest.approx(-2.2, abs=0.05)
+    assert min(float(row["left"]) for row in trace) < 0.0
+
+
+def test_joystick_set_between_steps_reaches_the_robot():
+    completed = run_sim("-c", JOYSTICK_BETWEEN_STEPS)
+
+    assert completed.returncode == 0, completed.stderr
+    rest_left, rest_right, pushed_left, pushed_right = (float(value) for value in completed.stdout.split()[-4:])
+    # then: the drivetrain is at rest until the sticks move, and follows them on the very next loop
+    assert rest_left == rest_right == 0.0
+    assert pushed_left != 0.0
+    assert pushed_right == pytest.approx(pushed_left)
+
+
+def test_sims_in_turn_drive_the_same():
+    completed = run_sim("-c", SIMS_IN_TURN)
+
+    assert completed.returncode == 0, completed.stderr
+    first, second = (float(line.split()[-1]) for line in completed.stdout.splitlines() if line.startswith("final x"))
+    assert first < -1.0
+    assert second == pytest.approx(first)
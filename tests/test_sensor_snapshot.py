@@ -0,0 +1,115 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from configparser import ConfigParser
+
+import pytest
+from wpilib.simulation import AnalogInputSim
+
+from subsystems.climber import Climber
+from util.sensor_snapshot import SensorSnapshot
+
+
+class CountingSensor:
+    def __init__(self):
+        self.reads = 0
+        self.value = 0.0
+
+    def get(self) -> float:
+        self.reads += 1
+        return self.value
+
+
+@pytest.fixture(scope="function")
+def config_default() -> ConfigParser:
+    config = ConfigParser()
+    config.read("./test_configs/subsystems_default.ini")
+    return config
+
+
+def test_add_returns_registered_reading():
+    snapshot = SensorSnapshot()
+    sensor = CountingSensor()
+    reading = snapshot.add("counting", sensor.get)
+
+    assert snapshot.add("counting", sensor.get) is reading
+    assert reading.name == "counting"
+    assert len(snapshot.readings) == 1
+
+
+def test_reads_live_before_first_sample():
+    snapshot = SensorSnapshot()
+    sensor = CountingSensor()
+    reading = snapshot.add("counting", sensor.get)
+
+    sensor.value = 3.0
+    assert not snapshot.sampled
+    assert reading.get() == 3.0
+
+
+def test_sample_once_per_loop():
+    snapshot = SensorSnapshot()
+    sensor = CountingSensor()
+    reading = snapshot.add("counting", sensor.get)
+
+    sensor.value = 1.0
+    snapshot.sample()
+    reads = sensor.reads
+    sensor.value = 2.0
+
+    # every consumer in the loop sees the sampled value without touching the sensor
+    assert reading.get() == 1.0
+    assert reading.get() == 1.0
+    assert sensor.reads == reads
+
+    snapshot.sample()
+    assert reading.get() == 2.0
+    assert sensor.reads == reads + 1
+
+
+def test_source_replaces_sensors():
+    snapshot = SensorSnapshot()
+    replayed = CountingSensor()
+    live = CountingSensor()
+    replayed_reading = snapshot.add("replayed", replayed.get)
+    live_reading = snapshot.add("live", live.get)
+    reads = replayed.reads
+
+    # given: a source that only knows the replayed sensor
+    snapshot.set_source(lambda name: 7.0 if name == "replayed" else None)
+    live.value = 2.0
+
+    # when: the loop samples
+    snapshot.sample()
+
+    # then: the replayed sensor is never read, the one missing from the source still is
+    assert replayed_reading.get() == 7.0
+    assert replayed.reads == reads
+    assert live_reading.get() == 2.0
+
+    snapshot.set_source(None)
+    replayed.value = 1.0
+    snapshot.sample()
+    assert replayed_reading.get() == 1.0
+
+
+def test_climber_reads_pot_from_snapshot(config_default: ConfigParser):
+    snapshot = SensorSnapshot()
+    climber = Climber(config_default, sensors=snapshot)
+    pot_sim = AnalogInputSim(climber._pot_channel)
+
+    # given: the pot is fully retracted at the start of the loop
+    pot_sim.setVoltage(0.0)
+    snapshot.sample()
+
+    # when: the pot moves during the loop
+    pot_sim.setVoltage(5.0)
+
+    # then: the climber keeps using the value sampled at the start of the loop
+    assert climber.pot_position() == pytest.approx(-1800.0)
+    assert climber.is_retracted()
+    assert not climber.is_extended()
+
+    snapshot.sample()
+    assert climber.pot_position() == pytest.approx(1800.0)
+    assert climber.is_extended()
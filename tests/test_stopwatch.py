@@ -2,7 +2,13 @@ from time import sleep
 
 import pytest
 
-from util.stopwatch import Stopwatch
+from tests.conftest import FakeClock
+from util.stopwatch import Stopwatch, TimerService
+
+
+@pytest.fixture(scope="function")
+def fake_clock_start() -> int:
+    return 1_000_000_000
 
 
 @pytest.fixture(scope="function")
@@ -10,13 +16,17 @@ def stopwatch_default():
     return Stopwatch()
 
 
+@pytest.fixture(scope="function")
+def timer_service(fake_clock: FakeClock) -> TimerService:
+    return TimerService(fake_clock)
+
+
 def test_stopwatch_default(stopwatch_default):
     assert stopwatch_default is not None
     assert stopwatch_default._start is None
     assert stopwatch_default._end is None
-    assert stopwatch_default._secs is None
-    assert stopwatch_default._msecs is None
     assert stopwatch_default._running is False
+    assert not hasattr(stopwatch_default, "__dict__")
 
 
 def test_start(stopwatch_default):
@@ -24,8 +34,6 @@ def test_start(stopwatch_default):
     assert stopwatch_default._start is not None
     assert stopwatch_default._running is True
     assert stopwatch_default._end is None
-    assert stopwatch_default._secs is None
-    assert stopwatch_default._msecs is None
 
 
 def test_reset(stopwatch_default):
@@ -38,8 +46,6 @@ def test_reset(stopwatch_default):
     assert stopwatch_default._start != start_time
     assert stopwatch_default._running is True
     assert stopwatch_default._end is None
-    assert stopwatch_default._secs is None
-    assert stopwatch_default._msecs is None
 
 
 @pytest.mark.parametrize("started", [True, False])
@@ -50,11 +56,11 @@ def test_stop(stopwatch_default, started):
     if started:
         assert stopwatch_default._start is not None
         assert stopwatch_default._end is not None
+        assert stopwatch_default.elapsed_time_in_secs() is not None
     else:
         assert stopwatch_default._start is None
         assert stopwatch_default._end is None
-    assert stopwatch_default._secs is None
-    assert stopwatch_default._msecs is None
+        assert stopwatch_default.elapsed_time_in_secs() is None
     assert stopwatch_default._running is False
 
 
@@ -67,17 +73,13 @@ def test_elapsed_time_in_secs(stopwatch_default, started):
     time_in_sec = stopwatch_default.elapsed_time_in_secs()
     if started:
         assert stopwatch_default._start is not None
-        assert stopwatch_default._end is not None
         assert stopwatch_default._running is True
-        assert stopwatch_default._secs is not None
-        assert time_in_sec is not None
+        assert time_in_sec >= 0.005
     else:
         assert stopwatch_default._start is None
         assert stopwatch_default._end is None
         assert stopwatch_default._running is False
-        assert stopwatch_default._secs is None
         assert time_in_sec is None
-    assert stopwatch_default._msecs is None
 
 
 @pytest.mark.parametrize("started", [True, False])
@@ -89,16 +91,54 @@ def test_elapsed_time_in_msecs(stopwatch_default, started):
     time_in_msec = stopwatch_default.elapsed_time_in_msecs()
     if started:
         assert stopwatch_default._start is not None
-        assert stopwatch_default._end is not None
         assert stopwatch_default._running is True
-        assert stopwatch_default._secs is not None
-        assert stopwatch_default._msecs is not None
-        assert time_in_msec is not None
-        assert stopwatch_default._msecs == stopwatch_default._secs * 1000
+        assert time_in_msec >= 5.0
     else:
         assert stopwatch_default._start is None
         assert stopwatch_default._end is None
         assert stopwatch_default._running is False
-        assert stopwatch_default._secs is None
-        assert stopwatch_default._msecs is None
         assert time_in_msec is None
+
+
+def test_elapsed_time_stopped(timer_service: TimerService, fake_clock: FakeClock):
+    stopwatch = Stopwatch(timer_service)
+    stopwatch.start()
+    fake_clock.now += 250_000_000
+    stopwatch.stop()
+    fake_clock.now += 1_000_000_000
+
+    assert stopwatch.elapsed_time_in_secs() == 0.25
+    assert stopwatch.elapsed_time_in_msecs() == 250.0
+
+
+def test_timer_service_caches_tick(timer_service: TimerService, fake_clock: FakeClock):
+    stopwatch = Stopwatch(timer_service)
+    stopwatch.start()
+
+    # given: the loop has ticked the timer service
+    fake_clock.now += 20_000_000
+    timer_service.tick()
+
+    # when: the clock moves on during the loop
+    fake_clock.now += 5_000_000
+
+    # then: every read during the loop sees the timestamp of the tick
+    assert timer_service.now() == fake_clock.now - 5_000_000
+    assert stopwatch.elapsed_time_in_msecs() == 20.0
+
+    # and after the loop the clock is read directly again
+    timer_service.release()
+    assert stopwatch.elapsed_time_in_msecs() == 25.0
+
+
+def test_timer_service_use_clock(timer_service: TimerService, fake_clock: FakeClock):
+    # given: a timer service that has ticked on its clock
+    timer_service.tick()
+    other_clock = FakeClock(5_000_000_000)
+
+    # when: it is switched to another clock
+    previous = timer_service.use_clock(other_clock)
+
+    # then: the new clock is read straight away and the old one is returned
+    assert previous is fake_clock
+    assert timer_service.now() == 5_000_000_000
@@ -0,0 +1,56 @@
+from configparser import ConfigParser
+
+import pytest
+from argparse import ArgumentTypeError
+
+from robot_config import AutonomousConfig
+from simulation.sweep import Candidate, Target, _write_config, candidates, parse_range
+
+
+def test_parse_range_is_stop_inclusive():
+    assert parse_range("0.5:2:0.5") == [0.5, 1.0, 1.5, 2.0]
+    assert parse_range("-1:-0.5:0.25") == [-1.0, -0.75, -0.5]
+
+
+def test_parse_range_list_and_single_value():
+    assert parse_range("-1,-0.7") == [-1.0, -0.7]
+    assert parse_range("9") == [9.0]
+
+
+def test_parse_range_never_reaching_stop_raises():
+    with pytest.raises(ArgumentTypeError):
+        parse_range("0:1:-0.5")
+
+
+def test_target_score():
+    target = Target(-3.0, 0.0, 0.0, heading_weight=0.01)
+    assert target.score(-3.0, 0.0, 0.0) == pytest.approx(0.0)
+    assert target.score(-2.0, 0.0, 0.0) == pytest.approx(1.0)
+    # heading error wraps, 350 degrees is 10 degrees off
+    assert target.score(-3.0, 0.0, 350.0) == pytest.approx(0.1)
+
+
+def test_candidates_cover_every_combination():
+    all_candidates = candidates("DELAYED_Mobility", "DelayedMoveFromLine",
+                                {"DRIVE_SPEED": [-1.0, -0.5], "DRIVE_TIME": [1.0, 2.0, 3.0]},
+                                "autonomous.ini", 15.0)
+    assert len(all_candidates) == 6
+    assert all_candidates[0].values == (("DRIVE_SPEED", -1.0), ("DRIVE_TIME", 1.0))
+
+
+def test_write_config_overrides_section(tmp_path):
+    # given: a candidate overriding the delayed move from line values
+    candidate = Candidate("DELAYED_Mobility", "DelayedMoveFromLine",
+                          (("DRIVE_SPEED", -0.5), ("WAIT_TIME", 2.0)),
+                          "./test_configs/autonomous_default.ini", 15.0)
+    # when: its autonomous.ini is written
+    path = _write_config(candidate, str(tmp_path))
+    # then: the overridden values are read back, the rest of the base config is kept
+    parser = ConfigParser()
+    parser.read(path)
+    config = AutonomousConfig.from_parser(parser)
+    base = ConfigParser()
+    base.read("./test_configs/autonomous_default.ini")
+    assert config.delayed_move_from_line.drive_speed == -0.5
+    assert config.delayed_move_from_line.wait_time == 2.0
+    assert config.move_from_line == AutonomousConfig.from_parser(base).move_from_line
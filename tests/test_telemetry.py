@@ -0,0 +1,61 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import pytest
+from wpilib import SmartDashboard
+
+from util.telemetry import Telemetry
+
+
+@pytest.fixture(scope="function")
+def telemetry_default() -> Telemetry:
+    return Telemetry()
+
+
+def test_add_returns_registered_entry(telemetry_default: Telemetry):
+    entry = telemetry_default.add_number("Test Speed", epsilon=0.01)
+    assert telemetry_default.add_number("Test Speed") is entry
+    assert entry.epsilon == 0.01
+    assert len(telemetry_default.entries) == 1
+
+
+def test_flush_publishes_to_smartdashboard(telemetry_default: Telemetry):
+    speed = telemetry_default.add_number("Test Speed")
+    extended = telemetry_default.add_boolean("Test Extended")
+    speed.set(0.5)
+    extended.set(True)
+
+    assert telemetry_default.flush() == 2
+    assert SmartDashboard.getNumber("Test Speed", 0.0) == 0.5
+    assert SmartDashboard.getBoolean("Test Extended", False) is True
+
+
+def test_flush_suppresses_unchanged_values(telemetry_default: Telemetry):
+    speed = telemetry_default.add_number("Test Speed", epsilon=0.01)
+    extended = telemetry_default.add_boolean("Test Extended")
+    assert telemetry_default.flush() == 2
+
+    # given: changes within epsilon, and no boolean change
+    speed.set(0.005)
+    extended.set(False)
+    assert telemetry_default.flush() == 0
+    assert SmartDashboard.getNumber("Test Speed", 1.0) == 0.0
+
+    # when: the change is beyond epsilon
+    speed.set(0.02)
+    extended.set(True)
+    assert telemetry_default.flush() == 2
+    assert SmartDashboard.getNumber("Test Speed", 1.0) == 0.02
+
+
+def test_periodic_flush_period():
+    telemetry = Telemetry(flush_period=3)
+    speed = telemetry.add_number("Test Speed")
+    speed.set(1.0)
+
+    telemetry.periodic()
+    telemetry.periodic()
+    assert SmartDashboard.getNumber("Test Speed", -1.0) == -1.0
+
+    telemetry.periodic()
+    assert SmartDashboard.getNumber("Test Speed", -1.0) == 1.0
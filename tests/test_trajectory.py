@@ -0,0 +1,101 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+from configparser import ConfigParser
+
+import pytest
+
+from autonomous.trajectory import FollowTrajectory, TrajectoryLibrary
+from robot_config import AutonomousConfig, ConfigError, PathConfig
+from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
+from tests.conftest import FakeClock
+from util.stopwatch import TimerService
+
+PERIOD_NS = 20_000_000
+
+
+@pytest.fixture(scope="function")
+def drivetrain_config() -> ConfigParser:
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+    return config
+
+
+@pytest.fixture(scope="function")
+def auto_config() -> AutonomousConfig:
+    config = ConfigParser()
+    config.read_string("""
+[Trajectory:Forward]
+WAYPOINTS: 0, 0, 0; 2, 0.5, 0
+
+[Trajectory:Backward]
+WAYPOINTS: 0, 0, 0; -1.5, 0, 0
+REVERSED: True
+""")
+    return AutonomousConfig.from_parser(config)
+
+
+@pytest.fixture(scope="function")
+def timer(fake_clock: FakeClock) -> TimerService:
+    return TimerService(fake_clock)
+
+
+@pytest.fixture(scope="function")
+def drivetrain_default(drivetrain_config: ConfigParser, timer: TimerService) -> Drivetrain:
+    return Drivetrain(drivetrain_config, timer=timer)
+
+
+def test_parse_waypoints(auto_config: AutonomousConfig):
+    assert [path.name for path in auto_config.trajectories] == ["Forward", "Backward"]
+    assert auto_config.trajectories[0].waypoints == ((0.0, 0.0, 0.0), (2.0, 0.5, 0.0))
+    assert auto_config.trajectories[1].reversed
+
+
+def test_parse_invalid_waypoints():
+    with pytest.raises(ConfigError, match="WAYPOINTS"):
+        PathConfig.parse_waypoints("Trajectory:Bad", "0, 0; 1, 1, 0")
+    with pytest.raises(ConfigError, match="at least two"):
+        PathConfig("Single", ((0.0, 0.0, 0.0),))
+
+
+def test_library_generates_once(auto_config: AutonomousConfig, drivetrain_default: Drivetrain):
+    library = TrajectoryLibrary(auto_config, drivetrain_default.kinematics)
+    trajectories = library.generate()
+
+    assert set(trajectories) == {"Forward", "Backward"}
+    forward = library.get("Forward")
+    assert forward.totalTime() > 0.0
+    assert forward.sample(forward.totalTime()).pose.X() == pytest.approx(2.0)
+    # generating again reuses the cached trajectories
+    library.generate()
+    assert library.get("Forward") is forward
+
+
+@pytest.mark.parametrize("name,end_x,end_y", [("Forward", 2.0, 0.5), ("Backward", -1.5, 0.0)])
+def test_follow_trajectory(auto_config: AutonomousConfig, drivetrain_default: Drivetrain,
+                           timer: TimerService, fake_clock: FakeClock, name: str, end_x: float, end_y: float):
+    library = TrajectoryLibrary(auto_config, drivetrain_default.kinematics)
+    library.generate()
+    odometry = Odometry(drivetrain_default, timer=timer)
+    command = FollowTrajectory(drivetrain_default, odometry, library.get(name), auto_config.trajectory_follower,
+                               timer=timer)
+
+    # given: the robot loop running the command at 50Hz
+    timer.tick()
+    command.initialize()
+    odometry.periodic()
+    loops = 0
+    while not command.isFinished() and loops < 500:
+        command.execute()
+        fake_clock.now += PERIOD_NS
+        timer.tick()
+        odometry.periodic()
+        loops += 1
+    command.end(False)
+
+    # then: the odometry pose ends at the end of the trajectory
+    pose = odometry.pose
+    assert command.isFinished()
+    assert pose.X() == pytest.approx(end_x, abs=0.1)
+    assert pose.Y() == pytest.approx(end_y, abs=0.1)
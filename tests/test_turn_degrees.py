@@ -67,6 +67,19 @@ def test_initialize(command_default: TurnDegrees):
     assert command_default._target_degrees == 90
 
 
+@pytest.mark.parametrize("degrees", [270.0, 360.0])
+def test_turn_past_180_not_wrapped(drivetrain_default: Drivetrain, degrees: float):
+    td = TurnDegrees(drivetrain_default, degrees, 1.0, 2.0)
+
+    td.initialize()
+    td.execute()
+
+    # then: the target is the full turn and the robot starts turning towards it
+    assert td.target_degrees == degrees
+    assert td._heading_controller.controller.getGoal().position == degrees
+    assert td._heading_controller.controller.getSetpoint().velocity > 0.0
+
+
 @pytest.mark.skip("No longer using the gyro")
 @pytest.mark.parametrize(
     "initial_angle,target_angle,threshold,speed,left_ex_speed,right_ex_speed",
@@ -0,0 +1,99 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import math
+from configparser import ConfigParser
+
+import ntcore
+import pytest
+from wpimath.geometry import Pose2d, Rotation2d
+
+from subsystems.drivetrain import Drivetrain
+from subsystems.odometry import Odometry
+from subsystems.vision import Vision
+from tests.conftest import FakeClock
+from util.stopwatch import TimerService
+from vision.targeting import TARGET_TOPIC, VISION_TABLE
+
+PERIOD_NS = 20_000_000
+
+
+@pytest.fixture(scope="function")
+def timer(fake_clock: FakeClock) -> TimerService:
+    return TimerService(fake_clock)
+
+
+@pytest.fixture(scope="function")
+def drivetrain(timer: TimerService) -> Drivetrain:
+    config = ConfigParser()
+    config.read("./test_configs/drivetrain_default.ini")
+    return Drivetrain(config, timer=timer)
+
+
+@pytest.fixture(scope="function")
+def odometry(drivetrain: Drivetrain, timer: TimerService) -> Odometry:
+    return Odometry(drivetrain, timer=timer)
+
+
+@pytest.fixture(scope="function")
+def instance():
+    instance = ntcore.NetworkTableInstance.create()
+    yield instance
+    ntcore.NetworkTableInstance.destroy(instance)
+
+
+@pytest.fixture(scope="function")
+def publisher(instance: ntcore.NetworkTableInstance) -> ntcore.DoubleArrayPublisher:
+    return instance.getTable(VISION_TABLE).getDoubleArrayTopic(TARGET_TOPIC).publish()
+
+
+def test_no_target(odometry: Odometry, instance: ntcore.NetworkTableInstance):
+    vision = Vision(odometry, instance=instance)
+    vision.periodic()
+
+    assert vision.latest is None
+    assert vision.age() == math.inf
+    assert vision.target(1.0) is None
+
+
+def test_target_heading_uses_pose_when_captured(odometry: Odometry, drivetrain: Drivetrain,
+                                                instance: ntcore.NetworkTableInstance,
+                                                publisher: ntcore.DoubleArrayPublisher, fake_clock: FakeClock):
+    vision = Vision(odometry, instance=instance)
+    # given: the robot faced 90 degrees when a frame was captured at 1 s, then turned clockwise
+    fake_clock.now = 1_000_000_000
+    odometry.reset_pose(Pose2d(0.0, 0.0, Rotation2d.fromDegrees(90.0)))
+    odometry.update()
+    for _ in range(5):
+        drivetrain.tank_drive(0.5, -0.5)
+        fake_clock.now += PERIOD_NS
+        odometry.update()
+    assert odometry.pose.rotation().degrees() < 85.0
+
+    # when: the target 10 degrees left of the camera center arrives
+    publisher.set([1.0, 10.0, -5.0, 2.0, 4.0])
+    vision.periodic()
+
+    # then: its heading is from the pose at capture
+    target = vision.target(0.5)
+    assert target is not None
+    assert target.heading.degrees() == pytest.approx(100.0)
+    assert target.distance == 2.0
+    assert target.id == 4
+    assert vision.age() == pytest.approx(0.1)
+
+
+def test_stale_target(odometry: Odometry, instance: ntcore.NetworkTableInstance,
+                      publisher: ntcore.DoubleArrayPublisher, fake_clock: FakeClock):
+    vision = Vision(odometry, instance=instance)
+    fake_clock.now = 1_000_000_000
+    odometry.update()
+    publisher.set([1.0, 0.0, 0.0, 1.0, -1.0])
+    vision.periodic()
+
+    # when: no new target arrives for a second
+    fake_clock.now += 1_000_000_000
+    vision.periodic()
+
+    assert vision.latest is not None
+    assert vision.target(0.5) is None
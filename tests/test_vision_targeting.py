@@ -0,0 +1,98 @@
+# Copyright (c) Southfield High School Team 94
+# Open Source Software; you can modify and / or share it under the terms of
+# the MIT license file in the root directory of this project
+import math
+
+import numpy as np
+import pytest
+
+from robot_config import VisionConfig
+from vision.targeting import CameraModel, FrameSkipper
+
+
+@pytest.fixture(scope="function")
+def model() -> CameraModel:
+    # 90 degrees across 320 pixels, so the focal length is 160 pixels
+    return CameraModel(320, 240, 90.0, camera_height=0.5, camera_pitch=-30.0, target_height=0.0)
+
+
+def test_center_is_straight_ahead(model: CameraModel):
+    cx, cy = model.center
+    assert model.yaw(cx) == 0.0
+    assert model.pitch(cy) == 0.0
+    assert model.focal_length == pytest.approx(160.0)
+
+
+def test_angles_follow_robot_conventions(model: CameraModel):
+    cx, cy = model.center
+
+    # then: a target left of center is counter-clockwise, positive, and one above center is positive
+    assert model.yaw(cx - 160.0) == pytest.approx(45.0)
+    assert model.yaw(cx + 160.0) == pytest.approx(-45.0)
+    assert model.pitch(cy - 160.0) == pytest.approx(45.0)
+
+
+def test_distance_from_pitch(model: CameraModel):
+    cx, cy = model.center
+
+    # given: the camera 0.5 m up, tilted 30 degrees down, seeing a target on the floor at the center
+    target = model.target(cx, cy)
+
+    # then: the target is 0.5 / tan(30) m away
+    assert target.distance == pytest.approx(0.5 / math.tan(math.radians(30.0)))
+    # a target above the horizon can not be on the floor
+    assert math.isnan(model.distance(45.0))
+
+
+def test_given_distance_is_kept(model: CameraModel):
+    assert model.target(10.0, 10.0, distance=2.5, id=7).distance == 2.5
+
+
+def test_skips_frames_beyond_max_fps():
+    skipper = FrameSkipper(max_fps=15.0)
+
+    # when: a 30 fps camera delivers a second of frames, processing taking no time
+    processed = 0
+    for frame in range(30):
+        if skipper.should_process(frame / 30.0):
+            processed += 1
+            skipper.processed(0.0)
+
+    # then: every other frame is processed
+    assert processed == 15
+    assert skipper.skipped == 15
+
+
+def test_slow_processing_stays_inside_cpu_budget():
+    skipper = FrameSkipper(max_fps=30.0, cpu_budget=0.5)
+
+    # when: each frame takes 40 ms to process
+    processed = 0
+    for frame in range(300):
+        if skipper.should_process(frame / 30.0):
+            processed += 1
+            skipper.processed(0.04)
+
+    # then: processing uses about half of the 10 seconds
+    assert skipper.interval == pytest.approx(0.08)
+    assert processed * 0.04 <= 0.5 * 10.0 + 0.04
+
+
+def test_hsv_pipeline_finds_blob():
+    pytest.importorskip("cv2")
+    from vision.pipelines import HsvPipeline
+
+    config = VisionConfig(pipeline="hsv", width=320, height=240, min_area=20.0)
+    model = CameraModel.from_config(config)
+    pipeline = HsvPipeline(config, model)
+    # given: an orange square left of and above center on a black frame
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[50:70, 60:80] = (0, 128, 255)
+
+    target = pipeline.process(frame)
+
+    assert target is not None
+    assert target.x == pytest.approx(69.5)
+    assert target.y == pytest.approx(59.5)
+    assert target.yaw > 0.0 and target.pitch > 0.0
+    assert pipeline.process(np.zeros_like(frame)) is None